@@ -7,7 +7,6 @@ the pipeline, processing individual files, viewing configuration, and dashboard
 from __future__ import annotations
 
 import asyncio
-import signal
 from pathlib import Path
 
 import typer
@@ -73,16 +72,12 @@ def start(
     
     processor = PipelineProcessor(cfg)
     
-    # Setup signal handlers
+    # run() installs the SIGINT/SIGTERM handlers itself
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     
-    for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, lambda: asyncio.create_task(processor.stop()))
-    
     try:
-        loop.run_until_complete(processor.start(process_existing=not no_existing))
-        loop.run_until_complete(processor.run())
+        loop.run_until_complete(processor.run(process_existing=not no_existing))
     except KeyboardInterrupt:
         console.print("\n[yellow]Shutting down...[/yellow]")
     finally:
@@ -112,8 +107,10 @@ def process(
     
     async def run() -> bool:
         processor.initialize()
-        success = await processor.process_file(file, workflow_name=workflow)
-        return success
+        try:
+            return await processor.process_file(file, workflow_name=workflow)
+        finally:
+            await processor.close()
     
     success = asyncio.run(run())
     
@@ -266,13 +263,14 @@ def browser_apply(
             
         wf = processor.orchestrator.create_startup_application_workflow()
         result = await processor.orchestrator.execute_workflow(wf, content)
+        await processor.orchestrator.close()
         
         if not result.success:
             console.print("[red]Error: Workflow failed to extract data[/red]")
             return False
             
         # Extract JSON data
-        data = processor.orchestrator.extract_json_from_output(result.final_output)
+        data = await processor.orchestrator.aextract_json_from_output(result.final_output)
         if not data:
             console.print("[red]Error: Could not extract structured form data from AI output[/red]")
             console.print(f"Final output was: {result.final_output[:200]}...")
@@ -293,6 +291,8 @@ def browser_apply(
         except Exception as e:
             console.print(f"[red]Error during browser automation: {e}[/red]")
             return False
+        finally:
+            await executor.aclose()
 
     success = asyncio.run(run())
     if not success:
@@ -13,6 +13,10 @@ from pathlib import Path
 import yaml
 from pydantic import BaseModel, Field
 
+# libyaml's C loader when PyYAML was built with it; same safe subset.
+# Shared by every module that parses YAML
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class DirectoriesConfig(BaseModel):
     """Configuration for pipeline-related directories.
@@ -34,14 +38,20 @@ class ProcessingConfig(BaseModel):
         supported_extensions: List of file extensions the pipeline will process.
         max_file_size_mb: Maximum file size allowed for processing.
         concurrent_workers: Number of parallel processing workers.
+        queue_maxsize: Files that may wait for a worker; watcher events
+            beyond it are dropped and counted, and the initial scan blocks.
         retry_attempts: Number of times to retry failed processing jobs.
         retry_delay_seconds: Seconds to wait between retries.
+        metrics_flush_interval_seconds: How often metrics.json is rewritten
+            for the dashboard while the pipeline runs.
     """
     supported_extensions: list[str] = Field(default_factory=lambda: [".txt", ".md", ".json", ".csv", ".pdf", ".xlsx"])
     max_file_size_mb: int = 50
     concurrent_workers: int = 4
+    queue_maxsize: int = 512
     retry_attempts: int = 3
     retry_delay_seconds: int = 5
+    metrics_flush_interval_seconds: float = 5.0
 
 
 class GeneratorConfig(BaseModel):
@@ -54,12 +64,47 @@ class GeneratorConfig(BaseModel):
         max_tokens: Maximum tokens to generate per file.
         ollama_host: URL of the Ollama server (only used if provider is 'ollama').
         instruction_template: Jinja2-style template for the generator prompt.
+        response_cache_ttl_seconds: Lifetime of exact-prompt response cache
+            entries (0 disables the cache).
+        response_cache_max_entries: Number of responses kept, least recently
+            used evicted first.
+        semantic_cache: Reuse responses for identical or near-identical prompts.
+        semantic_cache_threshold: Minimum cosine similarity for a semantic hit.
+        semantic_cache_max_entries: Number of prompts kept in the cache.
+        max_content_tokens: Token budget for file content included in a prompt;
+            longer content keeps its beginning and end.
+        context_cache_ttl_seconds: Lifetime of Gemini explicit context caches
+            holding the static prompt prefix (0 disables explicit caching).
+        local_synthesis_max_chars: Files with less extracted text than this
+            get template-built instructions without a model call (0 disables).
+        batch: Send bulk generation through the provider's batch API
+            (cheaper, but results can take hours). Files already in the data
+            directory at startup are then generated in batches rather than
+            by the workers one at a time.
+        batch_poll_interval_seconds: How often to poll a running batch job.
+        max_parallel: Maximum concurrent model calls per orchestrator;
+            workflows may lower or raise it with their own ``max_parallel``.
+        service_tier: Gemini tier for content without an explicit urgency:
+            'standard' (default), 'flex' (cheaper, may queue; set it for
+            bulk pipeline runs) or 'priority'.
     """
     provider: str = "gemini"  # gemini, ollama
     model: str = "auto"
     temperature: float = 0.7
     max_tokens: int = 4096
     ollama_host: str = "http://localhost:11434"
+    response_cache_ttl_seconds: int = 3600
+    response_cache_max_entries: int = 1000
+    semantic_cache: bool = False
+    semantic_cache_threshold: float = 0.97
+    semantic_cache_max_entries: int = 2048
+    max_content_tokens: int = 2500
+    context_cache_ttl_seconds: int = 0
+    local_synthesis_max_chars: int = 0
+    batch: bool = False
+    batch_poll_interval_seconds: float = 30.0
+    service_tier: str = "standard"  # standard, flex, priority
+    max_parallel: int = Field(default=8, ge=1)
     instruction_template: str = """Analyze the following data and generate clear, actionable instructions:
 
 ## Data Type: {file_type}
@@ -98,10 +143,18 @@ class WatcherConfig(BaseModel):
         debounce_seconds: Time to wait after a file change before processing.
         recursive: Whether to watch subdirectories.
         ignore_patterns: Filename patterns to ignore.
+        observer: How changes are detected. ``native`` uses the OS
+            notification API (inotify, FSEvents, ...), ``polling`` rescans
+            the directory every ``poll_interval_seconds``, and ``auto``
+            polls only on network filesystems (NFS, SMB), where native
+            notifications miss changes made by other hosts.
+        poll_interval_seconds: Rescan interval for the polling observer.
     """
     debounce_seconds: float = 1.0
     recursive: bool = True
     ignore_patterns: list[str] = Field(default_factory=lambda: ["*.tmp", "*.swp", ".*"])
+    observer: str = "auto"  # auto, native, polling
+    poll_interval_seconds: float = 30.0
 
 
 class MemoryConfig(BaseModel):
@@ -111,10 +164,24 @@ class MemoryConfig(BaseModel):
         pinecone_api_key: Optional API key for Pinecone authentication.
         pinecone_environment: Pinecone cloud environment (e.g., 'us-east-1-gcp').
         pinecone_index_name: Name of the index to store embeddings in.
+        quantize_int8: Round embeddings to symmetric int8 levels before
+            sending them. Values stay float32, so this only shrinks the REST
+            client's JSON bodies (~3.5x for the vector values); gRPC payloads
+            and index storage are unchanged, and recall drops slightly.
+        embedding_backend: Inference backend for the embedding model:
+            'torch', 'onnx' (int8 on CPU) or 'openvino'.
+        embedding_workers: CPU worker processes for encoding large batches;
+            0 or 1 encodes in-process.
+        max_concurrent_requests: Upper bound on concurrent Pinecone requests
+            issued by async batch operations.
     """
     pinecone_api_key: str | None = None
     pinecone_environment: str | None = None
     pinecone_index_name: str | None = None
+    quantize_int8: bool = False
+    embedding_backend: str = "torch"  # torch, onnx, openvino
+    embedding_workers: int = 0
+    max_concurrent_requests: int = Field(default=8, ge=1)
 
 
 class PipelineConfig(BaseModel):
@@ -158,7 +225,7 @@ class PipelineConfig(BaseModel):
         
         if config_file.exists():
             with open(config_file) as f:
-                data = yaml.safe_load(f) or {}
+                data = yaml.load(f, Loader=YAML_LOADER) or {}
         else:
             data = {}
         
@@ -26,6 +26,22 @@ __all__ = [
 ]
 
 
+# Extension -> extractor class; unknown extensions fall back to TextExtractor
+_EXTRACTORS: dict[str, type[BaseExtractor]] = {
+    # Text formats
+    ".txt": TextExtractor,
+    ".md": TextExtractor,
+    ".rst": TextExtractor,
+    # Data formats
+    ".json": JsonExtractor,
+    ".csv": CsvExtractor,
+    # Document formats
+    ".pdf": PdfExtractor,
+    ".xlsx": ExcelExtractor,
+    ".xlsm": ExcelExtractor,
+}
+
+
 def get_extractor_for_file(file_path: str | Path) -> BaseExtractor:
     """Factory function to return the correct extractor for a file.
 
@@ -39,20 +55,5 @@ def get_extractor_for_file(file_path: str | Path) -> BaseExtractor:
         An instance of a class derived from BaseExtractor.
     """
     suffix = Path(file_path).suffix.lower()
-
-    extractors: dict[str, type[BaseExtractor]] = {
-        # Text formats
-        ".txt": TextExtractor,
-        ".md": TextExtractor,
-        ".rst": TextExtractor,
-        # Data formats
-        ".json": JsonExtractor,
-        ".csv": CsvExtractor,
-        # Document formats
-        ".pdf": PdfExtractor,
-        ".xlsx": ExcelExtractor,
-        ".xlsm": ExcelExtractor,
-    }
-
-    extractor_class = extractors.get(suffix, TextExtractor)
+    extractor_class = _EXTRACTORS.get(suffix, TextExtractor)
     return extractor_class()
@@ -0,0 +1,300 @@
+"""Inference backends for the EasyOCR reader.
+
+EasyOCR runs its CRAFT detector and CRNN recognizer through PyTorch eager
+mode. This module builds a Reader and, when requested, swaps those networks
+for faster runtimes while leaving ``Reader.readtext`` untouched: EasyOCR only
+ever calls ``detector(x)`` and ``recognizer(image, text)``, so any callable
+with the same signature can stand in for the torch modules.
+"""
+
+from __future__ import annotations
+
+import os
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pipeline.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from easyocr import Reader
+
+ONNXRUNTIME_AVAILABLE = find_spec("onnxruntime") is not None
+
+OCR_BACKENDS = ("torch", "onnx", "compile")
+
+# Recognizer crop widths that each get their own captured graph; EasyOCR
+# crops are 64 px high and padded right to the widest crop in the batch.
+RECOGNIZER_HEIGHT = 64
+RECOGNIZER_WIDTH_BUCKETS = (160, 320, 640)
+# Crop batch sizes that get their own graphs; readtext's batch_size (1 by
+# default) and its shorter final batch are padded up to one of these
+RECOGNIZER_BATCH_BUCKETS = (1, 2, 4, 8, 16)
+
+# Heatmap values below this never survive EasyOCR's box post-processing
+# (its default low_text and link_threshold are both 0.4).
+DETECTOR_CROP_THRESHOLD = 0.4
+
+logger = get_logger(__name__)
+
+
+def _model_cache_dir() -> Path:
+    base = Path(os.environ.get("PIPELINE_CACHE_DIR", "~/.cache/browser-use")).expanduser()
+    return base / "ocr"
+
+
+def _select_providers() -> list[Any]:
+    """Pick ONNX Runtime execution providers, best first.
+
+    ``get_available_providers`` is already ordered by preference
+    (TensorRT, CUDA, OpenVINO, ..., CPU). TensorRT is configured for FP16
+    with an on-disk engine cache so the build cost is paid once.
+    """
+    import onnxruntime as ort
+
+    providers: list[Any] = []
+    for name in ort.get_available_providers():
+        if name == "TensorrtExecutionProvider":
+            providers.append((name, {
+                "trt_fp16_enable": True,
+                "trt_engine_cache_enable": True,
+                "trt_engine_cache_path": str(_model_cache_dir() / "trt"),
+            }))
+        else:
+            providers.append(name)
+    return providers
+
+
+class OrtModule:
+    """Callable stand-in for a torch module backed by an ONNX Runtime session.
+
+    Accepts and returns torch tensors so EasyOCR's pre/post-processing code
+    does not notice the swap.
+    """
+
+    def __init__(self, onnx_path: Path, device: str) -> None:
+        import onnxruntime as ort
+
+        self._session = ort.InferenceSession(str(onnx_path), providers=_select_providers())
+        self._input_names = [i.name for i in self._session.get_inputs()]
+        self._device = device
+
+    def __call__(self, *inputs: Any) -> Any:
+        import torch
+
+        feed = {
+            name: tensor.detach().cpu().numpy()
+            for name, tensor in zip(self._input_names, inputs)
+        }
+        outputs = [
+            torch.from_numpy(out).to(self._device)
+            for out in self._session.run(None, feed)
+        ]
+        return outputs[0] if len(outputs) == 1 else tuple(outputs)
+
+    def eval(self) -> OrtModule:
+        return self
+
+
+class BucketedRecognizer:
+    """Run a ``torch.compile``'d recognizer on a fixed set of input shapes.
+
+    CUDA-graph capture (``mode="reduce-overhead"``) records one graph per
+    input shape, so crops are padded up to the nearest width bucket the same
+    way EasyOCR pads them (replicating the last column), and batches are
+    padded with blank crops up to the nearest batch bucket; the padded rows
+    are dropped from the output. Wider crops and larger batches run through
+    the eager module.
+    """
+
+    def __init__(
+        self,
+        module: Any,
+        buckets: tuple[int, ...] = RECOGNIZER_WIDTH_BUCKETS,
+        batch_buckets: tuple[int, ...] = RECOGNIZER_BATCH_BUCKETS,
+    ) -> None:
+        import torch
+
+        self._eager = module
+        self._compiled = torch.compile(module, mode="reduce-overhead", fullgraph=False)
+        self._buckets = buckets
+        self._batch_buckets = batch_buckets
+
+    def __call__(self, image: Any, text: Any) -> Any:
+        import torch
+        import torch.nn.functional as F
+
+        batch, width = image.shape[0], image.shape[-1]
+        bucket = next((b for b in self._buckets if b >= width), None)
+        batch_bucket = next((b for b in self._batch_buckets if b >= batch), None)
+        if bucket is None or batch_bucket is None:
+            return self._eager(image, text)
+        if bucket != width:
+            image = F.pad(image, (0, bucket - width, 0, 0), mode="replicate")
+        if batch_bucket != batch:
+            image = torch.cat((image, image.new_zeros((batch_bucket - batch, *image.shape[1:]))))
+            text = torch.cat((text, text.new_zeros((batch_bucket - batch, *text.shape[1:]))))
+            return self._compiled(image, text)[:batch]
+        return self._compiled(image, text)
+
+    def warmup(self, device: str) -> None:
+        """Trigger compilation and graph capture for every bucket up front."""
+        import torch
+
+        with torch.no_grad():
+            for batch in self._batch_buckets:
+                text = torch.zeros(batch, 26, dtype=torch.long, device=device)
+                for width in self._buckets:
+                    self(torch.zeros(batch, 1, RECOGNIZER_HEIGHT, width, device=device), text)
+
+    def eval(self) -> BucketedRecognizer:
+        return self
+
+
+class SlicedDetector:
+    """Copy only the informative part of the CRAFT heatmaps off the GPU.
+
+    EasyOCR moves the full H x W x 2 score/link maps to the host for every
+    page. Everything outside the bounding box of above-threshold pixels is
+    discarded by its post-processing anyway, so the box is sliced on device,
+    transferred, and placed into a zero-filled host tensor of the original
+    shape. EasyOCR's own ``.cpu()`` call then becomes a no-op.
+    """
+
+    def __init__(self, module: Any, threshold: float = DETECTOR_CROP_THRESHOLD) -> None:
+        self._module = module
+        self._threshold = threshold
+
+    def __call__(self, x: Any) -> Any:
+        import torch
+
+        y, feature = self._module(x)
+        if not y.is_cuda:
+            return y, feature
+
+        host = torch.zeros(y.shape, dtype=y.dtype)
+        mask = (y > self._threshold).any(dim=-1)
+        for i in range(y.shape[0]):
+            rows = mask[i].any(dim=1).nonzero()
+            if rows.numel() == 0:
+                continue
+            cols = mask[i].any(dim=0).nonzero()
+            r0, r1 = int(rows[0]), int(rows[-1]) + 1
+            c0, c1 = int(cols[0]), int(cols[-1]) + 1
+            host[i, r0:r1, c0:c1] = y[i, r0:r1, c0:c1].cpu()
+        return host, feature
+
+    def eval(self) -> SlicedDetector:
+        return self
+
+
+def _apply_compiled_recognizer(reader: Reader) -> None:
+    """Wrap the reader's recognizer in a bucketed ``torch.compile`` graph."""
+    recognizer = BucketedRecognizer(reader.recognizer)
+    recognizer.warmup(reader.device)
+    reader.recognizer = recognizer
+
+
+def _export_onnx(module: Any, dummy_inputs: tuple[Any, ...], path: Path,
+                 input_names: list[str], output_names: list[str],
+                 dynamic_axes: dict[str, dict[int, str]]) -> Path:
+    """Export a torch module to ONNX once, reusing the cached file afterwards."""
+    if path.exists():
+        return path
+
+    import torch
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # DataParallel wraps the real network when EasyOCR runs on CUDA
+    module = getattr(module, "module", module)
+    tmp_path = path.with_suffix(".tmp")
+    with torch.no_grad():
+        torch.onnx.export(
+            module, dummy_inputs, str(tmp_path),
+            input_names=input_names, output_names=output_names,
+            dynamic_axes=dynamic_axes, opset_version=17,
+        )
+    tmp_path.replace(path)
+    return path
+
+
+def _apply_onnx_backend(reader: Reader) -> None:
+    """Replace the reader's detector and recognizer with ONNX Runtime sessions."""
+    import torch
+
+    cache_dir = _model_cache_dir()
+    device = reader.device
+
+    detector_path = _export_onnx(
+        reader.detector,
+        (torch.zeros(1, 3, 640, 640, device=device),),
+        cache_dir / "detector-craft.onnx",
+        input_names=["image"],
+        output_names=["y", "feature"],
+        dynamic_axes={"image": {0: "batch", 2: "height", 3: "width"}},
+    )
+    recognizer_path = _export_onnx(
+        reader.recognizer,
+        (torch.zeros(1, 1, 64, 320, device=device),
+         torch.zeros(1, 26, dtype=torch.long, device=device)),
+        cache_dir / f"recognizer-{reader.model_lang}.onnx",
+        input_names=["image", "text"],
+        output_names=["preds"],
+        dynamic_axes={"image": {0: "batch", 3: "width"}, "text": {0: "batch"}},
+    )
+
+    reader.detector = OrtModule(detector_path, device)
+    reader.recognizer = OrtModule(recognizer_path, device)
+
+
+def build_reader(languages: list[str], gpu: bool | None = None, backend: str = "torch") -> Reader:
+    """Create an EasyOCR reader running on the requested backend.
+
+    Args:
+        languages: EasyOCR language codes.
+        gpu: Force GPU on/off; ``None`` lets EasyOCR auto-detect.
+        backend: ``"torch"`` (EasyOCR default), ``"onnx"`` or ``"compile"``
+            (CUDA-graph captured recognizer). Both accelerated paths fall back
+            to plain torch when their runtime is unavailable or setup fails.
+
+    Returns:
+        A ready-to-use ``easyocr.Reader``.
+    """
+    import easyocr
+
+    if backend not in OCR_BACKENDS:
+        raise ValueError(f"Unsupported OCR backend: {backend}. Use one of {OCR_BACKENDS}")
+
+    use_onnx = backend == "onnx"
+    if use_onnx and not ONNXRUNTIME_AVAILABLE:
+        logger.warning("onnxruntime not installed, falling back to the torch OCR backend")
+        use_onnx = False
+
+    kwargs: dict[str, Any] = {}
+    if gpu is not None:
+        kwargs["gpu"] = gpu
+    if use_onnx:
+        # Dynamically-quantized CPU modules cannot be exported to ONNX
+        kwargs["quantize"] = False
+    reader = easyocr.Reader(languages, **kwargs)
+
+    if use_onnx:
+        try:
+            _apply_onnx_backend(reader)
+            logger.info("EasyOCR running on ONNX Runtime")
+        except Exception as e:
+            logger.warning(f"ONNX export failed, keeping the torch OCR backend: {e}")
+    elif backend == "compile":
+        if reader.device != "cuda":
+            logger.warning("Compiled OCR recognizer requires CUDA, using eager torch")
+        else:
+            try:
+                _apply_compiled_recognizer(reader)
+                logger.info("EasyOCR recognizer compiled with CUDA graphs")
+            except Exception as e:
+                logger.warning(f"torch.compile failed, keeping the eager recognizer: {e}")
+
+    if reader.device == "cuda" and not isinstance(reader.detector, OrtModule):
+        reader.detector = SlicedDetector(reader.detector)
+
+    return reader
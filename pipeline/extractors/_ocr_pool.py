@@ -0,0 +1,144 @@
+"""Persistent worker pool for OCR extraction.
+
+Creating an ``easyocr.Reader`` loads the detection and recognition networks,
+which costs seconds per instance. When many scanned documents are processed,
+paying that cost per file dominates runtime. This module keeps a long-lived
+process pool in which every worker builds (and warms) a single Reader once and
+then serves OCR jobs for the rest of the process lifetime.
+"""
+
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from multiprocessing.pool import Pool
+
+    from easyocr import Reader
+
+# Per-worker Reader, populated by ``_init_reader`` inside each pool process
+_READER: Reader | None = None
+# Why ``_init_reader`` failed in this worker, reported by every task it gets
+_INIT_ERROR: str | None = None
+
+# Longest a single file may take before the caller stops waiting for it
+OCR_TASK_TIMEOUT_SECONDS = float(os.environ.get("PIPELINE_OCR_TIMEOUT", 600))
+
+_POOL: Pool | None = None
+_POOL_KEY: tuple[tuple[str, ...], bool, str] | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _init_reader(languages: list[str], gpu: bool, backend: str) -> None:
+    """Pool initializer: build and warm the worker's EasyOCR reader.
+
+    Failures are recorded instead of raised: a raising initializer kills the
+    worker and ``multiprocessing.Pool`` respawns it forever, so tasks would
+    never run and their callers would wait indefinitely.
+    """
+    global _READER, _INIT_ERROR
+
+    try:
+        import numpy as np
+
+        from pipeline.extractors._ocr_backends import build_reader
+
+        _READER = build_reader(languages, gpu=gpu, backend=backend)
+        # Run one tiny inference so lazy kernels/allocations happen before real work
+        _READER.readtext(np.zeros((32, 128, 3), dtype=np.uint8), detail=0)
+    except Exception as e:
+        _READER = None
+        _INIT_ERROR = f"{type(e).__name__}: {e}"
+
+
+def _ocr_file(file_path: str) -> list[str]:
+    """Worker task: OCR every page of a file with the warm reader."""
+    if _INIT_ERROR is not None:
+        raise RuntimeError(f"OCR worker could not load EasyOCR: {_INIT_ERROR}")
+
+    from pipeline.extractors.ocr_extractor import load_images, read_pages
+
+    return read_pages(_READER, load_images(file_path))
+
+
+def _cuda_available() -> bool:
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def get_ocr_pool(languages: list[str], backend: str = "torch") -> Pool:
+    """Return the shared OCR pool, creating it on first use.
+
+    One worker is used when a GPU is available (workers would otherwise
+    contend for the same device); on CPU one worker per core is started.
+
+    Args:
+        languages: EasyOCR language codes the workers should load.
+        backend: Inference backend passed to ``build_reader``.
+
+    Returns:
+        A ``multiprocessing.Pool`` whose workers each hold a warm Reader.
+    """
+    global _POOL, _POOL_KEY
+
+    gpu = _cuda_available()
+    key = (tuple(languages), gpu, backend)
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_KEY != key:
+            # close() rather than terminate(): jobs other callers are still
+            # waiting on finish, then the old workers exit
+            _POOL.close()
+            _POOL = None
+        if _POOL is None:
+            workers = 1 if gpu else (os.cpu_count() or 1)
+            # spawn: forking a parent that may have touched CUDA is unsafe
+            ctx = multiprocessing.get_context("spawn")
+            _POOL = ctx.Pool(
+                processes=workers,
+                initializer=_init_reader,
+                initargs=(list(languages), gpu, backend),
+            )
+            _POOL_KEY = key
+        return _POOL
+
+
+def ocr_file(file_path: str, languages: list[str], backend: str = "torch") -> list[str]:
+    """OCR a file in the shared pool and block until its pages are read.
+
+    Args:
+        file_path: Path to an image or PDF file.
+        languages: EasyOCR language codes.
+        backend: Inference backend passed to ``build_reader``.
+
+    Returns:
+        The recognised text of each page, in page order.
+
+    Raises:
+        RuntimeError: If the workers could not load EasyOCR.
+        multiprocessing.TimeoutError: If the file takes longer than
+            ``OCR_TASK_TIMEOUT_SECONDS``.
+    """
+    result = get_ocr_pool(languages, backend).apply_async(_ocr_file, (file_path,))
+    return result.get(timeout=OCR_TASK_TIMEOUT_SECONDS)
+
+
+def shutdown_ocr_pool() -> None:
+    """Terminate the shared OCR pool if it was started."""
+    global _POOL, _POOL_KEY
+
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.terminate()
+            _POOL.join()
+            _POOL = None
+            _POOL_KEY = None
+
+
+atexit.register(shutdown_ocr_pool)
@@ -7,6 +7,7 @@ data and metadata.
 
 from __future__ import annotations
 
+import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -27,6 +28,29 @@ class FileMetadata(TypedDict):
     created_time: datetime
 
 
+@dataclass(frozen=True, slots=True)
+class FileContext:
+    """File facts gathered once per extraction call.
+
+    Extractors consult the suffix and size/mtime several times per file;
+    building this up front costs exactly one ``stat()`` syscall.
+
+    Attributes:
+        path: The file path as a ``Path``.
+        stat: Result of ``os.stat`` on the path.
+        suffix: Lower-cased file extension (e.g. ``".pdf"``).
+    """
+    path: Path
+    stat: os.stat_result
+    suffix: str
+
+    @classmethod
+    def from_path(cls, file_path: str | Path) -> FileContext:
+        """Build a context for ``file_path``, stat-ing it once."""
+        path = file_path if isinstance(file_path, Path) else Path(file_path)
+        return cls(path=path, stat=path.stat(), suffix=path.suffix.lower())
+
+
 @dataclass
 class ExtractedContent:
     """Standardized container for data extracted from a file.
@@ -100,9 +124,9 @@ class BaseExtractor(ABC):
         """
         pass
     
-    def _get_file_metadata(self, file_path: Path) -> FileMetadata:
-        """Get common file metadata."""
-        stat = file_path.stat()
+    def _get_file_metadata(self, file_path: Path | FileContext) -> FileMetadata:
+        """Get common file metadata, reusing the cached stat of a FileContext."""
+        stat = file_path.stat if isinstance(file_path, FileContext) else file_path.stat()
         return {
             "file_size_bytes": stat.st_size,
             "modified_time": datetime.fromtimestamp(stat.st_mtime),
@@ -11,7 +11,7 @@ from io import StringIO
 from pathlib import Path
 from typing import TypedDict
 
-from pipeline.extractors.base import BaseExtractor, ExtractedContent, FileMetadata
+from pipeline.extractors.base import BaseExtractor, ExtractedContent, FileContext, FileMetadata
 
 
 class ColumnInfo(TypedDict):
@@ -65,14 +65,15 @@ class CsvExtractor(BaseExtractor):
     
     def extract(self, file_path: Path) -> ExtractedContent:
         """Extract content from a CSV file."""
-        file_path = Path(file_path)
-        metadata = self._get_file_metadata(file_path)
+        ctx = FileContext.from_path(file_path)
+        file_path = ctx.path
+        metadata = self._get_file_metadata(ctx)
         
         with open(file_path, "r", encoding="utf-8", newline="") as f:
             content = f.read()
         
         # Parse CSV
-        delimiter = "\t" if file_path.suffix.lower() == ".tsv" else ","
+        delimiter = "\t" if ctx.suffix == ".tsv" else ","
         
         try:
             # Detect dialect
@@ -9,7 +9,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TypedDict
 
-from pipeline.extractors.base import BaseExtractor, ExtractedContent
+from pipeline.extractors.base import BaseExtractor, ExtractedContent, FileContext
 
 try:
     from openpyxl import load_workbook
@@ -73,8 +73,9 @@ class ExcelExtractor(BaseExtractor):
         if not OPENPYXL_AVAILABLE:
             return self._create_unavailable_result(file_path)
 
-        file_path = Path(file_path)
-        metadata = self._get_file_metadata(file_path)
+        ctx = FileContext.from_path(file_path)
+        file_path = ctx.path
+        metadata = self._get_file_metadata(ctx)
 
         try:
             workbook = load_workbook(file_path, read_only=True, data_only=True)
@@ -11,7 +11,7 @@ import json
 from pathlib import Path
 from typing import Any, TypedDict
 
-from pipeline.extractors.base import BaseExtractor, ExtractedContent
+from pipeline.extractors.base import BaseExtractor, ExtractedContent, FileContext
 
 
 class JsonStructure(TypedDict, total=False):
@@ -54,8 +54,9 @@ class JsonExtractor(BaseExtractor):
     
     def extract(self, file_path: Path) -> ExtractedContent:
         """Extract content from a JSON file."""
-        file_path = Path(file_path)
-        metadata = self._get_file_metadata(file_path)
+        ctx = FileContext.from_path(file_path)
+        file_path = ctx.path
+        metadata = self._get_file_metadata(ctx)
         
         # Attempt to read with common encodings
         content = None
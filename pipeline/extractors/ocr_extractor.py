@@ -7,35 +7,81 @@ for processing.
 
 from __future__ import annotations
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from PIL import Image
+# Only probe for the heavy OCR stack here; the actual imports (easyocr pulls in
+# torch) are deferred until an OCR extraction is really requested.
+EASYOCR_AVAILABLE = find_spec("easyocr") is not None
+PDF2IMAGE_AVAILABLE = find_spec("pdf2image") is not None
 
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-except ImportError:
-    EASYOCR_AVAILABLE = False
+# CRAFT downsizes its input anyway and recognizer crops are a fixed height, so
+# pages are capped at this long-edge size before detection.
+OCR_MAX_IMAGE_EDGE = 1600
+# pdf2image's default render resolution; pages are never rendered finer
+PDF_RENDER_DPI = 200
 
-try:
-    import numpy as np
-except ImportError:
-    np = None
-
-try:
-    from pdf2image import convert_from_path
-    PDF2IMAGE_AVAILABLE = True
-except ImportError:
-    PDF2IMAGE_AVAILABLE = False
-
-from pipeline.extractors.base import BaseExtractor, ExtractedContent
+from pipeline.extractors.base import BaseExtractor, ExtractedContent, FileContext
 from pipeline.utils.logging import get_logger
 
 if TYPE_CHECKING:
     from logging import Logger
 
     from easyocr import Reader
+    from PIL.Image import Image
+
+
+def _pdf_render_dpi(path: Path) -> int:
+    """DPI that keeps the largest page within ``OCR_MAX_IMAGE_EDGE``.
+
+    Capped at ``PDF_RENDER_DPI``, so small pages are rendered as before
+    rather than upscaled. Falls back to ``PDF_RENDER_DPI`` when the page
+    sizes cannot be read.
+    """
+    try:
+        from pypdf import PdfReader
+
+        long_edge = max(
+            max(float(page.mediabox.width), float(page.mediabox.height))
+            for page in PdfReader(path).pages
+        )
+    except Exception:
+        return PDF_RENDER_DPI
+    if long_edge <= 0:
+        return PDF_RENDER_DPI
+    # Page sizes are in points, 72 to the inch
+    return max(1, min(PDF_RENDER_DPI, int(OCR_MAX_IMAGE_EDGE * 72 / long_edge)))
+
+
+def load_images(file_path: str | Path) -> list[Image]:
+    """Rasterize a PDF (one image per page) or open a single image file.
+
+    Pages are bounded to ``OCR_MAX_IMAGE_EDGE`` on their long edge and are
+    only ever shrunk. PDFs are rendered straight at a reduced DPI rather
+    than rendered at full DPI and shrunk afterwards.
+    """
+    path = Path(file_path)
+    if path.suffix.lower() == ".pdf":
+        from pdf2image import convert_from_path
+
+        return convert_from_path(str(path), dpi=_pdf_render_dpi(path))
+
+    from PIL import Image as PILImage
+
+    image = PILImage.open(path)
+    # thumbnail only ever shrinks, and lets JPEG decode at reduced scale
+    image.thumbnail((OCR_MAX_IMAGE_EDGE, OCR_MAX_IMAGE_EDGE), PILImage.Resampling.BILINEAR)
+    return [image.convert("RGB")]
+
+
+def read_pages(reader: Reader, images: list[Image]) -> list[str]:
+    """Run OCR over page images and return the text of each page."""
+    import numpy as np
+
+    # EasyOCR expects numpy array or file path; detail=0 returns just the text list
+    return ["\n".join(reader.readtext(np.asarray(image), detail=0)) for image in images]
 
 
 class OCRExtractor(BaseExtractor):
@@ -46,20 +92,40 @@ class OCRExtractor(BaseExtractor):
     performing OCR.
     """
 
-    def __init__(self, languages: list[str] | None = None) -> None:
+    def __init__(
+        self,
+        languages: list[str] | None = None,
+        use_pool: bool | None = None,
+        backend: str | None = None,
+    ) -> None:
+        """Initialize the OCR extractor.
+
+        Args:
+            languages: EasyOCR language codes (defaults to English).
+            use_pool: Run OCR in the shared warm worker pool instead of
+                in-process. Defaults to the ``PIPELINE_OCR_POOL`` env flag.
+            backend: Inference backend, ``"torch"``, ``"onnx"`` or ``"compile"``. Defaults
+                to the ``PIPELINE_OCR_BACKEND`` env var, else ``"torch"``.
+        """
         self.logger: Logger = get_logger(__name__)
         self._reader: Reader | None = None
         self._languages: list[str] = languages or ['en']
+        self._backend: str = backend or os.environ.get("PIPELINE_OCR_BACKEND", "torch")
+        if use_pool is None:
+            use_pool = os.environ.get("PIPELINE_OCR_POOL", "").lower() in ("1", "true", "yes")
+        self._use_pool = use_pool
 
     def _load_model(self) -> None:
         """Lazy load the EasyOCR reader."""
         if self._reader is None and EASYOCR_AVAILABLE:
+            from pipeline.extractors._ocr_backends import build_reader
+
             self.logger.info(f"Loading EasyOCR model for languages: {self._languages}")
             try:
                 # gpu=False by default to be "forgiving" unless CUDA is clearly available, 
                 # but EasyOCR auto-detects. Let's let it auto-detect but we could force gpu=False if requested.
                 # Given "more forgiving", usage of GPU is fine if available, but it handles CPU well.
-                self._reader = easyocr.Reader(self._languages)
+                self._reader = build_reader(self._languages, backend=self._backend)
             except Exception as e:
                 self.logger.error(f"Failed to load EasyOCR: {e}")
                 raise
@@ -72,33 +138,29 @@ class OCRExtractor(BaseExtractor):
 
     def extract(self, file_path: Path) -> ExtractedContent:
         """Extract content using OCR."""
-        metadata = self._get_file_metadata(file_path)
+        ctx = FileContext.from_path(file_path)
+        file_path = ctx.path
+        metadata = self._get_file_metadata(ctx)
+        is_pdf = ctx.suffix == ".pdf"
         
         if not EASYOCR_AVAILABLE:
              return self._create_error_result(file_path, metadata, "EasyOCR not installed. Run `pip install easyocr`.")
 
         try:
-            self._load_model()
-            
-            images = []
-            if file_path.suffix.lower() == ".pdf":
-                if not PDF2IMAGE_AVAILABLE:
-                    return self._create_error_result(file_path, metadata, "pdf2image not installed.")
-                images = convert_from_path(str(file_path))
+            if is_pdf and not PDF2IMAGE_AVAILABLE:
+                return self._create_error_result(file_path, metadata, "pdf2image not installed.")
+
+            if self._use_pool:
+                from pipeline.extractors._ocr_pool import ocr_file
+
+                pages = ocr_file(str(file_path), self._languages, self._backend)
             else:
-                images = [Image.open(file_path).convert("RGB")]
-
-            extracted_text_parts = []
-            
-            for i, image in enumerate(images):
-                # EasyOCR expects numpy array or file path
-                img_np = np.array(image)
-                
-                # detail=0 returns just the text list
-                text_list = self._reader.readtext(img_np, detail=0)
-                page_text = "\n".join(text_list)
-                
-                extracted_text_parts.append(f"--- Page {i+1} ---\n{page_text}")
+                self._load_model()
+                pages = read_pages(self._reader, load_images(file_path))
+
+            extracted_text_parts = [
+                f"--- Page {i+1} ---\n{page_text}" for i, page_text in enumerate(pages)
+            ]
 
             content = "\n\n".join(extracted_text_parts)
             summary = self._create_summary(content)
@@ -107,7 +169,7 @@ class OCRExtractor(BaseExtractor):
                 content=content,
                 summary=summary,
                 file_path=file_path,
-                file_type="PDF (OCR)" if file_path.suffix.lower() == ".pdf" else "Image (OCR)",
+                file_type="PDF (OCR)" if is_pdf else "Image (OCR)",
                 file_size_bytes=metadata["file_size_bytes"],
                 modified_time=metadata["modified_time"],
                 metadata={"ocr_engine": "EasyOCR"}
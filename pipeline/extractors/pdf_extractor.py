@@ -1,17 +1,24 @@
 """Extraction logic for PDF documents.
 
-Handles text extraction from PDF files using the pypdf library. Includes a 
+Handles text extraction from PDF files using the pypdf library. When
+available, PyMuPDF (fitz) or pdfminer.six are tried first since they are
+considerably faster and more robust on complex layouts. Includes a
 heuristic-based fallback to OCR for scanned documents with minimal extractable 
 text content.
 """
 
 from __future__ import annotations
 
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Any, TypedDict
 
-from pipeline.extractors.base import BaseExtractor, ExtractedContent
-from pipeline.extractors.ocr_extractor import OCRExtractor
+from pipeline.extractors.base import BaseExtractor, ExtractedContent, FileContext
 
 try:
     from pypdf import PdfReader
@@ -19,6 +26,38 @@ try:
 except ImportError:
     PYPDF_AVAILABLE = False
 
+# The fast engines are only imported when a PDF is extracted
+FITZ_AVAILABLE = find_spec("pymupdf") is not None or find_spec("fitz") is not None  # fitz: PyMuPDF < 1.24
+PDFMINER_AVAILABLE = find_spec("pdfminer") is not None
+
+
+# pypdf's content-stream parser is pure Python, so large documents are split
+# into page ranges and parsed in worker processes.
+PARALLEL_PAGE_THRESHOLD = 16
+
+_page_pool: ProcessPoolExecutor | None = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Return the shared page-extraction process pool, creating it lazily."""
+    global _page_pool
+
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(_page_pool.shutdown, wait=False, cancel_futures=True)
+        return _page_pool
+
+
+def _extract_range(file_path: str, lo: int, hi: int) -> list[str]:
+    """Worker task: extract the non-empty text of pages ``lo:hi``."""
+    reader = PdfReader(file_path)
+    return [text for page in reader.pages[lo:hi] if (text := page.extract_text())]
+
 
 class PdfStructure(TypedDict, total=False):
     """Metadata and structural manifest of a PDF document.
@@ -57,6 +96,9 @@ class PdfExtractor(BaseExtractor):
 
     SUPPORTED_EXTENSIONS = [".pdf"]
 
+    # Below this many characters of text a PDF is treated as scanned
+    MIN_TEXT_CHARS = 50
+
     def supports(self, file_path: Path) -> bool:
         """Check if this extractor supports the given file."""
         return file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS
@@ -66,24 +108,26 @@ class PdfExtractor(BaseExtractor):
         if not PYPDF_AVAILABLE:
             return self._create_unavailable_result(file_path)
 
-        file_path = Path(file_path)
-        metadata = self._get_file_metadata(file_path)
+        ctx = FileContext.from_path(file_path)
+        file_path = ctx.path
+        metadata = self._get_file_metadata(ctx)
 
         try:
+            # pypdf only parses page content lazily, so opening the reader for
+            # metadata is cheap when a faster engine supplies the text
             reader = PdfReader(file_path)
 
-            # Extract text from all pages
-            text_content = []
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content.append(page_text)
-
-            content = "\n\n".join(text_content)
+            # A fast engine that ran and found almost no text means a scanned
+            # document, so pypdf is only tried when none could run
+            content = self._extract_text_fast(file_path)
+            if content is None:
+                content = self._extract_text_pypdf(reader, file_path)
 
             # Check if likely scanned (very little text)
-            if len(content.strip()) < 50:  # Heuristic: < 50 chars total
-                # Try OCR
+            if len(content.strip()) < self.MIN_TEXT_CHARS:
+                # Try OCR (imported lazily so text-only runs never load the OCR stack)
+                from pipeline.extractors.ocr_extractor import OCRExtractor
+
                 try:
                     ocr_extractor = OCRExtractor()
                     ocr_result = ocr_extractor.extract(file_path)
@@ -126,6 +170,54 @@ class PdfExtractor(BaseExtractor):
                 metadata={"error": str(e)},
             )
 
+    def _extract_text_fast(self, file_path: Path) -> str | None:
+        """Extract text with PyMuPDF or pdfminer.six when installed.
+
+        Returns:
+            The document text, or None if no fast engine is available or it
+            failed on this file.
+        """
+        try:
+            if FITZ_AVAILABLE:
+                try:
+                    import pymupdf as fitz
+                except ImportError:
+                    import fitz
+
+                with fitz.open(file_path) as doc:
+                    return "\n\n".join(page.get_text("text") for page in doc)
+            if PDFMINER_AVAILABLE:
+                from pdfminer.high_level import extract_text
+
+                return extract_text(str(file_path))
+        except Exception:
+            # Fall through to pypdf, which may still cope with the file
+            pass
+        return None
+
+    def _extract_text_pypdf(self, reader: PdfReader, file_path: Path) -> str:
+        """Extract text with pypdf, fanning out over processes for long PDFs."""
+        page_count = len(reader.pages)
+        if page_count < PARALLEL_PAGE_THRESHOLD:
+            text_content = []
+            for page in reader.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text_content.append(page_text)
+            return "\n\n".join(text_content)
+
+        workers = os.cpu_count() or 1
+        step = -(-page_count // workers)  # ceil division
+        bounds = [(lo, min(lo + step, page_count)) for lo in range(0, page_count, step)]
+        path = str(file_path)
+        chunks = _get_page_pool().map(
+            _extract_range,
+            [path] * len(bounds),
+            [lo for lo, _ in bounds],
+            [hi for _, hi in bounds],
+        )
+        return "\n\n".join(text for chunk in chunks for text in chunk)
+
     def _build_structure(self, reader: PdfReader, pdf_metadata: dict[str, Any] | None) -> PdfStructure:
         """Build structure information from PDF metadata."""
         structure: PdfStructure = {
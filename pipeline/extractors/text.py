@@ -9,7 +9,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TypedDict
 
-from pipeline.extractors.base import BaseExtractor, ExtractedContent
+from pipeline.extractors.base import BaseExtractor, ExtractedContent, FileContext
 
 
 class MarkdownStructure(TypedDict):
@@ -43,14 +43,15 @@ class TextExtractor(BaseExtractor):
     
     def extract(self, file_path: Path) -> ExtractedContent:
         """Extract content from a text file."""
-        file_path = Path(file_path)
-        metadata = self._get_file_metadata(file_path)
+        ctx = FileContext.from_path(file_path)
+        file_path = ctx.path
+        metadata = self._get_file_metadata(ctx)
         
         # Try to detect encoding
         content = self._read_with_encoding_detection(file_path)
         
         # Determine file type description
-        suffix = file_path.suffix.lower()
+        suffix = ctx.suffix
         if suffix in self._MD_EXTS:
             file_type = "Markdown"
         elif suffix in self._TXT_EXTS:
@@ -4,21 +4,36 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from pipeline.generators.base import BaseGenerator, GeneratedInstructions
-from pipeline.generators.gemini import GeminiGenerator
-from pipeline.generators.ollama import OllamaGenerator
+from pipeline.generators.cache import ResponseCache, SemanticCache
 
 if TYPE_CHECKING:
     from pipeline.config import PipelineConfig
+    from pipeline.generators.gemini import GeminiGenerator
+    from pipeline.generators.ollama import OllamaGenerator
 
 __all__ = [
     "BaseGenerator",
     "GeneratedInstructions",
     "GeminiGenerator",
     "OllamaGenerator",
+    "ResponseCache",
+    "SemanticCache",
     "get_generator",
 ]
 
 
+def __getattr__(name: str) -> type[BaseGenerator]:
+    # Provider modules pull in their SDKs (seconds for google-genai), so
+    # they are imported when first used rather than with the package
+    if name == "GeminiGenerator":
+        from pipeline.generators.gemini import GeminiGenerator
+        return GeminiGenerator
+    if name == "OllamaGenerator":
+        from pipeline.generators.ollama import OllamaGenerator
+        return OllamaGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_generator(config: PipelineConfig) -> BaseGenerator:
     """Factory function to create the appropriate generator based on config.
 
@@ -34,8 +49,10 @@ def get_generator(config: PipelineConfig) -> BaseGenerator:
     provider = config.generator.provider.lower()
 
     if provider == "gemini":
+        from pipeline.generators.gemini import GeminiGenerator
         return GeminiGenerator(config)
     elif provider == "ollama":
+        from pipeline.generators.ollama import OllamaGenerator
         return OllamaGenerator(config)
     else:
         raise ValueError(
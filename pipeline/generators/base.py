@@ -6,7 +6,9 @@ outputting generated instructions and metadata.
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -14,6 +16,41 @@ from typing import Any
 
 from pipeline.extractors.base import ExtractedContent
 
+# HTTP statuses worth retrying: timeouts, rate limits and server-side failures
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# HTTP statuses meaning the credentials or project cannot use the API at all
+FATAL_STATUS_CODES = frozenset({401, 403})
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether ``error`` is transient, so the same request may succeed later.
+
+    Covers built-in timeout/connection errors, transport errors from httpx
+    (matched by class name, since httpx is only a transitive dependency) and
+    provider API errors carrying a retryable HTTP status in ``code`` or
+    ``status_code`` (google-genai and ollama respectively).
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ == "TransportError" for cls in type(error).__mro__):
+        return True
+    status = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return status in RETRYABLE_STATUS_CODES
+
+
+def is_fatal_error(error: BaseException) -> bool:
+    """Whether ``error`` will fail every request to the provider, not just this one.
+
+    Rejected credentials and missing permissions (HTTP 401/403) are fatal:
+    concurrent and later calls would only fail the same way, so callers
+    should stop issuing them.
+    """
+    if isinstance(error, PermissionError):
+        return True
+    status = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return status in FATAL_STATUS_CODES
+
 
 @dataclass
 class GeneratedInstructions:
@@ -31,6 +68,10 @@ class GeneratedInstructions:
         model_used: Identifier of the LLM model that produced the result.
         tokens_used: Resource usage metric from the generation call.
         metadata: Provider-specific or implementation-specific extra data.
+            Contains ``"error"`` when generation failed and ``instructions``
+            holds fallback text, and then ``"retryable"`` and ``"fatal"``
+            classifying the failure (see :func:`is_retryable_error` and
+            :func:`is_fatal_error`).
     """
     
     # Core content
@@ -94,6 +135,32 @@ class BaseGenerator(ABC):
         """
         pass
     
+    async def generate_batch(self, contents: list[ExtractedContent]) -> list[GeneratedInstructions]:
+        """Generate instructions for many files at once.
+        
+        The default runs :meth:`generate` concurrently; providers with a
+        cheaper bulk endpoint override this.
+        
+        Args:
+            contents: Extracted contents to generate instructions for.
+            
+        Returns:
+            One GeneratedInstructions per input, in input order.
+        """
+        return list(await asyncio.gather(*(self.generate(content) for content in contents)))
+    
+    async def generate_stream(self, content: ExtractedContent) -> AsyncIterator[str]:
+        """Yield instruction text for ``content`` as it is produced.
+        
+        The default yields the complete :meth:`generate` output in one piece;
+        providers with a streaming API override this. Unlike
+        :meth:`generate`, overrides may let errors propagate.
+        
+        Args:
+            content: The extracted content to generate instructions from.
+        """
+        yield (await self.generate(content)).instructions
+    
     @abstractmethod
     def get_model_name(self) -> str:
         """Get the name of the model being used."""
@@ -0,0 +1,211 @@
+"""Response caches for instruction generators.
+
+The response cache is a byte-exact, time-limited LRU keyed by a hash of the
+prompt. The semantic cache additionally short-circuits LLM calls for prompts
+that are near-identical to ones answered earlier in the process lifetime:
+lookups try an exact prompt hash first and then a cosine-similarity search
+over MiniLM embeddings of previous prompts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any
+
+# sentence-transformers pulls in torch, so it is only imported on first use
+SEMANTIC_CACHE_AVAILABLE = find_spec("sentence_transformers") is not None
+
+from pipeline.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from sentence_transformers import SentenceTransformer
+
+    from pipeline.generators.base import GeneratedInstructions
+
+# Same model as the Pinecone memory so the weights are shared on disk
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+
+
+def _prompt_key(prompt: str) -> bytes:
+    return hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+
+
+class ResponseCache:
+    """Exact-match LRU cache of generation results with a time-to-live.
+
+    A hit costs one hash of the prompt, so it is checked before any other
+    cache or model call. Used from the event loop only, hence no locking.
+
+    Attributes:
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that fell through.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, GeneratedInstructions]] = OrderedDict()
+
+    def get(self, prompt: str) -> GeneratedInstructions | None:
+        """Return the unexpired result stored for ``prompt``, if any."""
+        key = _prompt_key(prompt)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, result = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, prompt: str, result: GeneratedInstructions) -> None:
+        """Store ``result``, evicting the least recently used entry when full."""
+        key = _prompt_key(prompt)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int | float]:
+        """Hit/miss counters and current size."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+class SemanticCache:
+    """In-process exact + nearest-neighbour cache of generation results.
+
+    Embeddings are L2-normalized, so the inner product equals cosine
+    similarity; a brute-force matrix-vector product over a few thousand
+    384-dimensional rows costs well under a millisecond, so no ANN index is
+    needed. Entries are evicted FIFO once ``max_entries`` is reached.
+
+    Attributes:
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that fell through to the model.
+    """
+
+    def __init__(self, threshold: float = 0.97, max_entries: int = 2048) -> None:
+        self.logger: Logger = get_logger(__name__)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._model: SentenceTransformer | None = None
+        self._lock = threading.Lock()
+        # Separate from _lock so lookups are not held up by the model download
+        self._model_lock = threading.Lock()
+        self._exact: dict[bytes, GeneratedInstructions] = {}
+        self._keys: list[bytes | None] = [None] * max_entries
+        self._results: list[GeneratedInstructions | None] = [None] * max_entries
+        self._vectors: Any = None
+        self._size = 0
+        self._next = 0
+
+    def _load_model(self) -> SentenceTransformer:
+        """Load the embedding model once, even when several threads race here."""
+        with self._model_lock:
+            if self._model is None:
+                import numpy as np
+                from sentence_transformers import SentenceTransformer
+
+                model = SentenceTransformer(SEMANTIC_CACHE_MODEL)
+                # Published last, so a thread that sees the model sees the vectors too
+                self._vectors = np.zeros(
+                    (self.max_entries, model.get_sentence_embedding_dimension()),
+                    dtype=np.float32,
+                )
+                self._model = model
+        return self._model
+
+    def _embed(self, prompt: str) -> Any:
+        model = self._model or self._load_model()
+        return model.encode(prompt, convert_to_numpy=True, normalize_embeddings=True)
+
+    def _get_exact(self, key: bytes) -> GeneratedInstructions | None:
+        with self._lock:
+            return self._exact.get(key)
+
+    def _get_semantic(self, prompt: str) -> GeneratedInstructions | None:
+        if not self._size:
+            return None
+        vector = self._embed(prompt)
+        with self._lock:
+            scores = self._vectors[:self._size] @ vector
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold:
+                return self._results[best]
+        return None
+
+    def _record(self, result: GeneratedInstructions | None, kind: str) -> tuple[GeneratedInstructions, str] | None:
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result, kind
+
+    def get(self, prompt: str) -> tuple[GeneratedInstructions, str] | None:
+        """Look up a cached result for ``prompt``.
+
+        Returns:
+            ``(result, kind)`` where kind is ``"exact"`` or ``"semantic"``,
+            or None on a miss.
+        """
+        result = self._get_exact(_prompt_key(prompt))
+        if result is not None:
+            return self._record(result, "exact")
+        return self._record(self._get_semantic(prompt), "semantic")
+
+    def put(self, prompt: str, result: GeneratedInstructions) -> None:
+        """Store the result generated for ``prompt``."""
+        key = _prompt_key(prompt)
+        vector = self._embed(prompt)
+        with self._lock:
+            slot = self._next
+            evicted = self._keys[slot]
+            if evicted is not None:
+                self._exact.pop(evicted, None)
+            self._keys[slot] = key
+            self._results[slot] = result
+            self._vectors[slot] = vector
+            self._exact[key] = result
+            self._next = (slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    async def aget(self, prompt: str) -> tuple[GeneratedInstructions, str] | None:
+        """Async lookup; only the embedding for the semantic pass runs in a thread."""
+        result = self._get_exact(_prompt_key(prompt))
+        if result is not None:
+            return self._record(result, "exact")
+        return self._record(await asyncio.to_thread(self._get_semantic, prompt), "semantic")
+
+    async def aput(self, prompt: str, result: GeneratedInstructions) -> None:
+        """Async store; embedding runs in a worker thread."""
+        await asyncio.to_thread(self.put, prompt, result)
+
+    def stats(self) -> dict[str, int | float]:
+        """Hit/miss counters and current size."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": self._size,
+        }
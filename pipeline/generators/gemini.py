@@ -7,8 +7,18 @@ metadata extraction from the model response.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import replace
 from datetime import datetime
+from functools import lru_cache
+from string import Formatter, Template
 from typing import TYPE_CHECKING, Any
 
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -18,13 +28,90 @@ from pipeline.extractors.base import ExtractedContent
 from pipeline.extractors.csv_extractor import CsvStructure
 from pipeline.extractors.json_extractor import JsonStructure
 from pipeline.extractors.text import MarkdownStructure
-from pipeline.generators.base import BaseGenerator, GeneratedInstructions
+from pipeline.generators.base import BaseGenerator, GeneratedInstructions, is_fatal_error, is_retryable_error
+from pipeline.generators.cache import SEMANTIC_CACHE_AVAILABLE, ResponseCache, SemanticCache
 from pipeline.utils.logging import get_logger
 from pipeline.utils.models import get_model_for_role
+from pipeline.utils.tokens import load_encoding, truncate_middle
 
 if TYPE_CHECKING:
     from logging import Logger
 
+# File context appended to every prompt; compiled once at import time so each
+# prompt is assembled in a single substitution instead of chained f-strings.
+_CONTEXT_TEMPLATE = Template("""
+## File Information
+- **Name**: $file_name
+- **Type**: $file_type
+- **Size**: $file_size bytes
+- **Modified**: $modified
+
+## Content Summary
+$summary
+
+$structure_info
+
+## Full Content
+```
+$content
+```
+""")
+
+# Context caches remembered per generator; step prompts and templates are few,
+# so this only guards against unbounded growth
+_CONTEXT_CACHE_MAX_ENTRIES = 64
+
+
+@lru_cache(maxsize=8)
+def _split_instruction_template(template: str) -> tuple[str, str]:
+    """Split ``template`` into its static lines and the lines with fields.
+
+    The static lines form the cacheable prompt prefix; lines such as
+    ``## Data Type: {file_type}`` carry per-file data and belong in the
+    dynamic suffix instead.
+    """
+    static: list[str] = []
+    per_file: list[str] = []
+    for line in template.splitlines():
+        if any(field is not None for _, field, _, _ in Formatter().parse(line)):
+            per_file.append(line)
+        elif line.strip() or (static and static[-1]):
+            # format() with no fields only unescapes doubled braces; blank
+            # lines left around a removed line are collapsed
+            static.append(line.format())
+    return "\n".join(static).strip(), "\n".join(per_file)
+
+
+# metadata["urgency"] values and the service tier each one is sent on
+_URGENCY_TIERS = {
+    "high": "priority",
+    "interactive": "priority",
+    "normal": "standard",
+    "low": "flex",
+    "bulk": "flex",
+}
+
+# Statuses with which a non-standard tier turns a request away (queue full,
+# capacity unavailable); such requests are retried on the standard tier
+_TIER_FALLBACK_STATUS_CODES = frozenset({429, 503})
+
+# Batch job states after which polling stops
+_BATCH_TERMINAL_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+})
+
+
+def _remember(entries: OrderedDict[bytes, Any], key: bytes, value: Any) -> None:
+    """Insert ``key`` as most recently used, evicting the oldest past the cap."""
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > _CONTEXT_CACHE_MAX_ENTRIES:
+        entries.popitem(last=False)
+
 
 class GeminiGenerator(BaseGenerator):
     """Instruction generator powered by Google Gemini LLMs.
@@ -57,6 +144,36 @@ class GeminiGenerator(BaseGenerator):
             max_tokens=config.generator.max_tokens,
         )
         self._resolved_model_name = model_name
+        
+        # Generators are built in worker threads, so the tokenizer (which may
+        # download its ranks on first use) loads here rather than on the loop
+        load_encoding()
+        
+        self._response_cache: ResponseCache | None = None
+        if config.generator.response_cache_ttl_seconds > 0:
+            self._response_cache = ResponseCache(
+                max_entries=config.generator.response_cache_max_entries,
+                ttl_seconds=config.generator.response_cache_ttl_seconds,
+            )
+        
+        self._cache: SemanticCache | None = None
+        if config.generator.semantic_cache:
+            if SEMANTIC_CACHE_AVAILABLE:
+                self._cache = SemanticCache(
+                    threshold=config.generator.semantic_cache_threshold,
+                    max_entries=config.generator.semantic_cache_max_entries,
+                )
+            else:
+                self.logger.warning("sentence-transformers not installed, semantic cache disabled")
+        
+        # Explicit Gemini context caches for static prompt prefixes:
+        # prefix digest -> (cache name, monotonic expiry)
+        self._api_key = api_key
+        self._context_cache_ttl: int = config.generator.context_cache_ttl_seconds
+        self._context_caches: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self._uncacheable_prefixes: OrderedDict[bytes, None] = OrderedDict()
+        self._context_cache_lock = asyncio.Lock()
+        self._genai_client: Any = None
     
     def get_model_name(self) -> str:
         """Get the name of the model being used."""
@@ -66,42 +183,78 @@ class GeminiGenerator(BaseGenerator):
         """Generate instructions from extracted content."""
         self.logger.info(f"Generating instructions for: {content.file_name}")
         
+        if self._is_trivial(content):
+            self.logger.info(f"Small file, synthesizing instructions locally: {content.file_name}")
+            return self._synthesize_local(content)
+        
         # Build the prompt
         prompt = self._build_prompt(content)
         
+        cached = await self._cache_get(prompt)
+        if cached is not None:
+            return self._from_cache(content, *cached)
+        
         # Generate response
+        error: Exception | None = None
         try:
-            response = await self.llm.ainvoke(prompt)
-            response_content = response.content
-            if isinstance(response_content, list):
-                # Handle cases where response_content is a list of parts
-                instructions: str = ""
-                for part in response_content:
-                    if isinstance(part, dict) and "text" in part:
-                        instructions += part["text"]
-                    else:
-                        instructions += str(part)
-            elif isinstance(response_content, dict) and "text" in response_content:
-                instructions = str(response_content["text"])
-            else:
-                instructions = str(response_content)
-            
-            # Extract token usage if available
-            tokens_used: int | None = None
-            if hasattr(response, "usage_metadata") and response.usage_metadata:
-                tokens_used = response.usage_metadata.get("total_tokens")
+            usage: dict[str, int] = {}
+            instructions = "".join([part async for part in self._stream_content(content, prompt, usage)])
+            tokens_used: int | None = usage.get("total_tokens")
             
         except Exception as e:
             self.logger.error(f"Error generating instructions: {e}")
             instructions = self._create_fallback_instructions(content, str(e))
             tokens_used = None
+            error = e
+        
+        result = self._make_result(content, instructions, tokens_used)
         
-        # Create title from filename
-        title = self._create_title(content)
+        if error is None:
+            await self._cache_put(prompt, result)
+        else:
+            result.metadata["error"] = str(error)
+            result.metadata["retryable"] = is_retryable_error(error)
+            result.metadata["fatal"] = is_fatal_error(error)
         
+        return result
+    
+    async def _cache_get(self, prompt: str) -> tuple[GeneratedInstructions, str] | None:
+        """Look ``prompt`` up in the exact response cache, then the semantic one."""
+        if self._response_cache is not None:
+            result = self._response_cache.get(prompt)
+            if result is not None:
+                return result, "exact"
+        if self._cache is not None:
+            return await self._cache.aget(prompt)
+        return None
+    
+    async def _cache_put(self, prompt: str, result: GeneratedInstructions) -> None:
+        if self._response_cache is not None:
+            self._response_cache.put(prompt, result)
+        if self._cache is not None:
+            await self._cache.aput(prompt, result)
+    
+    def _from_cache(self, content: ExtractedContent, result: GeneratedInstructions, kind: str) -> GeneratedInstructions:
+        """Re-target a cached result at ``content``."""
+        stats = self._response_cache.stats() if self._response_cache is not None else {}
+        self.logger.info(
+            f"Response cache hit ({kind}) for: {content.file_name} "
+            f"[hits={stats.get('hits', 0)} misses={stats.get('misses', 0)}]"
+        )
+        return replace(
+            result,
+            title=self._create_title(content),
+            source_file=content.file_path,
+            source_type=content.file_type,
+            generated_at=datetime.now(),
+            tokens_used=0,
+            metadata={**result.metadata, "cache": kind},
+        )
+    
+    def _make_result(self, content: ExtractedContent, instructions: str, tokens_used: int | None) -> GeneratedInstructions:
         return GeneratedInstructions(
             instructions=instructions,
-            title=title,
+            title=self._create_title(content),
             source_file=content.file_path,
             source_type=content.file_type,
             generated_at=datetime.now(),
@@ -113,50 +266,350 @@ class GeminiGenerator(BaseGenerator):
             },
         )
     
+    async def generate_batch(self, contents: list[ExtractedContent]) -> list[GeneratedInstructions]:
+        """Generate instructions for many files through the Gemini Batch API.
+        
+        Enabled by ``generator.batch``; batch jobs are billed at half the
+        real-time price but may take hours, so this suits latency-tolerant
+        bulk runs. Trivial files are synthesized locally and cache hits are
+        reused; anything the job fails to answer goes through :meth:`generate`.
+        """
+        if not self.config.generator.batch or len(contents) < 2:
+            return await super().generate_batch(contents)
+        
+        results: list[GeneratedInstructions | None] = [None] * len(contents)
+        prompts: dict[str, str] = {}
+        for i, content in enumerate(contents):
+            if self._is_trivial(content):
+                results[i] = self._synthesize_local(content)
+            else:
+                prompts[str(i)] = self._build_prompt(content)
+        
+        for key, prompt in list(prompts.items()):
+            cached = await self._cache_get(prompt)
+            if cached is not None:
+                results[int(key)] = self._from_cache(contents[int(key)], *cached)
+                del prompts[key]
+        
+        responses: dict[str, tuple[str, int | None]] = {}
+        if prompts:
+            try:
+                responses = await self._run_batch_job(prompts)
+            except Exception as e:
+                self.logger.warning(f"Gemini batch job failed, generating individually: {e}")
+        
+        retry: list[int] = []
+        for key, prompt in prompts.items():
+            i = int(key)
+            if key not in responses:
+                retry.append(i)
+                continue
+            instructions, tokens_used = responses[key]
+            results[i] = self._make_result(contents[i], instructions, tokens_used)
+            await self._cache_put(prompt, results[i])
+        
+        if retry:
+            self.logger.info(f"Generating {len(retry)} batch item(s) individually")
+            for i, result in zip(retry, await asyncio.gather(*(self.generate(contents[i]) for i in retry))):
+                results[i] = result
+        
+        return results  # type: ignore[return-value]
+    
+    async def _run_batch_job(self, prompts: dict[str, str]) -> dict[str, tuple[str, int | None]]:
+        """Submit ``prompts`` as one JSONL batch job and wait for its results.
+        
+        Returns:
+            ``key -> (text, total tokens)`` for every request that succeeded.
+        """
+        from google.genai import types
+        
+        client = self._get_genai_client()
+        generation_config = {
+            "temperature": self.config.generator.temperature,
+            "maxOutputTokens": self.config.generator.max_tokens,
+        }
+        
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8", delete=False) as f:
+            for key, prompt in prompts.items():
+                f.write(json.dumps({
+                    "key": key,
+                    "request": {
+                        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                        "generationConfig": generation_config,
+                    },
+                }))
+                f.write("\n")
+            src_path = f.name
+        try:
+            src = await client.aio.files.upload(
+                file=src_path,
+                config=types.UploadFileConfig(display_name=os.path.basename(src_path), mime_type="jsonl"),
+            )
+        finally:
+            os.unlink(src_path)
+        
+        job = await client.aio.batches.create(
+            model=self._resolved_model_name,
+            src=src.name,
+            config={"display_name": f"pipeline-{int(time.time())}"},
+        )
+        self.logger.info(f"Submitted Gemini batch job {job.name} with {len(prompts)} request(s)")
+        
+        interval = self.config.generator.batch_poll_interval_seconds
+        while job.state is None or job.state.name not in _BATCH_TERMINAL_STATES:
+            await asyncio.sleep(interval)
+            job = await client.aio.batches.get(name=job.name)
+        
+        if job.state.name not in ("JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"):
+            raise RuntimeError(f"batch job {job.name} ended in {job.state.name}: {job.error}")
+        
+        responses: dict[str, tuple[str, int | None]] = {}
+        payload = await client.aio.files.download(file=job.dest.file_name)
+        for line in payload.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response")
+            if not response or not response.get("candidates"):
+                continue
+            parts = response["candidates"][0].get("content", {}).get("parts", [])
+            text = "".join(part.get("text", "") for part in parts)
+            tokens = response.get("usageMetadata", {}).get("totalTokenCount")
+            responses[str(record.get("key"))] = (text, tokens)
+        
+        return responses
+    
+    def _get_genai_client(self) -> Any:
+        """Lazily create the google-genai client used for caches and batches."""
+        if self._genai_client is None:
+            from google import genai
+            
+            self._genai_client = genai.Client(api_key=self._api_key)
+        return self._genai_client
+    
+    async def generate_stream(self, content: ExtractedContent) -> AsyncIterator[str]:
+        """Stream instruction text for ``content`` as the model produces it.
+        
+        Lets callers start writing output after the first tokens instead of
+        waiting for the whole response. Errors propagate to the caller; use
+        :meth:`generate` for the fallback-on-error behaviour.
+        """
+        if self._is_trivial(content):
+            yield self._synthesize_local(content).instructions
+            return
+        
+        prompt = self._build_prompt(content)
+        
+        cached = await self._cache_get(prompt)
+        if cached is not None:
+            yield cached[0].instructions
+            return
+        
+        usage: dict[str, int] = {}
+        parts: list[str] = []
+        async for part in self._stream_content(content, prompt, usage):
+            parts.append(part)
+            yield part
+        
+        # Completed streams are cached like generate() results
+        await self._cache_put(prompt, self._make_result(content, "".join(parts), usage.get("total_tokens")))
+    
+    async def _stream_content(
+        self, content: ExtractedContent, prompt: str, usage: dict[str, int]
+    ) -> AsyncIterator[str]:
+        """Stream a response, sending only the dynamic suffix when the static
+        prefix is held in a Gemini context cache."""
+        cached_content = None
+        if self._context_cache_ttl > 0:
+            cached_content = await self._get_context_cache(self._build_static_prefix(content))
+        
+        if cached_content:
+            prompt = self._build_dynamic_suffix(content)
+        stream = self._stream_prompt(prompt, usage, cached_content, self._service_tier(content))
+        async for part in stream:
+            yield part
+    
+    async def _get_context_cache(self, prefix: str) -> str | None:
+        """Return the name of a live context cache holding ``prefix``.
+        
+        Creates (or re-creates after TTL expiry) the cache on demand. Prefixes
+        the API refuses to cache, typically for being under the model's
+        minimum cacheable token count, are remembered and sent inline.
+        """
+        key = hashlib.blake2b(prefix.encode(), digest_size=16).digest()
+        if key in self._uncacheable_prefixes:
+            return None
+        
+        async with self._context_cache_lock:
+            entry = self._context_caches.get(key)
+            # Renew slightly early so a request never races the expiry
+            if entry and entry[1] - 10 > time.monotonic():
+                self._context_caches.move_to_end(key)
+                return entry[0]
+            
+            try:
+                from google.genai import types
+                
+                cache = await self._get_genai_client().aio.caches.create(
+                    model=self._resolved_model_name,
+                    config=types.CreateCachedContentConfig(
+                        contents=[prefix],
+                        ttl=f"{self._context_cache_ttl}s",
+                    ),
+                )
+            except Exception as e:
+                self.logger.debug(f"Context cache unavailable for prompt prefix: {e}")
+                _remember(self._uncacheable_prefixes, key, None)
+                return None
+            
+            # Evicted caches are left to expire server-side after their TTL
+            _remember(self._context_caches, key, (cache.name, time.monotonic() + self._context_cache_ttl))
+            return cache.name
+    
+    def _service_tier(self, content: ExtractedContent) -> str:
+        """Map ``metadata["urgency"]`` to a Gemini service tier.
+        
+        Interactive requests go to the priority tier for lower time-to-first-
+        token; bulk work can use the cheaper flex tier. Content without an
+        urgency uses ``generator.service_tier``.
+        """
+        urgency = content.metadata.get("urgency")
+        if urgency is None and content.metadata.get("interactive"):
+            urgency = "high"
+        return _URGENCY_TIERS.get(urgency, self.config.generator.service_tier)
+    
+    async def _stream_prompt(
+        self,
+        prompt: str,
+        usage: dict[str, int],
+        cached_content: str | None = None,
+        service_tier: str = "standard",
+    ) -> AsyncIterator[str]:
+        """Yield response text chunks, accumulating token usage into ``usage``.
+        
+        LangChain does not expose the service tier, so non-standard tiers are
+        requested through the google-genai client, whose
+        ``GenerateContentConfig.service_tier`` is sent as ``serviceTier``.
+        A tier request rejected with 429/503 before any text arrives is
+        sent again on the standard tier.
+        """
+        if service_tier != "standard":
+            config = self._tier_config(cached_content, service_tier)
+            if config is not None:
+                started = False
+                try:
+                    async for text in self._stream_genai(prompt, usage, config):
+                        started = True
+                        yield text
+                    return
+                except Exception as e:
+                    status = getattr(e, "code", None) or getattr(e, "status_code", None)
+                    if started or status not in _TIER_FALLBACK_STATUS_CODES:
+                        raise
+                    self.logger.warning(f"Service tier {service_tier!r} rejected the request, using standard: {e}")
+        
+        kwargs: dict[str, Any] = {"cached_content": cached_content} if cached_content else {}
+        async for chunk in self.llm.astream(prompt, **kwargs):
+            if chunk.usage_metadata:
+                usage["total_tokens"] = usage.get("total_tokens", 0) + chunk.usage_metadata.get("total_tokens", 0)
+            text = self._content_text(chunk.content)
+            if text:
+                yield text
+    
+    def _tier_config(self, cached_content: str | None, service_tier: str) -> Any | None:
+        """google-genai request config for ``service_tier``; None if unsupported."""
+        try:
+            from google.genai import types
+            
+            return types.GenerateContentConfig(
+                temperature=self.config.generator.temperature,
+                max_output_tokens=self.config.generator.max_tokens,
+                cached_content=cached_content,
+                service_tier=service_tier,
+            )
+        except Exception as e:
+            # google-genai missing, or a release from before service_tier
+            self.logger.warning(f"Service tier {service_tier!r} unsupported, using standard: {e}")
+            return None
+    
+    async def _stream_genai(self, prompt: str, usage: dict[str, int], config: Any) -> AsyncIterator[str]:
+        """Stream through the google-genai client with an explicit request config."""
+        stream = await self._get_genai_client().aio.models.generate_content_stream(
+            model=self._resolved_model_name,
+            contents=prompt,
+            config=config,
+        )
+        async for chunk in stream:
+            # Gemini reports cumulative usage on each chunk
+            if chunk.usage_metadata and chunk.usage_metadata.total_token_count:
+                usage["total_tokens"] = chunk.usage_metadata.total_token_count
+            if chunk.text:
+                yield chunk.text
+    
+    @staticmethod
+    def _content_text(response_content: Any) -> str:
+        """Flatten LangChain message content (str, dict or list of parts) to text."""
+        if isinstance(response_content, list):
+            # Handle cases where response_content is a list of parts
+            return "".join(
+                part["text"] if isinstance(part, dict) and "text" in part else str(part)
+                for part in response_content
+            )
+        if isinstance(response_content, dict) and "text" in response_content:
+            return str(response_content["text"])
+        return str(response_content)
+    
     def _build_prompt(self, content: ExtractedContent) -> str:
-        """Build the prompt for instruction generation."""
-        # Get template from config
-        template = self.config.generator.instruction_template
+        """Build the prompt for instruction generation.
+        
+        The prompt is the static prefix (identical across files for a given
+        workflow step or instruction template) followed by the per-file
+        dynamic suffix, so providers can reuse cached prefix tokens.
+        """
+        return "".join((self._build_static_prefix(content), "\n\n", self._build_dynamic_suffix(content)))
+    
+    def _build_static_prefix(self, content: ExtractedContent) -> str:
+        """Task instructions: the workflow step prompt, or the instruction template."""
+        step_prompt = content.metadata.get("step_prompt")
+        if step_prompt:
+            return "".join(("### TASK\n", step_prompt))
         
+        # Only the template lines without per-file fields, so every file
+        # shares the prefix
+        return _split_instruction_template(self.config.generator.instruction_template)[0]
+    
+    def _build_dynamic_suffix(self, content: ExtractedContent) -> str:
+        """Per-file context: previous step output plus the file information block."""
         # Format structure info
         structure_info = ""
         if content.structure:
             structure_info = self._format_structure(content.structure)
         
         # Build context about the file
-        context = f"""
-## File Information
-- **Name**: {content.file_name}
-- **Type**: {content.file_type}
-- **Size**: {content.file_size_bytes:,} bytes
-- **Modified**: {content.modified_time.strftime('%Y-%m-%d %H:%M:%S')}
-
-## Content Summary
-{content.summary}
-
-{structure_info}
-
-## Full Content
-```
-{self._truncate_content(content.content)}
-```
-"""
-        
-        # Apply template
-        step_prompt = content.metadata.get("step_prompt")
-        previous_output = content.metadata.get("previous_output")
+        context = _CONTEXT_TEMPLATE.substitute(
+            file_name=content.file_name,
+            file_type=content.file_type,
+            file_size=f"{content.file_size_bytes:,}",
+            modified=content.modified_time.strftime('%Y-%m-%d %H:%M:%S'),
+            summary=content.summary,
+            structure_info=structure_info,
+            content=self._truncate_content(content.content),
+        )
         
-        if step_prompt:
-            prompt = f"### TASK\n{step_prompt}"
+        parts: list[str] = []
+        if content.metadata.get("step_prompt"):
+            previous_output = content.metadata.get("previous_output")
             if previous_output:
-                prompt += f"\n\n### CONTEXT FROM PREVIOUS STEPS\n{previous_output}"
+                parts.extend(("### CONTEXT FROM PREVIOUS STEPS\n", previous_output, "\n\n"))
         else:
-            prompt = template.format(
-                file_type=content.file_type,
-                summary=content.summary,
-            )
-        
-        return f"{prompt}\n\n{context}"
+            template_fields = _split_instruction_template(self.config.generator.instruction_template)[1]
+            if template_fields:
+                parts.extend((
+                    template_fields.format(file_type=content.file_type, summary=content.summary),
+                    "\n",
+                ))
+        parts.append(context)
+        return "".join(parts)
     
     def _format_structure(self, structure: MarkdownStructure | CsvStructure | JsonStructure | dict[str, Any]) -> str:
         """Format structure information for the prompt."""
@@ -169,27 +622,68 @@ class GeminiGenerator(BaseGenerator):
         if "headers" in structure:  # Markdown
             if structure["headers"]:
                 lines.append("### Document Headers")
-                for h in structure["headers"][:10]:
-                    indent = "  " * (h["level"] - 1)
-                    lines.append(f"{indent}- {h['text']}")
+                lines.extend(
+                    "".join(("  " * (h["level"] - 1), "- ", h["text"]))
+                    for h in structure["headers"][:10]
+                )
         
         if "columns" in structure:  # CSV
             lines.append("### Column Information")
-            for col in structure["columns"][:10]:
-                lines.append(f"- **{col['name']}** ({col['type']}): {col['unique_count']} unique values")
+            lines.extend(
+                f"- **{col['name']}** ({col['type']}): {col['unique_count']} unique values"
+                for col in structure["columns"][:10]
+            )
         
         if "keys" in structure:  # JSON
             lines.append("### Object Keys")
-            lines.append(f"- Keys: {', '.join(structure['keys'][:10])}")
+            lines.append("- Keys: " + ", ".join(structure["keys"][:10]))
         
         return "\n".join(lines)
     
-    def _truncate_content(self, content: str, max_chars: int = 10000) -> str:
-        """Truncate content if too long."""
-        if len(content) <= max_chars:
-            return content
+    def _truncate_content(self, content: str, max_tokens: int | None = None) -> str:
+        """Trim content to the prompt token budget, keeping its start and end."""
+        return truncate_middle(content, max_tokens or self.config.generator.max_content_tokens)
+    
+    def _is_trivial(self, content: ExtractedContent) -> bool:
+        """Whether ``content`` is small enough to describe without the model.
+        
+        Workflow steps always go to the model since they carry a task prompt.
+        """
+        threshold = self.config.generator.local_synthesis_max_chars
+        return (
+            threshold > 0
+            and len(content.content) < threshold
+            and not content.metadata.get("step_prompt")
+        )
+    
+    def _synthesize_local(self, content: ExtractedContent) -> GeneratedInstructions:
+        """Build template instructions from the extracted summary and structure."""
+        parts = [
+            "## Overview\n\n",
+            f"`{content.file_name}` is a small {content.file_type} file "
+            f"({content.file_size_bytes:,} bytes).\n\n",
+            "## Summary\n\n",
+            content.summary,
+            "\n",
+        ]
+        if content.structure:
+            parts.extend(("\n", self._format_structure(content.structure), "\n"))
+        parts.extend(("\n## Content\n\n```\n", content.content, "\n```\n"))
         
-        return content[:max_chars] + f"\n\n... [Truncated, {len(content) - max_chars:,} more characters]"
+        return GeneratedInstructions(
+            instructions="".join(parts),
+            title=self._create_title(content),
+            source_file=content.file_path,
+            source_type=content.file_type,
+            generated_at=datetime.now(),
+            model_used="local",
+            tokens_used=0,
+            metadata={
+                "file_size": content.file_size_bytes,
+                "summary_length": len(content.summary),
+                "synthesized": True,
+            },
+        )
     
     def _create_title(self, content: ExtractedContent) -> str:
         """Create a title from the filename."""
@@ -17,7 +17,7 @@ from pipeline.extractors.base import ExtractedContent
 from pipeline.extractors.csv_extractor import CsvStructure
 from pipeline.extractors.json_extractor import JsonStructure
 from pipeline.extractors.text import MarkdownStructure
-from pipeline.generators.base import BaseGenerator, GeneratedInstructions
+from pipeline.generators.base import BaseGenerator, GeneratedInstructions, is_fatal_error, is_retryable_error
 from pipeline.utils.logging import get_logger
 
 if TYPE_CHECKING:
@@ -87,11 +87,14 @@ class OllamaGenerator(BaseGenerator):
             self.logger.error(f"Error generating instructions: {e}")
             instructions = self._create_fallback_instructions(content, str(e))
             tokens_used = None
+            error = e
+        else:
+            error = None
 
         # Create title from filename
         title = self._create_title(content)
 
-        return GeneratedInstructions(
+        result = GeneratedInstructions(
             instructions=instructions,
             title=title,
             source_file=content.file_path,
@@ -105,6 +108,11 @@ class OllamaGenerator(BaseGenerator):
                 "provider": "ollama",
             },
         )
+        if error is not None:
+            result.metadata["error"] = str(error)
+            result.metadata["retryable"] = is_retryable_error(error)
+            result.metadata["fatal"] = is_fatal_error(error)
+        return result
 
     def _build_prompt(self, content: ExtractedContent) -> str:
         """Build the prompt for instruction generation."""
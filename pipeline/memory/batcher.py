@@ -0,0 +1,89 @@
+"""Write coalescing for the vector memory.
+
+Concurrent workflows each produce one memory record. Sending them one RPC
+at a time pays a full HTTP round trip per vector; the batcher collects
+records for a short window and ships them through a single
+``abatch_upsert`` call instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from pipeline.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from pipeline.memory.pinecone_service import PineconeMemory
+
+logger = get_logger(__name__)
+
+
+class UpsertBatcher:
+    """Coalesce memory upserts into size- or time-bounded batches.
+
+    A batch is flushed when it reaches ``batch_size`` records or when
+    ``flush_interval`` seconds have passed since its first record, whichever
+    comes first. The flusher task starts on the first submission, so the
+    batcher can be created outside an event loop.
+    """
+
+    def __init__(self, memory: PineconeMemory, batch_size: int = 64, flush_interval: float = 0.1) -> None:
+        self.memory = memory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict[str, Any] | None] | None = None
+        self._flusher: asyncio.Task[None] | None = None
+
+    async def submit(self, content: str, source_file: str, metadata: dict[str, Any] | None = None) -> None:
+        """Queue a record for the next batch; returns without waiting for the write."""
+        if self._flusher is None or self._flusher.done():
+            self._queue = asyncio.Queue()
+            self._flusher = asyncio.create_task(self._run())
+
+        item: dict[str, Any] = {"content": content, "source": source_file}
+        if metadata:
+            item["metadata"] = metadata
+        await self._queue.put(item)
+
+    async def close(self) -> None:
+        """Flush everything queued so far and stop the flusher."""
+        if self._flusher is None or self._queue is None:
+            return
+        await self._queue.put(None)
+        await self._flusher
+        self._flusher = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        stopping = False
+
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        try:
+            if not await self.memory.abatch_upsert(batch):
+                logger.warning(f"Memory batch of {len(batch)} record(s) was not stored")
+        except Exception as e:
+            logger.error(f"Failed to flush memory batch: {e}")
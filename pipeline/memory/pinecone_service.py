@@ -7,11 +7,19 @@ with metadata filtering.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
+import threading
 import uuid
-from datetime import datetime
+from collections import OrderedDict
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from importlib.util import find_spec
 from typing import TYPE_CHECKING, Any, TypedDict
 
+import numpy as np
+
 try:
     from pinecone import Pinecone, ServerlessSpec
     PINECONE_AVAILABLE = True
@@ -19,20 +27,142 @@ except ImportError:
     PINECONE_AVAILABLE = False
 
 try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
+    # Requires the ``pinecone[asyncio]`` extra (aiohttp)
+    from pinecone import PineconeAsyncio
+    import aiohttp  # noqa: F401
+    PINECONE_ASYNCIO_AVAILABLE = True
 except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+    PINECONE_ASYNCIO_AVAILABLE = False
+
+# sentence-transformers pulls in torch, so it is only imported on first use
+SENTENCE_TRANSFORMERS_AVAILABLE = find_spec("sentence_transformers") is not None
 
 from pipeline.config import PipelineConfig
 from pipeline.utils.logging import get_logger
 
 if TYPE_CHECKING:
-    from logging import Logger
+    from pinecone import AsyncIndex, Index, Pinecone, PineconeAsyncio
+    from sentence_transformers import SentenceTransformer
+
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_DIMENSION = 384  # Output size of all-MiniLM-L6-v2
+
+# Shared query vector for metadata-only lookups; rebuilt per instance only if
+# the index reports a different dimension.
+_ZERO_VECTOR: list[float] = [0.0] * EMBEDDING_DIMENSION
+
+
+# Upper bound on cached embeddings (384 float32 each, ~15 MB when full)
+EMBED_CACHE_MAX_ENTRIES = 10_000
+
+# Pinecone's fetch endpoint accepts at most this many IDs per request
+_FETCH_BATCH_SIZE = 100
+
+# Sentences per forward pass when encoding in bulk
+_EMBED_BATCH_SIZE = 64
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "openvino")
+
+# Pre-exported ONNX graphs published alongside all-MiniLM-L6-v2 on the Hub
+_ONNX_FP32_FILE = "onnx/model.onnx"
+_ONNX_INT8_FILES = (
+    ("avx512_vnni", "onnx/model_qint8_avx512_vnni.onnx"),
+    ("avx512f", "onnx/model_qint8_avx512.onnx"),
+    ("avx2", "onnx/model_quint8_avx2.onnx"),
+)
+
+logger = get_logger(__name__)
+
+
+def source_id_prefix(source_file: str) -> str:
+    """ID prefix shared by every memory stored for ``source_file``.
+
+    Memory IDs are ``<prefix><uuid>`` so the memories of one source can be
+    enumerated with ``Index.list_paginated(prefix=...)`` instead of a
+    filtered vector query.
+    """
+    return hashlib.blake2b(source_file.encode(), digest_size=8).hexdigest() + "#"
+
+
+def quantize_int8(embedding: Any) -> np.ndarray:
+    """Round an embedding to symmetric per-vector int8 levels.
+
+    Each vector is scaled so its largest component maps to +/-127 and then
+    rounded. Cosine similarity is scale invariant, so no shared calibration
+    is needed between stored vectors and queries; only rounding error is
+    introduced (up to ~2e-3 cosine drift on MiniLM vectors).
+
+    The result is still float32: Pinecone dense indexes store float32 and
+    gRPC payloads are unchanged. Only the JSON request body of the REST
+    client shrinks, since whole numbers serialize as ``37.0`` instead of 17
+    digits; for a 384-d vector that is ~8.4 KB down to ~2.4 KB.
+    """
+    values = np.asarray(embedding, dtype=np.float32)
+    peak = float(np.abs(values).max())
+    if peak == 0.0:
+        return values
+    return np.rint(values * (127.0 / peak))
+
+
+def _onnx_model_kwargs() -> dict[str, Any]:
+    """Pick the ONNX file and execution provider for this machine.
+
+    On CUDA the FP32 graph runs on the CUDA provider; on CPU the int8 graph
+    matching the best available SIMD extension is used (VNNI / AVX-512 int8
+    dot products, then AVX2).
+    """
+    import onnxruntime as ort
+
+    if "CUDAExecutionProvider" in ort.get_available_providers():
+        return {"file_name": _ONNX_FP32_FILE, "provider": "CUDAExecutionProvider"}
+
+    flags: set[str] = set()
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags.update(line.split(":", 1)[1].split())
+                    break
+    except OSError:
+        pass
+
+    file_name = next((name for flag, name in _ONNX_INT8_FILES if flag in flags), _ONNX_FP32_FILE)
+    return {"file_name": file_name, "provider": "CPUExecutionProvider"}
+
+
+def load_embedding_model(backend: str = "torch") -> SentenceTransformer:
+    """Load the MiniLM embedding model on the requested inference backend.
+
+    Args:
+        backend: ``"torch"`` (eager PyTorch), ``"onnx"`` (ONNX Runtime, int8
+            on CPU) or ``"openvino"``. Accelerated backends fall back to torch
+            when their runtime is missing or the model files cannot be loaded.
+
+    Returns:
+        A ``SentenceTransformer``; ``encode()`` behaves the same on every backend.
+    """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unsupported embedding backend: {backend}. Use one of {EMBEDDING_BACKENDS}")
 
-    from pinecone import Index, Pinecone
     from sentence_transformers import SentenceTransformer
 
+    if backend != "torch":
+        try:
+            model_kwargs = _onnx_model_kwargs() if backend == "onnx" else None
+            model = SentenceTransformer(EMBEDDING_MODEL_NAME, backend=backend, model_kwargs=model_kwargs)
+            logger.info(f"Embedding model running on {backend} ({(model_kwargs or {}).get('file_name', 'default')})")
+            return model
+        except Exception as e:
+            logger.warning(f"Embedding backend {backend!r} unavailable, using torch: {e}")
+
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+
+def _now_iso() -> str:
+    """UTC timestamp for memory metadata, to whole seconds."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
 
 class MemoryEntry(TypedDict):
     """Standardized representation of a retrieved memory record.
@@ -59,21 +189,29 @@ class PineconeMemory:
 
     def __init__(self, config: PipelineConfig) -> None:
         self.config: PipelineConfig = config
-        self.logger: Logger = get_logger(__name__)
         self._client: Pinecone | None = None
         self._index: Index | None = None
         self._model: SentenceTransformer | None = None
+        self._pool: dict[str, Any] | None = None
+        self._aclient: PineconeAsyncio | None = None
+        self._aindex: AsyncIndex | None = None
+        self._ainit_lock: asyncio.Lock | None = None
+        self._quantize: bool = config.memory.quantize_int8
+        self._embed_cache: OrderedDict[bytes, Any] = OrderedDict()
+        self._embed_cache_lock = threading.Lock()
+        self._dimension: int = EMBEDDING_DIMENSION
+        self._zero_vector: list[float] = _ZERO_VECTOR
         
         self.enabled: bool = PINECONE_AVAILABLE and SENTENCE_TRANSFORMERS_AVAILABLE
         if not self.enabled:
-            self.logger.warning("Pinecone or Sentence Transformers not available. Memory disabled.")
+            logger.warning("Pinecone or Sentence Transformers not available. Memory disabled.")
             return
 
         self._api_key = config.memory.pinecone_api_key or os.environ.get("PINECONE_API_KEY")
         self._index_name = config.memory.pinecone_index_name or os.environ.get("PINECONE_INDEX_NAME", "browser-use-memory")
         
         if not self._api_key:
-            self.logger.warning("No Pinecone API key found. Memory disabled.")
+            logger.warning("No Pinecone API key found. Memory disabled.")
             self.enabled = False
 
     def _initialize(self) -> None:
@@ -82,16 +220,16 @@ class PineconeMemory:
             return
 
         try:
-            self.logger.info("Initializing Pinecone client...")
+            logger.info("Initializing Pinecone client...")
             self._client = Pinecone(api_key=self._api_key)
             
             # Check if index exists, if not create it (Serverless)
             existing_indexes = [i.name for i in self._client.list_indexes()]
             if self._index_name not in existing_indexes:
-                self.logger.info(f"Creating Pinecone index: {self._index_name}")
+                logger.info(f"Creating Pinecone index: {self._index_name}")
                 self._client.create_index(
                     name=self._index_name,
-                    dimension=384,  # Standard for all-MiniLM-L6-v2
+                    dimension=EMBEDDING_DIMENSION,
                     metric="cosine",
                     spec=ServerlessSpec(
                         cloud="aws",
@@ -101,24 +239,146 @@ class PineconeMemory:
 
             self._index = self._client.Index(self._index_name)
             
-            self.logger.info("Loading embedding model...")
-            self._model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Follow the index's real dimension in case the model was swapped
+            dimension = self._index.describe_index_stats().dimension
+            if dimension != self._dimension:
+                self._dimension = dimension
+                self._zero_vector = [0.0] * dimension
+            
+            logger.info("Loading embedding model...")
+            self._model = load_embedding_model(self.config.memory.embedding_backend)
+            
+            workers = self.config.memory.embedding_workers
+            if workers > 1:
+                logger.info(f"Starting {workers} embedding worker processes...")
+                self._pool = self._model.start_multi_process_pool(target_devices=["cpu"] * workers)
             
         except Exception as e:
-            self.logger.error(f"Failed to initialize memory service: {e}")
+            logger.error(f"Failed to initialize memory service: {e}")
             self.enabled = False
 
-    def upsert(self, content: str, source_file: str, metadata: dict[str, Any] | None = None) -> bool:
-        """Store content in memory."""
+    @staticmethod
+    def _embed_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Any | None:
+        with self._embed_cache_lock:
+            embedding = self._embed_cache.get(key)
+            if embedding is not None:
+                self._embed_cache.move_to_end(key)
+            return embedding
+
+    def _cache_put(self, key: bytes, embedding: Any) -> None:
+        with self._embed_cache_lock:
+            self._embed_cache[key] = embedding
+            self._embed_cache.move_to_end(key)
+            while len(self._embed_cache) > EMBED_CACHE_MAX_ENTRIES:
+                self._embed_cache.popitem(last=False)
+
+    def _embed(self, text: str) -> Any:
+        """Encode text, reusing the embedding of identical earlier text."""
+        key = self._embed_key(text)
+        embedding = self._cache_get(key)
+        if embedding is None:
+            embedding = self._model.encode(text)
+            self._cache_put(key, embedding)
+        return embedding
+
+    def _embed_batch(self, texts: list[str]) -> list[Any]:
+        """Encode many texts, running one batched forward pass over cache misses."""
+        keys = [self._embed_key(text) for text in texts]
+        embeddings = [self._cache_get(key) for key in keys]
+        # First position of each distinct uncached text; repeats are filled
+        # from the same forward-pass row
+        first: dict[bytes, int] = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                first.setdefault(keys[i], i)
+        missing = list(first.values())
+        if missing:
+            sentences = [texts[i] for i in missing]
+            # Fan out to the worker pool only when there is more than one
+            # batch to share; smaller inputs are cheaper than the pipe round-trip
+            if self._pool is not None and len(sentences) > _EMBED_BATCH_SIZE:
+                encoded = self._model.encode_multi_process(
+                    sentences,
+                    self._pool,
+                    batch_size=_EMBED_BATCH_SIZE,
+                    normalize_embeddings=True,
+                )
+            else:
+                encoded = self._model.encode(
+                    sentences,
+                    batch_size=_EMBED_BATCH_SIZE,
+                    convert_to_numpy=True,
+                    show_progress_bar=False,
+                    normalize_embeddings=True,
+                )
+            by_key = {}
+            for i, embedding in zip(missing, encoded):
+                by_key[keys[i]] = embedding
+                self._cache_put(keys[i], embedding)
+            for i, embedding in enumerate(embeddings):
+                if embedding is None:
+                    embeddings[i] = by_key[keys[i]]
+        return embeddings
+
+    @staticmethod
+    def _dedupe_items(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Drop batch items that would store an identical memory twice.
+
+        Items with an explicit ``id`` are always kept; otherwise two items are
+        duplicates when content, source and metadata all match.
+        """
+        seen: set[tuple[str, str, str]] = set()
+        unique = []
+        for item in items:
+            if not item.get("id"):
+                key = (item["content"], item.get("source", "unknown"), repr(item.get("metadata")))
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(item)
+        if len(unique) < len(items):
+            logger.info(f"Deduplicated {len(items) - len(unique)} of {len(items)} batch items")
+        return unique
+
+    def _to_values(self, embedding: Any) -> np.ndarray:
+        """Convert an embedding to the float32 array sent to Pinecone.
+
+        Upserts pass the array as-is and the SDK converts it with
+        ``tolist()`` while building the request; query vectors must already
+        be lists and are converted at the call site.
+        """
+        if self._quantize:
+            return quantize_int8(embedding)
+        return np.asarray(embedding, dtype=np.float32)
+
+    def upsert(
+        self,
+        content: str,
+        source_file: str,
+        metadata: dict[str, Any] | None = None,
+        now_iso: str | None = None,
+    ) -> bool:
+        """Store content in memory.
+
+        Args:
+            content: Text to embed and store.
+            source_file: Source the memory belongs to.
+            metadata: Extra metadata merged over the defaults.
+            now_iso: ``created_at`` timestamp to use, so a burst of upserts
+                can share one; defaults to the current UTC time.
+        """
         self._initialize()
         if not self.enabled or not self._index:
             return False
 
         try:
-            vector = self._model.encode(content).tolist()
+            vector = self._to_values(self._embed(content))
             
-            doc_id = str(uuid.uuid4())
-            now = datetime.now().isoformat()
+            doc_id = f"{source_id_prefix(source_file)}{uuid.uuid4()}"
+            now = now_iso or _now_iso()
             
             meta = {
                 "source": source_file,
@@ -132,7 +392,7 @@ class PineconeMemory:
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to upsert memory: {e}")
+            logger.error(f"Failed to upsert memory: {e}")
             return False
 
     def query(self, query_text: str, top_k: int = 5, filter_dict: dict[str, Any] | None = None) -> list[MemoryEntry]:
@@ -142,7 +402,7 @@ class PineconeMemory:
             return []
 
         try:
-            vector = self._model.encode(query_text).tolist()
+            vector = self._to_values(self._embed(query_text)).tolist()
             
             results = self._index.query(
                 vector=vector,
@@ -163,7 +423,7 @@ class PineconeMemory:
             return memories
 
         except Exception as e:
-            self.logger.error(f"Failed to query memory: {e}")
+            logger.error(f"Failed to query memory: {e}")
             return []
 
     def delete(self, memory_id: str) -> bool:
@@ -174,11 +434,11 @@ class PineconeMemory:
 
         try:
             self._index.delete(ids=[memory_id])
-            self.logger.info(f"Deleted memory: {memory_id}")
+            logger.info(f"Deleted memory: {memory_id}")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to delete memory: {e}")
+            logger.error(f"Failed to delete memory: {e}")
             return False
 
     def delete_by_filter(self, filter_dict: dict[str, Any]) -> bool:
@@ -189,11 +449,11 @@ class PineconeMemory:
 
         try:
             self._index.delete(filter=filter_dict)
-            self.logger.info(f"Deleted memories with filter: {filter_dict}")
+            logger.info(f"Deleted memories with filter: {filter_dict}")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to delete by filter: {e}")
+            logger.error(f"Failed to delete by filter: {e}")
             return False
 
     def update(self, memory_id: str, content: str | None = None, metadata: dict[str, Any] | None = None) -> bool:
@@ -206,7 +466,7 @@ class PineconeMemory:
             # Fetch existing record
             fetch_result = self._index.fetch(ids=[memory_id])
             if memory_id not in fetch_result.vectors:
-                self.logger.error(f"Memory {memory_id} not found")
+                logger.error(f"Memory {memory_id} not found")
                 return False
 
             existing = fetch_result.vectors[memory_id]
@@ -216,19 +476,19 @@ class PineconeMemory:
             new_metadata = existing.metadata.copy() if existing.metadata else {}
             
             if content is not None:
-                new_vector = self._model.encode(content).tolist()
+                new_vector = self._to_values(self._embed(content))
                 new_metadata["text"] = content[:1000]
-                new_metadata["updated_at"] = datetime.now().isoformat()
+                new_metadata["updated_at"] = _now_iso()
             
             if metadata:
                 new_metadata.update(metadata)
 
             self._index.upsert(vectors=[(memory_id, new_vector, new_metadata)])
-            self.logger.info(f"Updated memory: {memory_id}")
+            logger.info(f"Updated memory: {memory_id}")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to update memory: {e}")
+            logger.error(f"Failed to update memory: {e}")
             return False
 
     def batch_upsert(self, items: list[dict[str, Any]]) -> bool:
@@ -242,19 +502,22 @@ class PineconeMemory:
             return False
 
         try:
+            items = self._dedupe_items(items)
             vectors = []
-            now = datetime.now().isoformat()
+            meta_template = {"created_at": _now_iso()}
+            
+            # Encode every uncached item in one batched forward pass
+            embeddings = self._embed_batch([item["content"] for item in items])
             
-            for item in items:
+            for item, embedding in zip(items, embeddings):
                 content = item["content"]
-                vector = self._model.encode(content).tolist()
-                doc_id = item.get("id", str(uuid.uuid4()))
+                vector = self._to_values(embedding)
+                source = item.get("source", "unknown")
+                doc_id = item.get("id") or f"{source_id_prefix(source)}{uuid.uuid4()}"
                 
-                meta = {
-                    "source": item.get("source", "unknown"),
-                    "created_at": now,
-                    "text": content[:1000]
-                }
+                meta = meta_template.copy()
+                meta["source"] = source
+                meta["text"] = content[:1000]
                 if "metadata" in item:
                     meta.update(item["metadata"])
                 
@@ -266,11 +529,11 @@ class PineconeMemory:
                 batch = vectors[i:i + batch_size]
                 self._index.upsert(vectors=batch)
             
-            self.logger.info(f"Batch upserted {len(vectors)} memories")
+            logger.info(f"Batch upserted {len(vectors)} memories")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to batch upsert: {e}")
+            logger.error(f"Failed to batch upsert: {e}")
             return False
 
     def clear_all(self) -> bool:
@@ -281,11 +544,11 @@ class PineconeMemory:
 
         try:
             self._index.delete(delete_all=True)
-            self.logger.warning("Cleared all memories from index")
+            logger.warning("Cleared all memories from index")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to clear memories: {e}")
+            logger.error(f"Failed to clear memories: {e}")
             return False
 
     def get_stats(self) -> dict[str, Any]:
@@ -304,7 +567,7 @@ class PineconeMemory:
             }
             
         except Exception as e:
-            self.logger.error(f"Failed to get stats: {e}")
+            logger.error(f"Failed to get stats: {e}")
             return {}
 
     def fetch(self, memory_ids: list[str]) -> list[MemoryEntry]:
@@ -328,61 +591,344 @@ class PineconeMemory:
             return memories
             
         except Exception as e:
-            self.logger.error(f"Failed to fetch memories: {e}")
+            logger.error(f"Failed to fetch memories: {e}")
             return []
 
+    def _list_ids(self, prefix: str) -> Iterator[str]:
+        """Enumerate the vector IDs under ``prefix`` page by page."""
+        token: str | None = None
+        while True:
+            kwargs: dict[str, Any] = {"prefix": prefix, "limit": _FETCH_BATCH_SIZE}
+            if token:
+                kwargs["pagination_token"] = token
+            page = self._index.list_paginated(**kwargs)
+            for vector in page.vectors:
+                yield vector.id
+            token = page.pagination.next if page.pagination else None
+            if not token:
+                return
+
+    def _scan_source(self, source_file: str, limit: int) -> list[MemoryEntry]:
+        """List the IDs under ``source_file``'s prefix and fetch them in batches.
+
+        Only that source's IDs are listed, so the cost grows with the
+        source's memories rather than the index. The ``source`` check guards
+        against prefix collisions.
+        """
+        memories: list[MemoryEntry] = []
+        batch: list[str] = []
+
+        def flush() -> bool:
+            for mem_id, vector_data in self._index.fetch(ids=batch).vectors.items():
+                meta = vector_data.metadata or {}
+                if meta.get("source") != source_file:
+                    continue
+                memories.append({
+                    "id": mem_id,
+                    "content": meta.get("text", ""),
+                    "metadata": meta,
+                    "score": None,
+                })
+                if len(memories) >= limit:
+                    return True
+            batch.clear()
+            return False
+
+        for mem_id in self._list_ids(source_id_prefix(source_file)):
+            batch.append(mem_id)
+            if len(batch) >= _FETCH_BATCH_SIZE and flush():
+                return memories
+        if batch:
+            flush()
+        return memories
+
+    def _query_by_metadata(self, filter_dict: dict[str, Any], top_k: int) -> list[MemoryEntry]:
+        """Metadata lookup through a single filtered zero-vector query."""
+        # Pinecone requires a query vector; a zero vector only applies the filter
+        results = self._index.query(
+            vector=self._zero_vector,
+            top_k=top_k,
+            include_metadata=True,
+            filter=filter_dict
+        )
+        
+        memories = []
+        for match in results.matches:
+            memories.append({
+                "id": match.id,
+                "content": match.metadata.get("text", ""),
+                "metadata": match.metadata,
+                "score": None  # Score not meaningful for metadata-only search
+            })
+            
+        return memories
+
     def search_by_metadata(self, filter_dict: dict[str, Any], top_k: int = 10) -> list[MemoryEntry]:
         """Search memories by metadata filter without semantic search.
         
         Note: This uses a dummy vector since Pinecone requires a query vector.
-        For pure metadata filtering, consider using fetch with list_paginated.
+        The filter is applied server-side in one request.
         """
         self._initialize()
         if not self.enabled or not self._index:
             return []
 
         try:
-            # Use a zero vector to essentially do metadata-only filtering
-            # This is a workaround since Pinecone requires a query vector
-            dummy_vector = [0.0] * 384
-            
-            results = self._index.query(
-                vector=dummy_vector,
-                top_k=top_k,
-                include_metadata=True,
-                filter=filter_dict
-            )
-            
-            memories = []
-            for match in results.matches:
-                memories.append({
-                    "id": match.id,
-                    "content": match.metadata.get("text", ""),
-                    "metadata": match.metadata,
-                    "score": None  # Score not meaningful for metadata-only search
-                })
-                
-            return memories
+            return self._query_by_metadata(filter_dict, top_k)
 
         except Exception as e:
-            self.logger.error(f"Failed to search by metadata: {e}")
+            logger.error(f"Failed to search by metadata: {e}")
             return []
 
     def list_by_source(self, source_file: str, top_k: int = 100) -> list[MemoryEntry]:
         """List all memories from a specific source file."""
-        return self.search_by_metadata(filter_dict={"source": {"$eq": source_file}}, top_k=top_k)
+        self._initialize()
+        if not self.enabled or not self._index:
+            return []
+
+        memories: list[MemoryEntry] = []
+        try:
+            # Memories are stored under a per-source ID prefix, so this lists
+            # exactly the source's IDs rather than scanning the whole index
+            memories = self._scan_source(source_file, top_k)
+        except Exception as e:
+            logger.debug(f"Prefix listing failed for {source_file}: {e}")
+        if len(memories) >= top_k:
+            return memories
+
+        # Records written before ID prefixes were introduced, and everything
+        # on pod-based indexes without ID listing
+        seen = {m["id"] for m in memories}
+        for memory in self.search_by_metadata(filter_dict={"source": {"$eq": source_file}}, top_k=top_k):
+            if memory["id"] not in seen:
+                seen.add(memory["id"])
+                memories.append(memory)
+        return memories[:top_k]
 
     def get_recent(self, limit: int = 10, since: str | None = None) -> list[MemoryEntry]:
-        """Get recent memories, optionally since a specific datetime."""
+        """Get recent memories, optionally since a specific datetime.
+        
+        One filtered query returns up to ``limit`` matches, which are then
+        ordered newest first. The query does not rank by ``created_at``, so
+        with more than ``limit`` matches these are not necessarily the
+        newest; pass ``since`` to narrow the window.
+        """
         filter_dict = None
         if since:
             filter_dict = {"created_at": {"$gte": since}}
         
-        return self.search_by_metadata(filter_dict=filter_dict or {}, top_k=limit)
+        memories = self.search_by_metadata(filter_dict=filter_dict or {}, top_k=limit)
+        memories.sort(key=lambda m: m["metadata"].get("created_at", ""), reverse=True)
+        return memories
 
     def close(self) -> None:
         """Clean up resources."""
+        if self._pool is not None:
+            from sentence_transformers import SentenceTransformer
+
+            SentenceTransformer.stop_multi_process_pool(self._pool)
+            self._pool = None
         self._client = None
         self._index = None
         self._model = None
-        self.logger.info("Memory service closed")
\ No newline at end of file
+        logger.info("Memory service closed")
+
+    # ------------------------------------------------------------------
+    # Async API
+    #
+    # Non-blocking counterparts for use from the event loop: embedding runs
+    # in a worker thread and index I/O goes through PineconeAsyncio when the
+    # asyncio extra is installed (otherwise the sync client in a thread).
+    # ------------------------------------------------------------------
+
+    async def _ainitialize(self) -> None:
+        """Lazy async initialization of the sync client, model and async index."""
+        if not self.enabled or self._aindex is not None:
+            return
+        if self._ainit_lock is None:
+            self._ainit_lock = asyncio.Lock()
+
+        async with self._ainit_lock:
+            if self._aindex is not None:
+                return
+            # Model loading and index provisioning are blocking
+            await asyncio.to_thread(self._initialize)
+            if not self.enabled or not PINECONE_ASYNCIO_AVAILABLE:
+                return
+
+            try:
+                # describe_index is a blocking HTTP call too
+                description = await asyncio.to_thread(self._client.describe_index, self._index_name)
+                host = description.host
+                self._aclient = PineconeAsyncio(api_key=self._api_key)
+                self._aindex = self._aclient.IndexAsyncio(host=host)
+            except Exception as e:
+                logger.warning(f"Async Pinecone client unavailable, using threads: {e}")
+                self._aclient = None
+                self._aindex = None
+
+    async def _aembed(self, text: str) -> Any:
+        """Embed text off the event loop; cache hits return without a thread hop."""
+        embedding = self._cache_get(self._embed_key(text))
+        if embedding is not None:
+            return embedding
+        return await asyncio.to_thread(self._embed, text)
+
+    async def _aindex_call(self, method: str, **kwargs: Any) -> Any:
+        """Call an index method on the async client, or the sync one in a thread."""
+        if self._aindex is not None:
+            return await getattr(self._aindex, method)(**kwargs)
+        return await asyncio.to_thread(getattr(self._index, method), **kwargs)
+
+    async def aupsert(
+        self,
+        content: str,
+        source_file: str,
+        metadata: dict[str, Any] | None = None,
+        now_iso: str | None = None,
+    ) -> bool:
+        """Async version of :meth:`upsert`."""
+        await self._ainitialize()
+        if not self.enabled or not self._index:
+            return False
+
+        try:
+            vector = self._to_values(await self._aembed(content))
+            
+            meta = {
+                "source": source_file,
+                "created_at": now_iso or _now_iso(),
+                "text": content[:1000]
+            }
+            if metadata:
+                meta.update(metadata)
+
+            doc_id = f"{source_id_prefix(source_file)}{uuid.uuid4()}"
+            await self._aindex_call("upsert", vectors=[(doc_id, vector, meta)])
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to upsert memory: {e}")
+            return False
+
+    async def aquery(self, query_text: str, top_k: int = 5, filter_dict: dict[str, Any] | None = None) -> list[MemoryEntry]:
+        """Async version of :meth:`query`."""
+        await self._ainitialize()
+        if not self.enabled or not self._index:
+            return []
+
+        try:
+            vector = self._to_values(await self._aembed(query_text)).tolist()
+            results = await self._aindex_call(
+                "query",
+                vector=vector,
+                top_k=top_k,
+                include_metadata=True,
+                filter=filter_dict
+            )
+            return [
+                {
+                    "id": match.id,
+                    "content": match.metadata.get("text", ""),
+                    "metadata": match.metadata,
+                    "score": match.score
+                }
+                for match in results.matches
+            ]
+
+        except Exception as e:
+            logger.error(f"Failed to query memory: {e}")
+            return []
+
+    async def afetch(self, memory_ids: list[str]) -> list[MemoryEntry]:
+        """Async version of :meth:`fetch`."""
+        await self._ainitialize()
+        if not self.enabled or not self._index:
+            return []
+
+        try:
+            result = await self._aindex_call("fetch", ids=memory_ids)
+            return [
+                {
+                    "id": mem_id,
+                    "content": vector_data.metadata.get("text", ""),
+                    "metadata": vector_data.metadata,
+                    "score": None
+                }
+                for mem_id, vector_data in result.vectors.items()
+            ]
+            
+        except Exception as e:
+            logger.error(f"Failed to fetch memories: {e}")
+            return []
+
+    async def adelete(self, memory_id: str) -> bool:
+        """Async version of :meth:`delete`."""
+        await self._ainitialize()
+        if not self.enabled or not self._index:
+            return False
+
+        try:
+            await self._aindex_call("delete", ids=[memory_id])
+            logger.info(f"Deleted memory: {memory_id}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to delete memory: {e}")
+            return False
+
+    async def abatch_upsert(self, items: list[dict[str, Any]]) -> bool:
+        """Async version of :meth:`batch_upsert`; 100-vector chunks are sent concurrently,
+        at most ``memory.max_concurrent_requests`` at a time."""
+        await self._ainitialize()
+        if not self.enabled or not self._index:
+            return False
+
+        try:
+            items = self._dedupe_items(items)
+            meta_template = {"created_at": _now_iso()}
+            embeddings = await asyncio.to_thread(
+                self._embed_batch, [item["content"] for item in items]
+            )
+            
+            vectors = []
+            for item, embedding in zip(items, embeddings):
+                content = item["content"]
+                source = item.get("source", "unknown")
+                doc_id = item.get("id") or f"{source_id_prefix(source)}{uuid.uuid4()}"
+                meta = meta_template.copy()
+                meta["source"] = source
+                meta["text"] = content[:1000]
+                if "metadata" in item:
+                    meta.update(item["metadata"])
+                vectors.append((doc_id, self._to_values(embedding), meta))
+            
+            # Cap in-flight requests so large batches do not trip rate limits
+            batch_size = 100
+            semaphore = asyncio.Semaphore(self.config.memory.max_concurrent_requests)
+            
+            async def upsert_chunk(chunk: list[tuple[str, list[float], dict[str, Any]]]) -> None:
+                async with semaphore:
+                    await self._aindex_call("upsert", vectors=chunk)
+            
+            await asyncio.gather(*(
+                upsert_chunk(vectors[i:i + batch_size])
+                for i in range(0, len(vectors), batch_size)
+            ))
+            
+            logger.info(f"Batch upserted {len(vectors)} memories")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to batch upsert: {e}")
+            return False
+
+    async def aclose(self) -> None:
+        """Close the async client session and release resources."""
+        if self._aindex is not None:
+            await self._aindex.close()
+        if self._aclient is not None:
+            await self._aclient.close()
+        self._aindex = None
+        self._aclient = None
+        self.close()
\ No newline at end of file
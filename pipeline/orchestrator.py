@@ -8,33 +8,96 @@ for advanced document analysis and processing.
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
+import random
 import re
-from dataclasses import dataclass, field
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, TypedDict
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ujson
+    UJSON_AVAILABLE = True
+except ImportError:
+    UJSON_AVAILABLE = False
+
 from pipeline.config import PipelineConfig
 from pipeline.extractors.base import ExtractedContent
 from pipeline.generators import get_generator
-from pipeline.generators.base import BaseGenerator, GeneratedInstructions
+from pipeline.generators.base import BaseGenerator, GeneratedInstructions, is_fatal_error, is_retryable_error
+from pipeline.memory.batcher import UpsertBatcher
 from pipeline.memory.pinecone_service import PineconeMemory
 from pipeline.utils.logging import get_logger
-from pipeline.utils.models import AgentRole, get_model_for_role
+from pipeline.utils.models import AgentRole, ModelOrchestrator, get_model_for_role
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable
     from logging import Logger
 
 
+__all__ = [
+    "AgentContext",
+    "AgentOrchestrator",
+    "CODE_REVIEW_WORKFLOW",
+    "DATA_ANALYSIS_WORKFLOW",
+    "FatalStepError",
+    "STARTUP_APPLICATION_WORKFLOW",
+    "WorkflowConfig",
+    "WorkflowResult",
+    "WorkflowStep",
+]
+
+
+_JSON_BLOCK_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+
+# Step outputs remembered for identical (role, prompt, input, content) calls
+STEP_CACHE_MAX_ENTRIES = 512
+
+# Agent outputs longer than this are JSON-parsed off the event loop
+JSON_OFFLOAD_CHARS = 64 * 1024
+
+# Upper bound on the backoff between attempts of a failing step, in seconds
+STEP_RETRY_MAX_DELAY = 30.0
+
+# json.loads replacement, fastest available first; all three raise ValueError
+# subclasses on malformed input. orjson takes the str as is (it reads the
+# string's cached UTF-8 buffer), so outputs are not pre-encoded.
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+elif UJSON_AVAILABLE:
+    _json_loads = ujson.loads
+else:
+    _json_loads = json.loads
+
+
+class FatalStepError(RuntimeError):
+    """A step failed in a way every other model call would too (e.g. bad credentials).
+
+    Raised instead of returning fallback output, so running sibling steps
+    are cancelled rather than left to spend tokens or fail one by one.
+    """
+
+
 class WorkflowStep(TypedDict, total=False):
     """Definition of a single step in a workflow."""
 
     name: str
     role: AgentRole | str
     action: str
-    input_from: str | None
+    input_from: str | list[str] | None
     prompt_template: str
     max_retries: int
+    stream_start_chars: int  # Start once inputs have streamed this much text
 
 
 class WorkflowConfig(TypedDict, total=False):
@@ -43,7 +106,8 @@ class WorkflowConfig(TypedDict, total=False):
     name: str
     description: str
     steps: list[WorkflowStep]
-    parallel_steps: list[list[str]]
+    parallel_steps: list[list[str]]  # Informational; concurrency follows input_from
+    max_parallel: int
 
 
 @dataclass
@@ -52,23 +116,68 @@ class AgentContext:
 
     Attributes:
         original_content: The initial data extracted from the source file.
-        intermediate_results: Map of step names to their respective text outputs.
+        intermediate_results: Map of step names to their respective text outputs,
+            in completion order.
         metadata: Arbitrary storage for persistent execution data.
-        start_time: Timestamp when the workflow began.
+        start_time: Wall-clock timestamp when the workflow began.
+        start_monotonic: ``time.perf_counter()`` reading at the same moment,
+            used for durations (unaffected by clock adjustments).
+        base_metadata: Snapshot of the original content's metadata that every
+            step's metadata is layered on.
+        streaming: Text received so far from steps that are still streaming,
+            as chunk lists keyed by step name.
     """
 
     original_content: ExtractedContent
     intermediate_results: dict[str, str] = field(default_factory=dict)
     metadata: dict[str, Any] = field(default_factory=dict)
     start_time: datetime = field(default_factory=datetime.now)
+    start_monotonic: float = field(default_factory=time.perf_counter)
+    base_metadata: dict[str, Any] = field(init=False)
+    streaming: dict[str, list[str]] = field(default_factory=dict)
+    _step_key_prefixes: dict[tuple[AgentRole, str], Any] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.base_metadata = dict(self.original_content.metadata)
+
+    @cached_property
+    def content_digest(self) -> bytes:
+        """BLAKE2b digest of the original content, used in step cache keys."""
+        return hashlib.blake2b(self.original_content.content.encode(), digest_size=16).digest()
+
+    def step_key(self, role: AgentRole, prompt_template: str, previous_output: str) -> bytes:
+        """Step cache key: a BLAKE2b of role, file, prompt and input, keyed by the content.
+
+        The hash state after the fixed part is kept per ``(role, prompt)``
+        and copied, so repeat steps only hash their input, which is fed in
+        without first being joined into one large string.
+        """
+        prefix = self._step_key_prefixes.get((role, prompt_template))
+        if prefix is None:
+            prefix = hashlib.blake2b(digest_size=16, key=self.content_digest)
+            for part in (role.value, self.original_content.file_name, prompt_template):
+                prefix.update(part.encode())
+                prefix.update(b"\0")
+            self._step_key_prefixes[(role, prompt_template)] = prefix
+        hasher = prefix.copy()
+        hasher.update(previous_output.encode())
+        return hasher.digest()
 
     def add_result(self, step_name: str, result: str) -> None:
         """Add a result from a workflow step."""
         self.intermediate_results[step_name] = result
+        self.streaming.pop(step_name, None)
 
     def get_result(self, step_name: str) -> str | None:
-        """Get a result from a previous step."""
-        return self.intermediate_results.get(step_name)
+        """Get a result from a previous step, or its partial output while it streams."""
+        result = self.intermediate_results.get(step_name)
+        if result is None and step_name in self.streaming:
+            return "".join(self.streaming[step_name])
+        return result
+
+    def streamed_chars(self, step_name: str) -> int:
+        """Characters streamed so far by a running step."""
+        return sum(map(len, self.streaming.get(step_name, ())))
 
 
 @dataclass
@@ -94,42 +203,235 @@ class WorkflowResult:
     errors: list[str] = field(default_factory=list)
 
 
+# Pre-defined workflows. Built once and shared by every caller, so treat
+# them as read-only; copy.deepcopy one before customising it.
+CODE_REVIEW_WORKFLOW: WorkflowConfig = {
+    "name": "code_review",
+    "description": "Multi-agent code review workflow",
+    "steps": [
+        {
+            "name": "analyze",
+            "role": "planner",
+            "action": "analyze",
+            "prompt_template": "Analyze this code and identify key areas for review.",
+            "max_retries": 1,
+        },
+        {
+            "name": "review",
+            "role": "engineer",
+            "action": "review",
+            "input_from": "analyze",
+            "prompt_template": "Review the code focusing on: {previous_output}",
+            "max_retries": 1,
+        },
+        {
+            "name": "test_plan",
+            "role": "tester",
+            "action": "plan_tests",
+            "input_from": "review",
+            "prompt_template": "Create test cases based on the review: {previous_output}",
+            "max_retries": 1,
+        },
+    ],
+    "parallel_steps": [],
+}
+
+
+DATA_ANALYSIS_WORKFLOW: WorkflowConfig = {
+    "name": "data_analysis",
+    "description": "Multi-agent data analysis workflow",
+    "steps": [
+        {
+            "name": "explore",
+            "role": "thinker",
+            "action": "explore",
+            "prompt_template": "Explore this data and identify patterns, anomalies, and insights.",
+            "max_retries": 1,
+        },
+        {
+            "name": "analyze",
+            "role": "engineer",
+            "action": "analyze",
+            "input_from": "explore",
+            "prompt_template": "Perform detailed analysis on: {previous_output}",
+            "max_retries": 1,
+        },
+        {
+            "name": "summarize",
+            "role": "planner",
+            "action": "summarize",
+            "input_from": "analyze",
+            "prompt_template": "Create an executive summary: {previous_output}",
+            "max_retries": 1,
+        },
+    ],
+    "parallel_steps": [],
+}
+
+
+STARTUP_APPLICATION_WORKFLOW: WorkflowConfig = {
+    "name": "startup_application",
+    "description": "Multi-agent startup application extraction workflow",
+    "steps": [
+        {
+            "name": "analyze_startup",
+            "role": "planner",
+            "action": "analyze",
+            "prompt_template": "Analyze this startup document and identify core themes for a hacker house application.",
+            "max_retries": 1,
+        },
+        {
+            "name": "extract_form_data",
+            "role": "engineer",
+            "action": "extract",
+            "input_from": "analyze_startup",
+            "prompt_template": "Extract concise form-ready fields (founder, mission, tech stack) from: {previous_output}",
+            "max_retries": 2,
+        },
+        {
+            "name": "refine_pitch",
+            "role": "reviewer",
+            "action": "optimize",
+            "input_from": "extract_form_data",
+            "prompt_template": "Refine the extraction for a hacker house application. Output final pitch and a JSON block for auto-filling.",
+            "max_retries": 1,
+        },
+    ],
+    "parallel_steps": [],
+}
+
+
+def _extract_json(output: str) -> dict[str, Any] | None:
+    """Parse the first fenced JSON block in ``output``, else its outermost braces."""
+    try:
+        # Look for JSON between code blocks (skip the regex when there are none)
+        if "```json" in output:
+            match = _JSON_BLOCK_RE.search(output)
+            if match:
+                return _json_loads(match.group(1))
+
+        # Fallback to finding anything that looks like a JSON object
+        # Finding the first { and the last } in the string
+        start = output.find('{')
+        if start == -1:
+            return None
+        end = output.rfind('}', start)
+        if end != -1:
+            return _json_loads(output[start:end+1])
+    except ValueError:
+        pass
+    return None
+
+
+def _step_role(step: WorkflowStep) -> AgentRole:
+    """Parse a step's role (default: engineer); ValueError if it is unknown."""
+    role = step.get("role", "engineer")
+    return role if isinstance(role, AgentRole) else AgentRole(role.lower())
+
+
+def _input_sources(step: WorkflowStep) -> list[str]:
+    """Names of the steps whose output ``step`` consumes."""
+    input_from = step.get("input_from")
+    if not input_from:
+        return []
+    if isinstance(input_from, str):
+        return [input_from]
+    return list(input_from)
 
 
 class AgentOrchestrator:
     """Coordinator for multi-agent workflows.
 
     Responsible for managing agent roles, mapping them to appropriate models,
-    executing steps in planned order (sequential or parallel), and maintaining
-    execution context.
+    executing steps as soon as their inputs are available (independent steps
+    in parallel), and maintaining execution context.
     """
 
     def __init__(self, config: PipelineConfig) -> None:
         self.config = config
         self.logger: Logger = get_logger(__name__)
         self._generators: dict[AgentRole, BaseGenerator] = {}
+        self._result_cache: OrderedDict[bytes, str] = OrderedDict()
+        self._inflight: dict[bytes, asyncio.Future[str]] = {}
         self.memory = PineconeMemory(config)
+        self._batcher = UpsertBatcher(self.memory)
+        
+        # Caps concurrent LLM calls across all workflows on this orchestrator
+        self._sem = asyncio.Semaphore(config.generator.max_parallel)
+
+    async def close(self) -> None:
+        """Flush queued memory writes, then release the memory client."""
+        await self._batcher.close()
+        await self.memory.aclose()
+
+    def _make_role_config(self, role: AgentRole, model_name: str) -> PipelineConfig:
+        """Copy the pipeline config with the generator pointed at ``model_name``."""
+        self.logger.info(f"Using model {model_name} for role {role.value}")
+        # Only the generator section differs per role; every other section
+        # is shared with the pipeline config by reference
+        return self.config.model_copy(
+            update={"generator": self.config.generator.model_copy(update={"model": model_name})}
+        )
 
     def _get_generator_for_role(self, role: AgentRole) -> BaseGenerator:
         """Get or create a generator configured for a specific role."""
         if role not in self._generators:
             # Get the best model for this role
             model_name = get_model_for_role(role.value)
-            self.logger.info(f"Using model {model_name} for role {role.value}")
+            self._generators[role] = get_generator(self._make_role_config(role, model_name))
 
-            # Create a config copy with the role-specific model
-            role_config = self.config.model_copy(deep=True)
-            role_config.generator.model = model_name
+        return self._generators[role]
 
-            self._generators[role] = get_generator(role_config)
+    async def warmup(self, roles: Iterable[AgentRole] | None = None) -> None:
+        """Create the generators for ``roles`` (default: all roles) ahead of use.
 
-        return self._generators[role]
+        Model selection runs once for all roles, then the generators are
+        built concurrently in worker threads, keeping config deep-copies and
+        client construction off the event loop and out of the first step's
+        latency. Roles that fail to build are logged and left to the lazy
+        path in :meth:`_get_generator_for_role`.
+        """
+        missing = [role for role in (AgentRole if roles is None else roles) if role not in self._generators]
+        if not missing:
+            return
+
+        def resolve_models() -> dict[AgentRole, str]:
+            # One ModelOrchestrator so discovery and its cache file are shared
+            models = ModelOrchestrator()
+            return {role: models.get_best_model_for_task(role) for role in missing}
+
+        try:
+            model_names = await asyncio.to_thread(resolve_models)
+        except Exception as e:
+            self.logger.warning(f"Model selection failed during warmup: {e}")
+            return
+
+        generators = await asyncio.gather(
+            *(
+                asyncio.to_thread(get_generator, self._make_role_config(role, model_names[role]))
+                for role in missing
+            ),
+            return_exceptions=True,
+        )
+        for role, generator in zip(missing, generators):
+            if isinstance(generator, Exception):
+                self.logger.warning(f"Could not prepare generator for role {role.value}: {generator}")
+            else:
+                self._generators.setdefault(role, generator)
 
     async def execute_workflow(
         self, workflow: WorkflowConfig, content: ExtractedContent
     ) -> WorkflowResult:
         """Run a predefined workflow on the given content.
 
+        Steps are scheduled as a dependency graph built from ``input_from``:
+        every step whose inputs are complete starts immediately, so
+        independent steps run concurrently and wall time follows the
+        critical path rather than the step count. A step that sets
+        ``stream_start_chars`` starts as soon as each of its inputs has
+        streamed that many characters, taking the partial text as input;
+        use it only where a prefix of the upstream output is enough.
+
         Args:
             workflow: The workflow configuration defining steps and roles.
             content: The input data to process.
@@ -140,49 +442,137 @@ class AgentOrchestrator:
         self.logger.info(f"Starting workflow: {workflow.get('name', 'unnamed')}")
 
         context = AgentContext(original_content=content)
-        steps_completed = []
-        agent_outputs = {}
+        # The context is the only store of step outputs; its insertion order
+        # is completion order, so it doubles as the steps_completed record
+        agent_outputs = context.intermediate_results
         errors = []
 
-        steps = workflow.get("steps", [])
-        parallel_groups = workflow.get("parallel_steps", [])
+        steps = [s for s in workflow.get("steps", []) if s.get("name")]
+        step_map = {s["name"]: s for s in steps}
+        deps = self._build_dag(steps)
+
+        # Parse roles once, and reject unknown ones before any step has
+        # spent tokens
+        step_roles: dict[str, AgentRole] = {}
+        for step in steps:
+            try:
+                step_roles[step["name"]] = _step_role(step)
+            except ValueError:
+                errors.append(f"Step '{step['name']}' has unknown role: {step.get('role')}")
+        if errors:
+            for error in errors:
+                self.logger.error(error)
+            return WorkflowResult(
+                workflow_name=workflow.get("name", "unnamed"),
+                success=False,
+                steps_completed=[],
+                final_output="",
+                execution_time_seconds=time.perf_counter() - context.start_monotonic,
+                agent_outputs={},
+                errors=errors,
+            )
 
-        # Create a map for quick lookup of step definitions
-        step_map = {s.get("name"): s for s in steps}
+        # Build every role's generator up front rather than inside the first
+        # step that needs it
+        await self.warmup(set(step_roles.values()))
 
-        # Determine execution order
-        execution_plan = self._build_execution_plan(steps, parallel_groups)
+        semaphore = self._workflow_semaphore(workflow)
+        pending = set(step_map)
+        failed: set[str] = set()
+        in_flight: dict[asyncio.Task[str], str] = {}
 
-        for group in execution_plan:
-            # Resolve step definitions for this group
-            group_steps = []
-            for name in group:
-                if name in step_map:
-                    group_steps.append(step_map[name])
-                else:
-                    self.logger.warning(f"Step '{name}' in parallel_steps not found in steps definition.")
+        # Steps with stream_start_chars may start on partial input, so the
+        # steps feeding them stream their text into the context as it is
+        # generated; progress wakes the scheduler when new text arrives
+        streamed = {src for s in steps if s.get("stream_start_chars") for src in deps[s["name"]]}
+        progress = asyncio.Event()
+
+        def stream_into(name: str) -> Callable[[str], None]:
+            chunks = context.streaming[name] = []
 
-            if not group_steps:
-                continue
+            def on_chunk(part: str) -> None:
+                chunks.append(part)
+                progress.set()
 
-            self.logger.info(f"Executing step group: {group}")
+            return on_chunk
 
-            group_errors = await self._execute_step_group(
-                group_steps, context, agent_outputs, steps_completed
+        def inputs_ready(name: str) -> bool:
+            threshold = step_map[name].get("stream_start_chars")
+            return all(
+                src in agent_outputs or (threshold and context.streamed_chars(src) >= threshold)
+                for src in deps[name]
             )
-            errors.extend(group_errors)
+
+        try:
+            while pending or in_flight:
+                # Steps downstream of a failure can never run
+                for name in [n for n in pending if deps[n] & failed]:
+                    pending.discard(name)
+                    failed.add(name)
+                    errors.append(f"Step '{name}' skipped: upstream step failed")
+
+                ready = [n for n in pending if inputs_ready(n)]
+                for name in ready:
+                    pending.discard(name)
+                    self.logger.info(f"Executing step: {name} with role: {step_roles[name].value}")
+                    on_chunk = stream_into(name) if name in streamed else None
+                    task = asyncio.create_task(
+                        self._run_step(step_map[name], step_roles[name], context, semaphore, on_chunk)
+                    )
+                    in_flight[task] = name
+
+                if not in_flight:
+                    if pending:
+                        errors.append(f"Unresolvable step dependencies: {sorted(pending)}")
+                    break
+
+                waiting: set[asyncio.Future[Any]] = set(in_flight)
+                progress_waiter = None
+                if any(step_map[n].get("stream_start_chars") for n in pending):
+                    progress.clear()
+                    progress_waiter = asyncio.ensure_future(progress.wait())
+                    waiting.add(progress_waiter)
+
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if progress_waiter is not None:
+                    progress_waiter.cancel()
+                    done.discard(progress_waiter)
+
+                fatal = False
+                for task in done:
+                    name = in_flight.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        error_msg = f"Step '{name}' failed: {e}"
+                        self.logger.error(error_msg)
+                        errors.append(error_msg)
+                        failed.add(name)
+                        context.streaming.pop(name, None)
+                        fatal = fatal or isinstance(e, FatalStepError)
+                        continue
+                    context.add_result(name, result)
+
+                if fatal:
+                    # Every other call would fail the same way; stop paying for them
+                    for name in sorted([*in_flight.values(), *pending]):
+                        errors.append(f"Step '{name}' cancelled: workflow aborted after a fatal error")
+                    self.logger.error("Aborting workflow after a fatal step error")
+                    break
+        finally:
+            for task in in_flight:
+                task.cancel()
 
         # Calculate execution time
-        execution_time = (datetime.now() - context.start_time).total_seconds()
-
-        # Get final output (last step's result or combined)
-        final_output = ""
-        if agent_outputs:
-            final_output = list(agent_outputs.values())[-1]
-            
-            # Store in memory
+        execution_time = time.perf_counter() - context.start_monotonic
+
+        final_step = self._final_step([s["name"] for s in steps], deps, agent_outputs)
+        final_output = agent_outputs.get(final_step, "") if final_step else ""
+        if final_output:
+            # Store in memory in the background; results from concurrent
+            # workflows are coalesced into batched upserts
             if self.memory.enabled:
-                self.memory.upsert(
+                await self._batcher.submit(
                     content=final_output,
                     source_file=content.file_name,
                     metadata={"workflow": workflow.get("name"), "type": "workflow_result"}
@@ -191,114 +581,287 @@ class AgentOrchestrator:
         return WorkflowResult(
             workflow_name=workflow.get("name", "unnamed"),
             success=len(errors) == 0,
-            steps_completed=steps_completed,
+            steps_completed=list(agent_outputs),
             final_output=final_output,
             execution_time_seconds=execution_time,
             agent_outputs=agent_outputs,
             errors=errors,
         )
 
-    def _build_execution_plan(self, steps: list[WorkflowStep], parallel_groups: list[list[str]]) -> list[list[str]]:
-        """Build the execution plan based on sequential or parallel configuration."""
-        if parallel_groups:
-            return parallel_groups
-        # Default to sequential execution of all defined steps
-        return [[s.get("name")] for s in steps if s.get("name")]
+    @staticmethod
+    def _final_step(
+        names: list[str], deps: dict[str, set[str]], agent_outputs: dict[str, str]
+    ) -> str | None:
+        """Pick the step whose output is the workflow's result.
 
-    async def _execute_step_group(
+        That is the last-defined terminal node of the graph (a step no other
+        step consumes) that completed; if every terminal step failed, the
+        last-defined step that completed. Completion order is never used,
+        since concurrent steps finish in arbitrary order.
+        """
+        consumed = set().union(*deps.values()) if deps else set()
+        completed = [name for name in names if name in agent_outputs]
+        terminal = [name for name in completed if name not in consumed]
+        if terminal:
+            return terminal[-1]
+        return completed[-1] if completed else None
+
+    def _build_dag(self, steps: list[WorkflowStep]) -> dict[str, set[str]]:
+        """Map each step name to the set of step names it takes input from."""
+        names = {s["name"] for s in steps}
+        deps: dict[str, set[str]] = {}
+        for step in steps:
+            sources = _input_sources(step)
+            unknown = [src for src in sources if src not in names]
+            for src in unknown:
+                self.logger.warning(f"Step '{step['name']}' takes input from unknown step '{src}'")
+            deps[step["name"]] = {src for src in sources if src in names}
+        return deps
+
+    def _workflow_semaphore(self, workflow: WorkflowConfig) -> asyncio.Semaphore:
+        """Concurrency limit for a workflow: its own ``max_parallel`` or the shared one."""
+        limit = workflow.get("max_parallel")
+        if isinstance(limit, int) and limit > 0:
+            return asyncio.Semaphore(limit)
+        return self._sem
+
+    async def _run_step(
         self,
-        group_steps: list[WorkflowStep],
+        step: WorkflowStep,
+        role: AgentRole,
         context: AgentContext,
-        agent_outputs: dict[str, str],
-        steps_completed: list[str]
-    ) -> list[str]:
-        """Execute a group of steps (parallel or single) and return errors."""
-        errors = []
-        try:
-            if len(group_steps) > 1:
-                # Execute in parallel
-                results = await self.execute_parallel_steps(group_steps, context)
-                for step_name, result in results.items():
-                    context.add_result(step_name, result)
-                    agent_outputs[step_name] = result
-                    steps_completed.append(step_name)
-            else:
-                # Execute single step
-                step = group_steps[0]
-                step_name = step.get("name", "unnamed_step")
-                role_str = step.get("role", "engineer")
-                role = AgentRole(role_str.lower())
-
-                self.logger.info(f"Executing step: {step_name} with role: {role.value}")
-                
-                result = await self._execute_step(step, role, context)
-                context.add_result(step_name, result)
-                agent_outputs[step_name] = result
-                steps_completed.append(step_name)
-
-        except Exception as e:
-            error_msg = f"Step group execution failed: {e}"
-            self.logger.error(error_msg)
-            errors.append(error_msg)
-            
-        return errors
+        semaphore: asyncio.Semaphore | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+    ) -> str:
+        async with semaphore or self._sem:
+            return await self._execute_step(step, role, context, on_chunk)
 
     async def _execute_step(
-        self, step: WorkflowStep, role: AgentRole, context: AgentContext
+        self,
+        step: WorkflowStep,
+        role: AgentRole,
+        context: AgentContext,
+        on_chunk: Callable[[str], None] | None = None,
     ) -> str:
-        """Execute a single workflow step."""
+        """Execute a single workflow step.
+
+        With ``on_chunk`` the output is streamed and passed to it piece by
+        piece as it is generated; cached and joined outputs arrive as one
+        piece.
+        """
         generator = self._get_generator_for_role(role)
 
         # Build the step prompt
         prompt_template = step.get("prompt_template", "")
-        input_from = step.get("input_from")
-
-        # Get input from previous step if specified
-        previous_output = ""
-        if input_from:
-            previous_output = context.get_result(input_from) or ""
-
-        # Create a modified content with the step-specific prompt
-        step_content = ExtractedContent(
-            content=context.original_content.content,
-            summary=context.original_content.summary,
-            file_path=context.original_content.file_path,
-            file_type=context.original_content.file_type,
-            file_size_bytes=context.original_content.file_size_bytes,
-            modified_time=context.original_content.modified_time,
-            structure=context.original_content.structure,
+
+        # Get input from previous step(s) if specified
+        sources = _input_sources(step)
+        if len(sources) == 1:
+            previous_output = context.get_result(sources[0]) or ""
+        else:
+            previous_output = "\n\n".join(
+                f"## {src}\n{context.get_result(src) or ''}" for src in sources
+            )
+
+        key = context.step_key(role, prompt_template, previous_output)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            self._result_cache.move_to_end(key)
+            self.logger.info(f"Step cache hit for role {role.value}")
+            if on_chunk is not None:
+                on_chunk(cached)
+            return cached
+
+        # An identical step is already running: wait for its output instead
+        # of paying for the same generation twice. The shield keeps a
+        # cancelled waiter from cancelling the shared call.
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.logger.info(f"Joining in-flight step for role {role.value}")
+            output = await asyncio.shield(inflight)
+            if on_chunk is not None:
+                on_chunk(output)
+            return output
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            output = await self._generate_step(
+                step, generator, context, key, prompt_template, previous_output, on_chunk
+            )
+        except asyncio.CancelledError:
+            # Waiters belong to other steps, which should fail rather than be cancelled
+            future.set_exception(RuntimeError("identical step was cancelled"))
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(output)
+            return output
+        finally:
+            del self._inflight[key]
+            if future.done() and not future.cancelled():
+                # Mark the exception retrieved when nobody joined
+                future.exception()
+
+    async def _generate_step(
+        self,
+        step: WorkflowStep,
+        generator: BaseGenerator,
+        context: AgentContext,
+        key: bytes,
+        prompt_template: str,
+        previous_output: str,
+        on_chunk: Callable[[str], None] | None = None,
+    ) -> str:
+        """Generate a step's output and store it in the step cache."""
+        # Share the original content by reference; only the per-step
+        # metadata is new
+        step_content = replace(
+            context.original_content,
             metadata={
-                **context.original_content.metadata,
+                **context.base_metadata,
                 "step_prompt": prompt_template,
                 "previous_output": previous_output,
             },
         )
 
-        result: GeneratedInstructions = await generator.generate(step_content)
+        result = await self._generate_with_retry(generator, step_content, step, on_chunk)
+        if "error" not in result.metadata:
+            self._result_cache[key] = result.instructions
+            if len(self._result_cache) > STEP_CACHE_MAX_ENTRIES:
+                self._result_cache.popitem(last=False)
         return result.instructions
 
+    async def _generate_with_retry(
+        self,
+        generator: BaseGenerator,
+        content: ExtractedContent,
+        step: WorkflowStep,
+        on_chunk: Callable[[str], None] | None = None,
+    ) -> GeneratedInstructions:
+        """Run ``generator`` with up to ``step["max_retries"]`` retries.
+
+        Only transient failures are retried, whether raised or reported by
+        the generator through ``metadata["retryable"]``; backoff is
+        exponential with jitter, capped at :data:`STEP_RETRY_MAX_DELAY`.
+        A transient failure that outlasts its retries raises, so the
+        scheduler fails the step (and skips its dependents) rather than
+        feeding fallback text downstream. Permanent failures keep the
+        generator's fallback output.
+
+        Streamed attempts (``on_chunk`` given) are only retried while nothing
+        has been passed on yet, since consumers may already hold the text.
+
+        Fatal failures (see :func:`is_fatal_error`) are never retried.
+
+        Raises:
+            FatalStepError: If the failure would affect every model call.
+            RuntimeError: If the last attempt failed transiently, or a stream
+                broke off after producing output.
+        """
+        max_retries = max(step.get("max_retries", 0), 0)
+        for attempt in range(max_retries + 1):
+            try:
+                if on_chunk is None:
+                    result: GeneratedInstructions = await generator.generate(content)
+                else:
+                    result = await self._stream_generate(generator, content, on_chunk)
+            except Exception as e:
+                if is_fatal_error(e):
+                    raise FatalStepError(str(e)) from e
+                if not is_retryable_error(e):
+                    raise
+                error = str(e)
+            else:
+                if result.metadata.get("fatal"):
+                    raise FatalStepError(result.metadata["error"])
+                if not result.metadata.get("retryable"):
+                    return result
+                error = result.metadata["error"]
+
+            if attempt == max_retries:
+                break
+            delay = min(2**attempt + random.random(), STEP_RETRY_MAX_DELAY)
+            self.logger.warning(
+                f"Step '{step.get('name')}' attempt {attempt + 1}/{max_retries + 1} failed ({error}); "
+                f"retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+        raise RuntimeError(f"gave up after {max_retries + 1} attempt(s): {error}")
+
+    @staticmethod
+    async def _stream_generate(
+        generator: BaseGenerator, content: ExtractedContent, on_chunk: Callable[[str], None]
+    ) -> GeneratedInstructions:
+        """Generate through :meth:`BaseGenerator.generate_stream`, forwarding each piece."""
+        parts: list[str] = []
+        try:
+            async for part in generator.generate_stream(content):
+                parts.append(part)
+                on_chunk(part)
+        except Exception as e:
+            if parts:
+                raise RuntimeError(f"stream interrupted after partial output: {e}") from e
+            raise
+        return GeneratedInstructions(
+            instructions="".join(parts),
+            title=content.file_name,
+            source_file=content.file_path,
+            source_type=content.file_type,
+            model_used=generator.get_model_name(),
+        )
+
+    async def iter_parallel_steps(
+        self,
+        steps: list[WorkflowStep],
+        context: AgentContext,
+        max_parallel: int | None = None,
+        fail_fast: bool = False,
+    ) -> AsyncIterator[tuple[str, str]]:
+        """Run steps concurrently, yielding ``(name, output)`` as each finishes.
+
+        At most ``max_parallel`` steps (default: ``generator.max_parallel``)
+        call the model at once. A failed step is logged and skipped, or with
+        ``fail_fast`` cancels the remaining steps and re-raises; a
+        :class:`FatalStepError` always does. Steps still running when the
+        caller stops iterating are cancelled.
+        """
+        semaphore = asyncio.Semaphore(max_parallel) if max_parallel else self._sem
+
+        async def run_step(step: WorkflowStep) -> tuple[str, str]:
+            name = step.get("name", "unnamed")
+            try:
+                return name, await self._run_step(step, _step_role(step), context, semaphore)
+            except Exception as e:
+                self.logger.error(f"Parallel step '{name}' failed: {e}")
+                raise
+
+        tasks = [asyncio.create_task(run_step(step)) for step in steps]
+        try:
+            for future in asyncio.as_completed(tasks):
+                try:
+                    yield await future
+                except Exception as e:
+                    if fail_fast or isinstance(e, FatalStepError):
+                        raise
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def execute_parallel_steps(
-        self, steps: list[WorkflowStep], context: AgentContext
+        self, steps: list[WorkflowStep], context: AgentContext, max_parallel: int | None = None
     ) -> dict[str, str]:
-        """Execute multiple steps in parallel."""
+        """Execute multiple steps in parallel and collect their outputs.
 
-        async def run_step(step: WorkflowStep) -> tuple[str, str]:
-            role_str = step.get("role", "engineer")
-            role = AgentRole(role_str.lower())
-            result = await self._execute_step(step, role, context)
-            return (step.get("name", "unnamed"), result)
-
-        tasks = [run_step(step) for step in steps]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        outputs = {}
-        for result in results:
-            if isinstance(result, tuple):
-                outputs[result[0]] = result[1]
-            else:
-                self.logger.error(f"Parallel step failed: {result}")
+        See :meth:`iter_parallel_steps` for handling outputs as they arrive.
 
-        return outputs
+        Raises:
+            FatalStepError: If a step failed fatally; the others are cancelled.
+        """
+        return {name: result async for name, result in self.iter_parallel_steps(steps, context, max_parallel)}
 
     def extract_json_from_output(self, output: str) -> dict[str, Any] | None:
         """Attempt to extract and parse a JSON block from agent text output.
@@ -312,117 +875,26 @@ class AgentOrchestrator:
         Returns:
             A parsed dictionary if successful, None otherwise.
         """
-        try:
-            # Look for JSON between code blocks
-            match = re.search(r"```json\s*(.*?)\s*```", output, re.DOTALL)
-            if match:
-                return json.loads(match.group(1))
-            
-            # Fallback to finding anything that looks like a JSON object
-            # Finding the first { and the last } in the string
-            start = output.find('{')
-            end = output.rfind('}')
-            if start != -1 and end != -1 and end > start:
-                json_str = output[start:end+1]
-                return json.loads(json_str)
-        except ValueError:
-            pass
-        return None
+        return _extract_json(output)
+
+    async def aextract_json_from_output(self, output: str) -> dict[str, Any] | None:
+        """Async :meth:`extract_json_from_output`.
+
+        Outputs over :data:`JSON_OFFLOAD_CHARS` are scanned and parsed in a
+        worker thread so a large parse does not stall concurrent workflows.
+        """
+        if len(output) > JSON_OFFLOAD_CHARS:
+            return await asyncio.to_thread(_extract_json, output)
+        return _extract_json(output)
 
     def create_code_review_workflow(self) -> WorkflowConfig:
-        """Create a pre-defined code review workflow."""
-        return {
-            "name": "code_review",
-            "description": "Multi-agent code review workflow",
-            "steps": [
-                {
-                    "name": "analyze",
-                    "role": "planner",
-                    "action": "analyze",
-                    "prompt_template": "Analyze this code and identify key areas for review.",
-                    "max_retries": 1,
-                },
-                {
-                    "name": "review",
-                    "role": "engineer",
-                    "action": "review",
-                    "input_from": "analyze",
-                    "prompt_template": "Review the code focusing on: {previous_output}",
-                    "max_retries": 1,
-                },
-                {
-                    "name": "test_plan",
-                    "role": "tester",
-                    "action": "plan_tests",
-                    "input_from": "review",
-                    "prompt_template": "Create test cases based on the review: {previous_output}",
-                    "max_retries": 1,
-                },
-            ],
-            "parallel_steps": [],
-        }
+        """Return the pre-defined code review workflow (shared; do not mutate)."""
+        return CODE_REVIEW_WORKFLOW
 
     def create_data_analysis_workflow(self) -> WorkflowConfig:
-        """Create a pre-defined data analysis workflow."""
-        return {
-            "name": "data_analysis",
-            "description": "Multi-agent data analysis workflow",
-            "steps": [
-                {
-                    "name": "explore",
-                    "role": "thinker",
-                    "action": "explore",
-                    "prompt_template": "Explore this data and identify patterns, anomalies, and insights.",
-                    "max_retries": 1,
-                },
-                {
-                    "name": "analyze",
-                    "role": "engineer",
-                    "action": "analyze",
-                    "input_from": "explore",
-                    "prompt_template": "Perform detailed analysis on: {previous_output}",
-                    "max_retries": 1,
-                },
-                {
-                    "name": "summarize",
-                    "role": "planner",
-                    "action": "summarize",
-                    "input_from": "analyze",
-                    "prompt_template": "Create an executive summary: {previous_output}",
-                    "max_retries": 1,
-                },
-            ],
-            "parallel_steps": [],
-        }
+        """Return the pre-defined data analysis workflow (shared; do not mutate)."""
+        return DATA_ANALYSIS_WORKFLOW
+
     def create_startup_application_workflow(self) -> WorkflowConfig:
-        """Create a pre-defined startup application workflow."""
-        return {
-            "name": "startup_application",
-            "description": "Multi-agent startup application extraction workflow",
-            "steps": [
-                {
-                    "name": "analyze_startup",
-                    "role": "planner",
-                    "action": "analyze",
-                    "prompt_template": "Analyze this startup document and identify core themes for a hacker house application.",
-                    "max_retries": 1,
-                },
-                {
-                    "name": "extract_form_data",
-                    "role": "engineer",
-                    "action": "extract",
-                    "input_from": "analyze_startup",
-                    "prompt_template": "Extract concise form-ready fields (founder, mission, tech stack) from: {previous_output}",
-                    "max_retries": 2,
-                },
-                {
-                    "name": "refine_pitch",
-                    "role": "reviewer",
-                    "action": "optimize",
-                    "input_from": "extract_form_data",
-                    "prompt_template": "Refine the extraction for a hacker house application. Output final pitch and a JSON block for auto-filling.",
-                    "max_retries": 1,
-                },
-            ],
-            "parallel_steps": [],
-        }
+        """Return the pre-defined startup application workflow (shared; do not mutate)."""
+        return STARTUP_APPLICATION_WORKFLOW
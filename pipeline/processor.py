@@ -8,25 +8,37 @@ and managing persistent metrics and memory.
 from __future__ import annotations
 
 import asyncio
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
 
 import aiofiles
 import yaml
 
-from pipeline.config import PipelineConfig
+from pipeline.config import YAML_LOADER, PipelineConfig
 from pipeline.extractors import get_extractor_for_file
-from pipeline.extractors.base import ExtractedContent
-from pipeline.generators import BaseGenerator, get_generator
-from pipeline.memory.pinecone_service import PineconeMemory
+from pipeline.extractors.base import BaseExtractor, ExtractedContent
+from pipeline.generators.base import BaseGenerator, GeneratedInstructions
+from pipeline.memory.batcher import UpsertBatcher
 from pipeline.utils.logging import get_logger, setup_logging
-from pipeline.utils.metrics import PipelineMetrics
+from pipeline.utils.metrics import PipelineMetrics, ProcessingRecord
 from pipeline.watcher import FileWatcher
 
 if TYPE_CHECKING:
     from logging import Logger
 
-    from pipeline.orchestrator import AgentOrchestrator
+    from pipeline.memory.pinecone_service import PineconeMemory
+    from pipeline.orchestrator import AgentOrchestrator, WorkflowConfig
+
+
+# Paths taken from the existing-file walk per trip to its thread
+EXISTING_SCAN_BATCH = 64
+
+# Existing files sent per generate_batch call when generator.batch is set
+EXISTING_GENERATE_BATCH = 256
 
 
 class PipelineProcessor:
@@ -43,26 +55,68 @@ class PipelineProcessor:
         self.metrics = PipelineMetrics()
         self.generator: BaseGenerator | None = None
         self.memory: PineconeMemory | None = None
+        self._memory_batcher: UpsertBatcher | None = None
         self.watcher: FileWatcher | None = None
         self.orchestrator: AgentOrchestrator | None = None
-        self._processing_queue: asyncio.Queue[Path] = asyncio.Queue()
+        # None is the per-worker shutdown sentinel, so there must be room
+        # for one per worker
+        self._processing_queue: asyncio.Queue[Path | None] = asyncio.Queue(
+            maxsize=max(config.processing.queue_maxsize, config.processing.concurrent_workers)
+        )
         self._shutdown: bool = False
+        self._shutdown_event: asyncio.Event | None = None
+        self._stopped: bool = False
         self._workers: list[asyncio.Task[None]] = []
+        self._metrics_flusher: asyncio.Task[None] | None = None
+        self._existing_task: asyncio.Task[None] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        # Parsed YAML workflows by name; files are read once per run
+        self._workflow_cache: dict[str, WorkflowConfig] = {}
+        # Extractors keep no per-file state, so one instance per extension
+        # is shared by all workers
+        self._extractor_cache: dict[str, BaseExtractor] = {}
+        # Resolved once instead of on every file and metrics flush
+        self._output_dir: Path = config.get_output_dir()
+        self._logs_dir: Path = config.get_logs_dir()
+        # Watchers report several events per save; a path waiting in the queue
+        # absorbs further events, and one changed while being processed is
+        # queued once more when it finishes
+        self._queued: set[Path] = set()
+        self._inflight: set[Path] = set()
+        self._changed_inflight: set[Path] = set()
+        # Output directories known to exist, so each is created at most once
+        self._made_dirs: set[Path] = set()
     
     def initialize(self) -> None:
         """Initialize the pipeline components."""
         # Ensure directories exist
         self.config.ensure_directories()
+        self._made_dirs.add(self._output_dir)
         
         # Setup logging
         setup_logging(
             level=self.config.logging.level,
             format_type=self.config.logging.format,
-            log_dir=self.config.get_logs_dir(),
+            log_dir=self._logs_dir,
         )
         
         self.logger.info("Initializing pipeline components")
         
+        # Extraction (file I/O plus PDF/Office parsing) runs here so it
+        # overlaps with other workers' model calls instead of blocking the loop.
+        # start() also makes it the loop's default executor, so aiofiles and
+        # asyncio.to_thread calls share these threads
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(self.config.processing.concurrent_workers, 1) * 4,
+            thread_name_prefix="pipeline",
+        )
+        
+        # Provider SDKs, torch and Pinecone load here rather than at import,
+        # so importing the package (e.g. for the CLI's help or config
+        # commands) stays cheap
+        from pipeline.generators import get_generator
+        from pipeline.memory.pinecone_service import PineconeMemory
+        
         # Initialize generator using factory
         self.generator = get_generator(self.config)
         
@@ -94,10 +148,12 @@ class PipelineProcessor:
         
         try:
             # Get appropriate extractor
-            extractor = get_extractor_for_file(file_path)
+            extractor = self._get_extractor(file_path)
+            
+            loop = asyncio.get_running_loop()
             
             # Start metrics
-            stat = file_path.stat()
+            stat = await loop.run_in_executor(self._executor, file_path.stat)
             self.metrics.start_processing(
                 file_path=file_path,
                 file_type=extractor.__class__.__name__,
@@ -105,18 +161,22 @@ class PipelineProcessor:
             )
             
             # Extract content
-            content = extractor.extract(file_path)
+            content = await loop.run_in_executor(self._executor, extractor.extract, file_path)
             self.logger.debug(f"Extracted: {content.file_type}, {len(content.content)} chars")
             
-            # Run workflow or generation
-            output_content, model_used = await self._run_workflow(content, workflow_name)
-            
-            # Save output
-            output_path = await self._save_execution_output(file_path, workflow_name, output_content)
+            if workflow_name is None and self._generator_streams():
+                # Write tokens to disk as they arrive
+                output_content, model_used, output_path = await self._stream_execution_output(file_path, content)
+            else:
+                # Run workflow or generation
+                output_content, model_used = await self._run_workflow(content, workflow_name)
+                
+                # Save output
+                output_path = await self._save_execution_output(file_path, workflow_name, output_content)
             self.logger.info(f"Generated: {output_path}")
 
             # Store in memory
-            self._store_execution_memory(
+            await self._store_execution_memory(
                 file_path=file_path, 
                 workflow_name=workflow_name,
                 content_type=content.file_type,
@@ -127,10 +187,6 @@ class PipelineProcessor:
 
             self.metrics.end_processing(success=True)
             
-            # Save metrics to disk so separate dashboard process can read them
-            metrics_path = self.config.get_logs_dir() / "metrics.json"
-            self.metrics.save(metrics_path)
-            
             return True
             
         except Exception as e:
@@ -139,6 +195,114 @@ class PipelineProcessor:
             self.metrics.end_processing(success=False, error=str(e))
             return False
 
+    async def process_files(self, file_paths: list[Path]) -> list[bool]:
+        """Process several files with one :meth:`BaseGenerator.generate_batch` call.
+        
+        Extraction runs per file as in :meth:`process_file`, then every file
+        that extracted is generated together, so a provider with a bulk
+        endpoint (Gemini's Batch API under ``generator.batch``) answers them
+        in one job. Outputs and memory records are then written per file.
+        
+        Args:
+            file_paths: Paths of the files to process.
+            
+        Returns:
+            One success flag per path, in input order.
+        """
+        if self.generator is None:
+            raise RuntimeError("Generator not initialized")
+        self.logger.info(f"Processing {len(file_paths)} files as a batch")
+        loop = asyncio.get_running_loop()
+        started = time.time()
+        
+        async def extract(file_path: Path) -> ExtractedContent:
+            extractor = self._get_extractor(file_path)
+            return await loop.run_in_executor(self._executor, extractor.extract, file_path)
+        
+        def record(file_path: Path, file_type: str, file_size: int, error: str | None = None) -> bool:
+            self.metrics.add_record(ProcessingRecord(
+                file_path=str(file_path),
+                file_type=file_type,
+                file_size=file_size,
+                start_time=started,
+                end_time=time.time(),
+                success=error is None,
+                error=error,
+            ))
+            return error is None
+        
+        results = [False] * len(file_paths)
+        extracted: list[tuple[int, ExtractedContent]] = []
+        for i, (file_path, content) in enumerate(zip(
+            file_paths,
+            await asyncio.gather(*(extract(p) for p in file_paths), return_exceptions=True),
+        )):
+            if isinstance(content, Exception):
+                self.logger.error(f"Error processing {file_path}: {content}")
+                record(file_path, file_path.suffix.lower(), 0, str(content))
+            else:
+                extracted.append((i, content))
+        if not extracted:
+            return results
+        
+        try:
+            generated = await self.generator.generate_batch([content for _, content in extracted])
+        except Exception as e:
+            self.logger.error(f"Batch generation failed for {len(extracted)} files: {e}")
+            for i, content in extracted:
+                record(file_paths[i], content.file_type, content.file_size_bytes, str(e))
+            return results
+        
+        async def finish(file_path: Path, content: ExtractedContent, instr_result: GeneratedInstructions) -> bool:
+            try:
+                output_path = await self._save_execution_output(file_path, None, instr_result.instructions)
+                self.logger.info(f"Generated: {output_path}")
+                await self._store_execution_memory(
+                    file_path=file_path,
+                    workflow_name=None,
+                    content_type=content.file_type,
+                    output_content=instr_result.instructions,
+                    output_path=output_path,
+                    model_used=instr_result.model_used,
+                )
+            except Exception as e:
+                self.logger.error(f"Error processing {file_path}: {e}")
+                return record(file_path, content.file_type, content.file_size_bytes, str(e))
+            return record(file_path, content.file_type, content.file_size_bytes)
+        
+        done = await asyncio.gather(*(
+            finish(file_paths[i], content, instr_result)
+            for (i, content), instr_result in zip(extracted, generated)
+        ))
+        for (i, _), ok in zip(extracted, done):
+            results[i] = ok
+        return results
+
+    async def _process_existing_batched(self, existing: Iterator[Path]) -> None:
+        """Feed the existing-file walk through :meth:`process_files` in chunks.
+        
+        Used instead of the worker queue when ``generator.batch`` is set.
+        Paths in a chunk count as in flight, so watcher events for them are
+        queued again once the chunk finishes.
+        """
+        processed = 0
+        while not self._shutdown:
+            chunk = await asyncio.to_thread(list, islice(existing, EXISTING_GENERATE_BATCH))
+            if not chunk:
+                break
+            self._inflight.update(chunk)
+            try:
+                await self.process_files(chunk)
+            finally:
+                self._inflight.difference_update(chunk)
+                for file_path in chunk:
+                    if file_path in self._changed_inflight:
+                        self._changed_inflight.discard(file_path)
+                        if not self._shutdown:
+                            self._try_enqueue(file_path)
+            processed += len(chunk)
+        self.logger.info(f"Batch-processed {processed} existing files")
+
     async def _run_workflow(self, content: ExtractedContent, workflow_name: str | None) -> tuple[str, str]:
         """Execute either a multi-agent workflow or a standard LLM generation.
 
@@ -155,21 +319,7 @@ class PipelineProcessor:
             RuntimeError: If the generator is not initialized.
         """
         if workflow_name and self.orchestrator:
-            if workflow_name == "startup_application":
-                wf = self.orchestrator.create_startup_application_workflow()
-            elif workflow_name == "code_review":
-                wf = self.orchestrator.create_code_review_workflow()
-            else:
-                # Try to load from YAML
-                workflow_path = self.config._base_path / "pipeline" / "workflows" / f"{workflow_name}.yaml"
-                if workflow_path.exists():
-                    self.logger.info(f"Loading workflow from {workflow_path}")
-                    async with aiofiles.open(workflow_path, mode='r') as f:
-                        workflow_content = await f.read()
-                        wf = yaml.safe_load(workflow_content)
-                else:
-                    raise ValueError(f"Unknown workflow: {workflow_name}")
-            
+            wf = await self._load_workflow(workflow_name)
             result = await self.orchestrator.execute_workflow(wf, content)
             return result.final_output, "multi-agent-workflow"
         
@@ -180,6 +330,86 @@ class PipelineProcessor:
         instr_result = await self.generator.generate(content)
         return instr_result.instructions, instr_result.model_used
 
+    async def _load_workflow(self, workflow_name: str) -> WorkflowConfig:
+        """Return the named workflow: built-in, or parsed from its YAML file once.
+
+        Raises:
+            ValueError: If no workflow has that name.
+        """
+        if workflow_name == "startup_application":
+            return self.orchestrator.create_startup_application_workflow()
+        if workflow_name == "code_review":
+            return self.orchestrator.create_code_review_workflow()
+        
+        wf = self._workflow_cache.get(workflow_name)
+        if wf is None:
+            # Try to load from YAML
+            workflow_path = self.config._base_path / "pipeline" / "workflows" / f"{workflow_name}.yaml"
+            # The open runs in aiofiles' thread, so a missing file is detected
+            # there rather than by a separate exists() check on the loop
+            try:
+                async with aiofiles.open(workflow_path, mode='r') as f:
+                    workflow_content = await f.read()
+            except FileNotFoundError:
+                raise ValueError(f"Unknown workflow: {workflow_name}") from None
+            self.logger.info(f"Loaded workflow from {workflow_path}")
+            wf = yaml.load(workflow_content, Loader=YAML_LOADER)
+            self._workflow_cache[workflow_name] = wf
+        return wf
+
+    def _get_extractor(self, file_path: Path) -> BaseExtractor:
+        """Return the shared extractor for ``file_path``'s extension."""
+        suffix = file_path.suffix.lower()
+        extractor = self._extractor_cache.get(suffix)
+        if extractor is None:
+            extractor = self._extractor_cache[suffix] = get_extractor_for_file(file_path)
+        return extractor
+
+    def _output_path(self, file_path: Path, workflow_name: str | None) -> Path:
+        """Return the markdown path for ``file_path``, creating its directory once."""
+        output_name = f"{file_path.stem}_{workflow_name if workflow_name else 'instructions'}.md"
+        if not output_name.endswith(".md"):
+            output_name += ".md"
+        output_path = self._output_dir / output_name
+        
+        parent = output_path.parent
+        if parent not in self._made_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._made_dirs.add(parent)
+        return output_path
+
+    def _generator_streams(self) -> bool:
+        """Whether the generator overrides the one-piece default ``generate_stream``."""
+        return (
+            isinstance(self.generator, BaseGenerator)
+            and type(self.generator).generate_stream is not BaseGenerator.generate_stream
+        )
+
+    async def _stream_execution_output(self, file_path: Path, content: ExtractedContent) -> tuple[str, str, Path]:
+        """Generate instructions and write them to the output file as they stream in.
+
+        Disk writes overlap with generation instead of following it. If the
+        stream fails, the file is rewritten from :meth:`BaseGenerator.generate`,
+        which substitutes fallback instructions on error.
+
+        Returns:
+            A tuple of (text_output, model_identifier, output_path).
+        """
+        output_path = self._output_path(file_path, None)
+        parts: list[str] = []
+        try:
+            async with aiofiles.open(output_path, mode="w", encoding="utf-8") as f:
+                await f.write(f"# Processed: {file_path.name}\n\n")
+                async for part in self.generator.generate_stream(content):
+                    parts.append(part)
+                    await f.write(part)
+        except Exception as e:
+            self.logger.warning(f"Streaming generation failed for {file_path.name}, retrying without streaming: {e}")
+            output_content, model_used = await self._run_workflow(content, None)
+            output_path = await self._save_execution_output(file_path, None, output_content)
+            return output_content, model_used, output_path
+        return "".join(parts), self.generator.get_model_name(), output_path
+
     async def _save_execution_output(self, file_path: Path, workflow_name: str | None, content: str) -> Path:
         """Persist the agent output to a markdown file in the output directory.
 
@@ -191,19 +421,15 @@ class PipelineProcessor:
         Returns:
             The absolute Path to the newly created markdown file.
         """
-        output_name = f"{file_path.stem}_{workflow_name if workflow_name else 'instructions'}.md"
-        if not output_name.endswith(".md"):
-            output_name += ".md"
-        output_path = self.config.get_output_dir() / output_name
+        output_path = self._output_path(file_path, workflow_name)
         
         # Manual write since GeneratedInstructions isn't returned by orchestrator yet
-        output_path.parent.mkdir(parents=True, exist_ok=True)
         async with aiofiles.open(output_path, mode="w", encoding="utf-8") as f:
             await f.write(f"# Processed: {file_path.name}\n\n{content}")
             
         return output_path
 
-    def _store_execution_memory(
+    async def _store_execution_memory(
         self, 
         file_path: Path, 
         workflow_name: str | None, 
@@ -212,10 +438,16 @@ class PipelineProcessor:
         output_path: Path, 
         model_used: str
     ) -> None:
-        """Store execution results in Pinecone memory if enabled."""
-        if getattr(self, "memory", None) and self.memory.enabled:
+        """Queue execution results for Pinecone memory if enabled.
+
+        Records are coalesced into batched upserts by a background flusher,
+        so the worker does not wait on a Pinecone round trip per file.
+        """
+        if self.memory is not None and self.memory.enabled:
+            if self._memory_batcher is None:
+                self._memory_batcher = UpsertBatcher(self.memory, batch_size=32, flush_interval=0.5)
             self.logger.info(f"Storing in memory: {file_path.name}")
-            self.memory.upsert(
+            await self._memory_batcher.submit(
                 content=output_content,
                 source_file=file_path.name,
                 metadata={
@@ -231,37 +463,80 @@ class PipelineProcessor:
         """Worker coroutine that processes files from the queue."""
         self.logger.debug(f"Worker {worker_id} started")
         
-        while not self._shutdown:
+        while True:
+            # Blocks without polling; stop() wakes every worker with a sentinel
+            file_path = await self._processing_queue.get()
             try:
-                # Get file from queue with timeout
-                try:
-                    file_path = await asyncio.wait_for(
-                        self._processing_queue.get(),
-                        timeout=1.0
-                    )
-                except asyncio.TimeoutError:
-                    continue
+                # Files still queued at shutdown are left unprocessed
+                if file_path is None or self._shutdown:
+                    break
                 
-                # Process the file
-                await self.process_file(file_path)
-                self._processing_queue.task_done()
+                self._queued.discard(file_path)
+                self._inflight.add(file_path)
+                try:
+                    # Process the file
+                    await self.process_file(file_path)
+                finally:
+                    self._inflight.discard(file_path)
+                    if file_path in self._changed_inflight:
+                        self._changed_inflight.discard(file_path)
+                        if not self._shutdown:
+                            self._try_enqueue(file_path)
                 
             except asyncio.CancelledError:
                 self.logger.info(f"Worker {worker_id} cancelled")
                 raise
             except Exception as e:
                 self.logger.error(f"Worker {worker_id} error: {e}")
+            finally:
+                self._processing_queue.task_done()
         
         self.logger.debug(f"Worker {worker_id} stopped")
     
+    async def _flush_metrics_periodically(self) -> None:
+        """Rewrite metrics.json every ``metrics_flush_interval_seconds`` while files complete.
+
+        The snapshot is taken on the loop, so the metrics never change
+        under the serializer; only the JSON encoding and write run in a
+        thread.
+        """
+        metrics_path = self._logs_dir / "metrics.json"
+        interval = self.config.processing.metrics_flush_interval_seconds
+        saved_count = -1
+        while True:
+            await asyncio.sleep(interval)
+            if self.metrics.files_processed == saved_count:
+                continue
+            saved_count = self.metrics.files_processed
+            try:
+                await asyncio.to_thread(self.metrics.write, self.metrics.snapshot(), metrics_path)
+            except OSError as e:
+                self.logger.warning(f"Could not save metrics: {e}")
+    
     def _on_file_change(self, file_path: Path) -> None:
-        """Callback for file watcher events."""
+        """Callback for file watcher events.
+        
+        The watcher hands events to the loop through its own bridge and calls
+        this from its debounce timers, so it always runs on the loop thread.
+        """
+        self._try_enqueue(file_path)
+    
+    def _try_enqueue(self, file_path: Path) -> None:
+        """Queue a changed file for the workers (loop thread only)."""
         self.logger.debug(f"File change detected: {file_path}")
         
+        if file_path in self._queued:
+            return
+        if file_path in self._inflight:
+            self._changed_inflight.add(file_path)
+            return
+        
         # Add to processing queue
         try:
             self._processing_queue.put_nowait(file_path)
+            self._queued.add(file_path)
         except asyncio.QueueFull:
+            self.metrics.files_dropped += 1
             self.logger.warning(f"Queue full, skipping: {file_path}")
     
     async def start(self, process_existing: bool = True) -> None:
@@ -274,22 +549,57 @@ class PipelineProcessor:
         self.initialize()
         
         self.logger.info("Starting pipeline...")
+        self._shutdown_event = asyncio.Event()
+        if self._shutdown:
+            self._shutdown_event.set()
+        
+        # Python 3.12+: run new tasks synchronously up to their first real
+        # suspension, so workers, queue puts and cached workflow steps that
+        # finish without waiting skip a trip through the scheduler
+        loop = asyncio.get_running_loop()
+        eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+        if eager_task_factory is not None and loop.get_task_factory() is None:
+            loop.set_task_factory(eager_task_factory)
+        loop.set_default_executor(self._executor)
         
         # Start workers
         for i in range(self.config.processing.concurrent_workers):
             worker = asyncio.create_task(self._worker(i))
             self._workers.append(worker)
         
+        # Save metrics periodically so the separate dashboard process can read them
+        self._metrics_flusher = asyncio.create_task(self._flush_metrics_periodically())
+        
         # Setup file watcher
-        loop = asyncio.get_event_loop()
         self.watcher = FileWatcher(self.config, self._on_file_change, loop)
         
-        # Process existing files if requested
-        if process_existing:
+        # Process existing files if requested. With generator.batch they go
+        # to the provider's bulk endpoint in the background instead of
+        # through the workers one file at a time
+        if process_existing and self.config.generator.batch:
+            self._existing_task = asyncio.create_task(
+                self._process_existing_batched(self.watcher.process_existing())
+            )
+        elif process_existing:
+            # The walk runs in a thread a batch at a time, so workers start on
+            # the first files while the rest of the tree is still being read
             existing = self.watcher.process_existing()
-            self.logger.info(f"Found {len(existing)} existing files")
-            for file_path in existing:
-                await self._processing_queue.put(file_path)
+            queued = 0
+            while not self._shutdown:
+                batch = await asyncio.to_thread(list, islice(existing, EXISTING_SCAN_BATCH))
+                if not batch:
+                    break
+                for file_path in batch:
+                    if self._shutdown:
+                        break
+                    self._queued.add(file_path)
+                    try:
+                        self._processing_queue.put_nowait(file_path)
+                    except asyncio.QueueFull:
+                        # Blocks while the queue is full, pacing the scan to the workers
+                        await self._processing_queue.put(file_path)
+                    queued += 1
+            self.logger.info(f"Queued {queued} existing files")
         
         # Start watching
         self.watcher.start()
@@ -298,38 +608,111 @@ class PipelineProcessor:
             f"Pipeline running. Watching: {self.config.get_data_dir()}"
         )
     
+    def request_shutdown(self) -> None:
+        """Make :meth:`run` return and stop the pipeline; safe to call from a signal handler."""
+        self._shutdown = True
+        if self._shutdown_event is not None:
+            self._shutdown_event.set()
+    
     async def stop(self) -> None:
-        """Stop the pipeline gracefully."""
+        """Stop the pipeline gracefully. Calls after the first are no-ops."""
+        if self._stopped:
+            return
+        self._stopped = True
         self.logger.info("Stopping pipeline...")
         
-        self._shutdown = True
+        self.request_shutdown()
         
         # Stop watcher
         if self.watcher:
             self.watcher.stop()
         
-        # Wait for workers to finish
+        # Wait for workers to finish their current file. Queued files are
+        # abandoned at shutdown anyway; discarding them makes room for the
+        # sentinels in the bounded queue.
         if self._workers:
+            while not self._processing_queue.empty():
+                self._processing_queue.get_nowait()
+                self._processing_queue.task_done()
+            for _ in self._workers:
+                self._processing_queue.put_nowait(None)
             await asyncio.gather(*self._workers, return_exceptions=True)
             self._workers.clear()
         
+        # A batch job still running is abandoned, like queued files
+        if self._existing_task is not None:
+            self._existing_task.cancel()
+            await asyncio.gather(self._existing_task, return_exceptions=True)
+            self._existing_task = None
+        
+        await self.close()
+        
+        self.logger.info(f"Pipeline stopped\n{self.metrics.print_summary()}")
+    
+    async def close(self) -> None:
+        """Flush queued memory writes, release clients and pools, and save metrics.
+
+        Called by :meth:`stop`; call it directly after one-off
+        :meth:`process_file` calls made without :meth:`start`.
+        """
+        # Flush background memory writes
+        if self._memory_batcher is not None:
+            await self._memory_batcher.close()
+        if self.memory is not None:
+            await self.memory.aclose()
+        if self.orchestrator:
+            await self.orchestrator.close()
+        
+        if self._metrics_flusher is not None:
+            self._metrics_flusher.cancel()
+            self._metrics_flusher = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        
         # Save metrics
-        metrics_path = self.config.get_logs_dir() / "metrics.json"
+        metrics_path = self._logs_dir / "metrics.json"
         self.metrics.save(metrics_path)
-        
-        self.logger.info("Pipeline stopped")
-        print(self.metrics.print_summary())
     
-    async def run(self) -> None:
-        """Blocking call that runs the pipeline until a shutdown signal is received."""
-        await self.start()
+    async def run(self, process_existing: bool = True) -> None:
+        """Blocking call that runs the pipeline until a shutdown signal is received.
+        
+        :meth:`start` installs the eager task factory on the running loop
+        (Python 3.12+) before creating any worker, so ``asyncio.run(processor.run())``
+        gets it without further setup; a factory the caller installed is kept.
         
+        SIGINT and SIGTERM call :meth:`request_shutdown` while it runs, so
+        :meth:`stop` (and the final metrics save) happens on either signal.
+        
+        Args:
+            process_existing: Passed to :meth:`start`.
+        """
+        signals = self._add_signal_handlers(asyncio.get_running_loop())
         try:
-            # Keep running until interrupted
-            while not self._shutdown:
-                await asyncio.sleep(1)
+            await self.start(process_existing=process_existing)
+            
+            # Keep running until request_shutdown() or stop()
+            await self._shutdown_event.wait()
         except asyncio.CancelledError:
             self.logger.info("Pipeline run cancelled")
             raise
         finally:
+            for sig in signals:
+                asyncio.get_running_loop().remove_signal_handler(sig)
             await self.stop()
+    
+    def _add_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> list[signal.Signals]:
+        """Route SIGINT/SIGTERM to :meth:`request_shutdown`; returns the signals handled.
+        
+        Loops without signal support (Windows, or not on the main thread)
+        keep the default handlers, so Ctrl+C still raises KeyboardInterrupt.
+        """
+        installed: list[signal.Signals] = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.request_shutdown)
+            except (NotImplementedError, RuntimeError, ValueError):
+                break
+            installed.append(sig)
+        return installed
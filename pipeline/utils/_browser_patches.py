@@ -0,0 +1,528 @@
+"""Monkey-patches for the ``browser-use`` library used by the browser executor.
+
+They let agents open local file:// URLs, log the Chromium launch arguments
+and replace ``DOMWatchdog``'s state capture with a version that settles the
+page, skips unchanged pages and fetches independent CDP data concurrently.
+Nothing is patched at import; :func:`install_patches` applies them once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import heapq
+import os
+from typing import TYPE_CHECKING, Any
+
+from browser_use.browser.views import (
+    BrowserStateSummary,
+    PageInfo,
+    PaginationButton,
+    SerializedDOMState,
+)
+from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+from browser_use.browser.watchdogs.local_browser_watchdog import LocalBrowserWatchdog
+from browser_use.browser.watchdogs.security_watchdog import SecurityWatchdog
+from browser_use.utils import create_task_with_error_handling
+
+if TYPE_CHECKING:
+    from browser_use.browser.events import BrowserStateRequestEvent
+
+_PATCHES_INSTALLED = False
+_original_is_url_allowed = SecurityWatchdog._is_url_allowed
+_original_launch_browser = LocalBrowserWatchdog._launch_browser
+
+
+def _patched_is_url_allowed(self: SecurityWatchdog, url: str) -> bool:
+    """Patch for SecurityWatchdog to permit local file access.
+    
+    This override ensures that the agent can interact with local HTML files
+    and documents stored on the filesystem.
+    """
+    # Always allow file:// URLs for local development
+    if url.startswith('file:///'):
+        return True
+    return _original_is_url_allowed(self, url)
+
+
+async def _patched_launch_browser(self: LocalBrowserWatchdog, max_retries: int = 3) -> Any:
+    self.logger.info(f"[LocalBrowserWatchdog] Intercepted launch! Profile args: {self.browser_session.browser_profile.get_args()}")
+    return await _original_launch_browser(self, max_retries)
+
+
+def _closed_popup_snapshot(browser_session: Any) -> tuple[str, ...]:
+    """Immutable view of the session's auto-closed popup messages.
+
+    The popups watchdog only ever appends to the list, so its identity and
+    length act as a generation counter: the tuple is rebuilt only after a
+    new popup was closed instead of copying the list on every capture.
+    """
+    messages = browser_session._closed_popup_messages
+    generation = (id(messages), len(messages))
+    cached = getattr(browser_session, '_closed_popup_cache', None)
+    if cached is None or cached[0] != generation:
+        cached = (generation, tuple(messages))
+        browser_session._closed_popup_cache = cached
+    return cached[1]
+
+
+# Shared fallbacks; nothing downstream mutates them, so one instance of each
+# saves a pydantic validation per fallback
+_EMPTY_DOM_STATE = SerializedDOMState(_root=None, selector_map={})
+_DEFAULT_PAGE_INFO = PageInfo(
+    viewport_width=1280, viewport_height=720,
+    page_width=1280, page_height=720,
+    scroll_x=0, scroll_y=0,
+    pixels_above=0, pixels_below=0,
+    pixels_left=0, pixels_right=0,
+)
+
+
+def _fallback_page_info(self: DOMWatchdog) -> PageInfo:
+    """Page info for a page of exactly the configured viewport size."""
+    viewport = self.browser_session.browser_profile.viewport
+    if viewport is None or (viewport['width'], viewport['height']) == (1280, 720):
+        return _DEFAULT_PAGE_INFO
+    width, height = viewport['width'], viewport['height']
+    return _DEFAULT_PAGE_INFO.model_copy(update={
+        'viewport_width': width, 'viewport_height': height,
+        'page_width': width, 'page_height': height,
+    })
+
+
+async def _handle_empty_page_state(self: DOMWatchdog, page_url: str, tabs_info: list[PageInfo], event: BrowserStateRequestEvent) -> BrowserStateSummary:
+    self.logger.debug(f'⚡ Skipping BuildDOMTree for empty target: {page_url}')
+    
+    content = _EMPTY_DOM_STATE
+    screenshot_b64 = None
+    
+    try:
+        page_info = await self._get_page_info()
+    except Exception as e:
+        self.logger.debug(f'Failed to get page info from CDP for empty page: {e}, using fallback')
+        page_info = _fallback_page_info(self)
+
+    return BrowserStateSummary(
+        dom_state=content,
+        url=page_url,
+        title='Empty Tab',
+        tabs=tabs_info,
+        screenshot=screenshot_b64,
+        page_info=page_info,
+        pixels_above=0, pixels_below=0,
+        browser_errors=[],
+        is_pdf_viewer=False,
+        recent_events=self._get_recent_events_str() if event.include_recent_events else None,
+        pending_network_requests=[],
+        pagination_buttons=[],
+        closed_popup_messages=_closed_popup_snapshot(self.browser_session),
+    )
+
+
+async def _get_page_info_safe(self) -> PageInfo:
+    try:
+        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting page info from CDP...')
+        async with asyncio.timeout(1.0):
+            return await self._get_page_info()
+    except Exception as e:
+        self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Failed to get page info from CDP: {e}, using fallback')
+        return _fallback_page_info(self)
+
+
+# Vision-only agents: when a screenshot is requested, skip the DOM build
+# (the expensive part of a state capture) and send an empty element tree
+SCREENSHOT_ONLY = os.environ.get("PIPELINE_BROWSER_SCREENSHOT_ONLY", "").lower() in ("1", "true", "yes")
+
+
+# Page.captureScreenshot format for state captures. WebP is several times
+# smaller than PNG, but browser-use labels every screenshot it sends to the
+# LLM as image/png, so other formats are opt-in
+SCREENSHOT_FORMAT = os.environ.get("PIPELINE_BROWSER_SCREENSHOT_FORMAT", "png").lower()
+SCREENSHOT_QUALITY = int(os.environ.get("PIPELINE_BROWSER_SCREENSHOT_QUALITY", 80))
+
+
+async def _capture_screenshot(self: DOMWatchdog) -> str:
+    """Viewport screenshot in ``SCREENSHOT_FORMAT``, falling back to the PNG path."""
+    if SCREENSHOT_FORMAT == 'png':
+        return await self._capture_clean_screenshot()
+    try:
+        async with asyncio.timeout(6.0):
+            cdp_session = await self.browser_session.get_or_create_cdp_session(
+                target_id=self.browser_session.agent_focus_target_id, focus=True
+            )
+            try:
+                await self.browser_session.remove_highlights()
+            except Exception:
+                pass
+            result = await cdp_session.cdp_client.send.Page.captureScreenshot(
+                params={'format': SCREENSHOT_FORMAT, 'quality': SCREENSHOT_QUALITY, 'captureBeyondViewport': False},
+                session_id=cdp_session.session_id,
+            )
+        return result['data']
+    except Exception as e:
+        self.logger.debug(f'📸 {SCREENSHOT_FORMAT} screenshot failed: {e}, falling back to PNG')
+        return await self._capture_clean_screenshot()
+
+
+# Upper bound on the elements walked by pagination detection and drawn as
+# highlights; the summary itself always keeps the full selector map
+MAX_SCANNED_ELEMENTS = int(os.environ.get("PIPELINE_BROWSER_MAX_ELEMENTS", 300))
+
+_ROLE_PRIORITY = {
+    "button": 100,
+    "textbox": 95, "input": 95, "textarea": 95,
+    "combobox": 90, "select": 90,
+    "checkbox": 85, "radio": 85,
+    "link": 80, "a": 80,
+}
+_DEFAULT_PRIORITY = 50
+_VIEWPORT_BONUS = 50
+
+
+def _viewport_size(self: DOMWatchdog) -> tuple[int, int] | None:
+    # Recorded from the previous capture's page info; None on the first one
+    return getattr(self.browser_session, '_original_viewport_size', None)
+
+
+def _in_viewport(node: Any, viewport: tuple[int, int] | None) -> bool:
+    rect = node.snapshot_node.clientRects if node.snapshot_node else None
+    if rect is None or rect.width <= 0 or rect.height <= 0:
+        return False
+    if viewport is None:
+        return True
+    width, height = viewport
+    return rect.x < width and rect.y < height and rect.x + rect.width > 0 and rect.y + rect.height > 0
+
+
+def _prioritize_selectors(
+    selector_map: dict[int, Any],
+    viewport: tuple[int, int] | None,
+    max_elements: int = MAX_SCANNED_ELEMENTS,
+    viewport_only: bool = False,
+) -> dict[int, Any]:
+    """Trim ``selector_map`` to the ``max_elements`` most useful entries.
+
+    Entries are ranked by role (buttons and inputs first), with a bonus for
+    being inside the viewport; ``viewport_only`` drops the rest outright.
+    Maps already within budget are returned as they are.
+    """
+    if not viewport_only and len(selector_map) <= max_elements:
+        return selector_map
+
+    scored = []
+    for index, node in selector_map.items():
+        visible = _in_viewport(node, viewport)
+        if viewport_only and not visible:
+            continue
+        role = node.attributes.get("role") or node.tag_name
+        score = _ROLE_PRIORITY.get(role, _DEFAULT_PRIORITY) + (_VIEWPORT_BONUS if visible else 0)
+        # Negated index so ties go to elements earlier in the document
+        scored.append((score, -index))
+    if len(scored) > max_elements:
+        scored = heapq.nlargest(max_elements, scored)
+    # Keep document order so highlight labels and detection stay stable
+    return {-neg: selector_map[-neg] for _, neg in sorted(scored, key=lambda item: -item[1])}
+
+
+async def _build_dom_with_pagination(self: DOMWatchdog, previous_state: SerializedDOMState | None) -> tuple[SerializedDOMState, list[PaginationButton]]:
+    """Build the DOM and detect pagination buttons in the same task.
+
+    The detection walks the fresh selector map while the screenshot and
+    page-info calls are still in flight, instead of after all of them.
+    """
+    content = await self._build_dom_tree_without_highlights(previous_state)
+    if not content.selector_map:
+        return content, []
+    # Pagination controls usually sit below the fold, so only the budget
+    # applies here, not the viewport filter
+    candidates = _prioritize_selectors(content.selector_map, _viewport_size(self))
+    return content, self._detect_pagination_buttons(candidates)
+
+
+async def _execute_dom_and_screenshot(self, event: BrowserStateRequestEvent) -> tuple[SerializedDOMState, list[PaginationButton], str | None]:
+    dom_task = None
+    screenshot_task = None
+
+    if event.include_dom and not (SCREENSHOT_ONLY and event.include_screenshot):
+        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🌳 Starting DOM tree build task...')
+        previous_state = (
+            self.browser_session._cached_browser_state_summary.dom_state
+            if self.browser_session._cached_browser_state_summary
+            else None
+        )
+        dom_task = create_task_with_error_handling(
+            _build_dom_with_pagination(self, previous_state),
+            name='build_dom_tree',
+            logger_instance=self.logger,
+            suppress_exceptions=True,
+        )
+
+    if event.include_screenshot:
+        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 📸 Starting clean screenshot task...')
+        screenshot_task = create_task_with_error_handling(
+            _capture_screenshot(self),
+            name='capture_screenshot',
+            logger_instance=self.logger,
+            suppress_exceptions=True,
+        )
+
+    content = _EMPTY_DOM_STATE
+    pagination_buttons: list[PaginationButton] = []
+    screenshot_b64 = None
+
+    if dom_task:
+        try:
+            content, pagination_buttons = await dom_task
+            self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ DOM tree build completed')
+        except Exception as e:
+            self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: DOM build failed: {e}, using minimal state')
+            # content is already initialized to empty
+
+    if screenshot_task:
+        try:
+            screenshot_b64 = await screenshot_task
+            self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Clean screenshot captured')
+        except Exception as e:
+            self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Clean screenshot failed: {e}')
+            screenshot_b64 = None
+            
+    return content, pagination_buttons, screenshot_b64
+
+
+def _create_recovery_state(page_url: str, error_msg: str) -> BrowserStateSummary:
+    return BrowserStateSummary(
+        dom_state=_EMPTY_DOM_STATE,
+        url=page_url,
+        title='Error',
+        tabs=[],
+        screenshot=None,
+        page_info=_DEFAULT_PAGE_INFO,
+        pixels_above=0, pixels_below=0,
+        browser_errors=[error_msg],
+        is_pdf_viewer=False,
+        recent_events=None,
+        pending_network_requests=[],
+        pagination_buttons=[],
+        closed_popup_messages=[],
+    )
+
+
+async def _add_highlights_if_needed(self, content: SerializedDOMState):
+    if not (content and content.selector_map and self.browser_session.browser_profile.dom_highlight_elements):
+        return
+    try:
+        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🎨 Adding browser-side highlights...')
+        # Highlights off screen are never seen, so only visible elements are drawn
+        visible = _prioritize_selectors(content.selector_map, _viewport_size(self), viewport_only=True)
+        await self.browser_session.add_highlights(visible)
+    except Exception as e:
+        self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Browser highlighting failed: {e}')
+
+
+async def _get_title_safe(self) -> str:
+    try:
+        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting page title...')
+        async with asyncio.timeout(1.0):
+            return await self.browser_session.get_current_page_title()
+    except Exception as e:
+        self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Failed to get title: {e}')
+        return 'Page'
+
+
+# Backoff between pending-request probes while a page settles, and the cap
+# on the total wait; settled pages return after the first probe
+STABILITY_POLL_DELAYS = (0.02, 0.05, 0.1, 0.2)
+STABILITY_MAX_WAIT = 0.5
+
+
+async def _wait_for_page_stability(self, pending_requests: list) -> list:
+    """Re-probe pending requests with backoff until none remain or the cap passes.
+
+    Returns:
+        The requests still pending when the wait ended.
+    """
+    self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ⏳ Waiting for page stability...')
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STABILITY_MAX_WAIT
+    try:
+        for delay in STABILITY_POLL_DELAYS:
+            if not pending_requests:
+                break
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            pending_requests = await self._get_pending_network_requests()
+        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Page stability complete')
+    except Exception as e:
+        self.logger.warning(
+            f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Network waiting failed: {e}, continuing anyway...'
+        )
+    return pending_requests
+
+
+# Cheap summary of what the agent can observe: markup size, scroll, viewport,
+# title, focus and form-control values (typing changes no markup)
+_PAGE_FINGERPRINT_JS = """
+(() => {
+    const d = document;
+    let values = '';
+    for (const el of d.querySelectorAll('input, textarea, select')) {
+        values += (el.value || '') + (el.checked ? '1' : '0') + '\\u0000';
+    }
+    return [
+        d.documentElement ? d.documentElement.outerHTML.length : 0,
+        window.scrollX, window.scrollY, window.innerWidth, window.innerHeight,
+        d.title, d.readyState, d.activeElement ? d.activeElement.tagName : '',
+        values,
+    ].join('\\u0001');
+})()
+"""
+
+
+async def _page_fingerprint(self, page_url: str, event: BrowserStateRequestEvent) -> str | None:
+    try:
+        async with asyncio.timeout(1.0):
+            cdp_session = await self.browser_session.get_or_create_cdp_session(focus=True)
+            result = await cdp_session.cdp_client.send.Runtime.evaluate(
+                params={'expression': _PAGE_FINGERPRINT_JS, 'returnByValue': True},
+                session_id=cdp_session.session_id,
+            )
+        value = result['result']['value']
+    except Exception as e:
+        self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Page fingerprint unavailable: {e}')
+        return None
+    key = f'{page_url}|{event.include_dom}|{event.include_screenshot}|{value}'
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _reuse_unchanged_state(self, fingerprint: str | None, tabs_info: list[PageInfo], event: BrowserStateRequestEvent) -> BrowserStateSummary | None:
+    """Return the previous state again if the page fingerprint has not changed.
+
+    Navigation and session resets clear ``_cached_browser_state_summary``,
+    so a summary the session has since dropped is never reused.
+    """
+    last = getattr(self.browser_session, '_state_fingerprint', None)
+    if fingerprint is None or last is None:
+        return None
+    last_fingerprint, summary = last
+    if last_fingerprint != fingerprint or self.browser_session._cached_browser_state_summary is not summary:
+        return None
+
+    self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ♻️ Page unchanged, reusing previous state')
+    browser_state = dataclasses.replace(
+        summary,
+        tabs=tabs_info,
+        recent_events=self._get_recent_events_str() if event.include_recent_events else None,
+        closed_popup_messages=_closed_popup_snapshot(self.browser_session),
+    )
+    self.browser_session._cached_browser_state_summary = browser_state
+    self.browser_session._state_fingerprint = (fingerprint, browser_state)
+    return browser_state
+
+
+async def _get_tabs(self) -> list[PageInfo]:
+    self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting tabs info...')
+    tabs_info = await self.browser_session.get_tabs()
+    self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got {len(tabs_info)} tabs')
+    return tabs_info
+
+
+async def _settle_page(self) -> list:
+    """Wait for the page to settle; returns the requests still pending."""
+    pending_requests = []
+    try:
+        pending_requests = await self._get_pending_network_requests()
+        if pending_requests:
+            self.logger.debug(f'🔍 Found {len(pending_requests)} pending requests before stability wait')
+    except Exception as e:
+        self.logger.debug(f'Failed to get pending requests before wait: {e}')
+
+    return await _wait_for_page_stability(self, pending_requests)
+
+
+async def on_patched_browser_state_request_event(self, event: BrowserStateRequestEvent) -> BrowserStateSummary:
+    """Coordinated browser state capture with enhanced stability and local file support.
+    
+    This is a patched replacement for `DOMWatchdog.on_BrowserStateRequestEvent`. 
+    It ensures that local `file://` URLs are treated as valid states and 
+    implements extra wait logic for network stability before capturing the DOM.
+    """
+    try:
+        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: STARTING browser state request (PATCHED)')
+        page_url = await self.browser_session.get_current_page_url()
+        self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got page URL: {page_url}')
+
+        if self.browser_session.agent_focus_target_id:
+            self.logger.debug(f'Current page URL: {page_url}, target_id: {self.browser_session.agent_focus_target_id}')
+
+        scheme = page_url.lower().split(':', 1)[0]
+        not_a_meaningful_website = scheme not in ('http', 'https', 'file')
+
+        if not_a_meaningful_website:
+            tabs_info = await _get_tabs(self)
+            return await _handle_empty_page_state(self, page_url, tabs_info, event)
+
+        # Independent CDP round trips run concurrently
+        tabs_info, pending_requests = await asyncio.gather(_get_tabs(self), _settle_page(self))
+
+        # Agents often re-read state between LLM calls without acting; a
+        # settled page with the same fingerprint skips the DOM build
+        fingerprint = None
+        if not pending_requests:
+            fingerprint = await _page_fingerprint(self, page_url, event)
+            reused = _reuse_unchanged_state(self, fingerprint, tabs_info, event)
+            if reused is not None:
+                return reused
+
+        (content, pagination_buttons_data, screenshot_b64), title, page_info = await asyncio.gather(
+            _execute_dom_and_screenshot(self, event),
+            _get_title_safe(self),
+            _get_page_info_safe(self),
+        )
+        await _add_highlights_if_needed(self, content)
+        
+        is_pdf_viewer = page_url.endswith('.pdf') or '/pdf/' in page_url
+
+        browser_state = BrowserStateSummary(
+            dom_state=content,
+            url=page_url,
+            title=title,
+            tabs=tabs_info,
+            screenshot=screenshot_b64,
+            page_info=page_info,
+            pixels_above=0, pixels_below=0,
+            browser_errors=[],
+            is_pdf_viewer=is_pdf_viewer,
+            recent_events=self._get_recent_events_str() if event.include_recent_events else None,
+            pending_network_requests=pending_requests,
+            pagination_buttons=pagination_buttons_data,
+            closed_popup_messages=_closed_popup_snapshot(self.browser_session),
+        )
+
+        self.browser_session._cached_browser_state_summary = browser_state
+        self.browser_session._state_fingerprint = (fingerprint, browser_state) if fingerprint else None
+        if page_info:
+            self.browser_session._original_viewport_size = (page_info.viewport_width, page_info.viewport_height)
+
+        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ COMPLETED - Returning browser state')
+        return browser_state
+
+    except Exception as e:
+        self.logger.error(f'Failed to get browser state: {e}')
+        return _create_recovery_state(locals().get('page_url', ''), str(e))
+
+
+def install_patches() -> None:
+    """Apply the patches to the browser-use watchdogs; later calls are no-ops."""
+    global _PATCHES_INSTALLED
+    if _PATCHES_INSTALLED:
+        return
+    # Allow file:// URLs
+    SecurityWatchdog._is_url_allowed = _patched_is_url_allowed
+    # Log the launch command
+    LocalBrowserWatchdog._launch_browser = _patched_launch_browser
+    # Allow DOM building for file:// URLs
+    DOMWatchdog.on_BrowserStateRequestEvent = on_patched_browser_state_request_event
+    _PATCHES_INSTALLED = True
@@ -0,0 +1,55 @@
+"""Thread-to-event-loop handoff for items produced on other threads.
+
+Watchdog delivers events on its observer thread, while the processing queue
+and debounce timers live on the event loop. Each ``call_soon_threadsafe``
+wakes the loop through its self-pipe, so the bridge buffers items in a deque
+and wakes the loop once per burst; the loop then takes everything buffered
+so far in one call.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable
+
+T = TypeVar("T")
+
+
+class LoopBridge(Generic[T]):
+    """Multi-producer handoff of items from any thread to one event loop.
+
+    ``submit`` may be called from any thread, including the loop's own;
+    ``handler`` always runs on the loop with the items in submission order.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, handler: Callable[[list[T]], None]) -> None:
+        self.loop = loop
+        self.handler = handler
+        self._items: deque[T] = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def submit(self, item: T) -> None:
+        """Buffer ``item`` and wake the loop unless a drain is already pending."""
+        self._items.append(item)  # deque appends are atomic
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.loop.call_soon_threadsafe(self._drain)
+
+    def _drain(self) -> None:
+        # Clear the flag before taking items: anything submitted after this
+        # point schedules a fresh drain rather than being stranded
+        with self._lock:
+            self._scheduled = False
+        items: list[T] = []
+        while self._items:
+            items.append(self._items.popleft())
+        if items:
+            self.handler(items)
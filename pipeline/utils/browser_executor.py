@@ -1,307 +1,128 @@
-"""Advanced browser automation and monkey-patching for the pipeline.
+"""Advanced browser automation for the pipeline.
 
 This module provides the `BrowserExecutor` which implements a robust Two-Pass
-form-filling strategy. It also contains several monkey-patches for the 
-`browser-use` library to enable features like local file:// URL access, 
-improved stability tracking, and custom launch logging.
+form-filling strategy. browser-use, its monkey-patches (see
+`pipeline.utils._browser_patches`) and the Gemini client are loaded when the
+first executor is created, so importing this module stays cheap.
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
-from typing import Any
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import aiofiles
-from browser_use import Agent, Browser, BrowserProfile
-from browser_use.browser.events import (
-    BrowserStateRequestEvent,
-)
-from browser_use.browser.views import (
-    BrowserStateSummary,
-    PageInfo,
-    SerializedDOMState,
-)
-from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
-from browser_use.browser.watchdogs.local_browser_watchdog import LocalBrowserWatchdog
-from browser_use.browser.watchdogs.security_watchdog import SecurityWatchdog
-from browser_use.llm.google.chat import ChatGoogle
-from browser_use.utils import create_task_with_error_handling
-from langchain_core.messages import HumanMessage
-
-from pipeline.config import PipelineConfig
-
-# Monkey-patch SecurityWatchdog to allow file:// URLs
-_original_is_url_allowed = SecurityWatchdog._is_url_allowed
-
-def _patched_is_url_allowed(self: SecurityWatchdog, url: str) -> bool:
-    """Patch for SecurityWatchdog to permit local file access.
-    
-    This override ensures that the agent can interact with local HTML files
-    and documents stored on the filesystem.
-    """
-    # Always allow file:// URLs for local development
-    if url.startswith('file:///'):
-        return True
-    return _original_is_url_allowed(self, url)
-
-SecurityWatchdog._is_url_allowed = _patched_is_url_allowed
-
-# Monkey-patch LocalBrowserWatchdog to log launch command
-_original_launch_browser = LocalBrowserWatchdog._launch_browser
-
-async def _patched_launch_browser(self: LocalBrowserWatchdog, max_retries: int = 3) -> Any:
-    self.logger.info(f"[LocalBrowserWatchdog] Intercepted launch! Profile args: {self.browser_session.browser_profile.get_args()}")
-    return await _original_launch_browser(self, max_retries)
-
-LocalBrowserWatchdog._launch_browser = _patched_launch_browser
-
-# Monkey-patch DOMWatchdog to allow DOM building for file:// URLs
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-_original_on_browser_state_request = DOMWatchdog.on_BrowserStateRequestEvent
-
-async def _handle_empty_page_state(self: DOMWatchdog, page_url: str, tabs_info: list[PageInfo], event: BrowserStateRequestEvent) -> BrowserStateSummary:
-    self.logger.debug(f'⚡ Skipping BuildDOMTree for empty target: {page_url}')
-    
-    # Create minimal DOM state
-    content = SerializedDOMState(_root=None, selector_map={})
-    screenshot_b64 = None
-    
-    try:
-        page_info = await self._get_page_info()
-    except Exception as e:
-        self.logger.debug(f'Failed to get page info from CDP for empty page: {e}, using fallback')
-        viewport = self.browser_session.browser_profile.viewport or {'width': 1280, 'height': 720}
-        page_info = PageInfo(
-            viewport_width=viewport['width'],
-            viewport_height=viewport['height'],
-            page_width=viewport['width'],
-            page_height=viewport['height'],
-            scroll_x=0, scroll_y=0,
-            pixels_above=0, pixels_below=0,
-            pixels_left=0, pixels_right=0,
-        )
-
-    return BrowserStateSummary(
-        dom_state=content,
-        url=page_url,
-        title='Empty Tab',
-        tabs=tabs_info,
-        screenshot=screenshot_b64,
-        page_info=page_info,
-        pixels_above=0, pixels_below=0,
-        browser_errors=[],
-        is_pdf_viewer=False,
-        recent_events=self._get_recent_events_str() if event.include_recent_events else None,
-        pending_network_requests=[],
-        pagination_buttons=[],
-        closed_popup_messages=self.browser_session._closed_popup_messages.copy(),
-    )
-
-
-async def _get_page_info_safe(self) -> PageInfo:
-    try:
-        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting page info from CDP...')
-        return await asyncio.wait_for(self._get_page_info(), timeout=1.0)
-    except Exception as e:
-        self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Failed to get page info from CDP: {e}, using fallback')
-        viewport = self.browser_session.browser_profile.viewport or {'width': 1280, 'height': 720}
-        return PageInfo(
-            viewport_width=viewport['width'],
-            viewport_height=viewport['height'],
-            page_width=viewport['width'],
-            page_height=viewport['height'],
-            scroll_x=0, scroll_y=0,
-            pixels_above=0, pixels_below=0,
-            pixels_left=0, pixels_right=0,
-        )
-
+from pipeline.config import PipelineConfig
 
-async def _execute_dom_and_screenshot(self, event: BrowserStateRequestEvent) -> tuple[SerializedDOMState, str | None]:
-    dom_task = None
-    screenshot_task = None
+if TYPE_CHECKING:
+    from browser_use import Browser
 
-    if event.include_dom:
-        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🌳 Starting DOM tree build task...')
-        previous_state = (
-            self.browser_session._cached_browser_state_summary.dom_state
-            if self.browser_session._cached_browser_state_summary
-            else None
-        )
-        dom_task = create_task_with_error_handling(
-            self._build_dom_tree_without_highlights(previous_state),
-            name='build_dom_tree',
-            logger_instance=self.logger,
-            suppress_exceptions=True,
-        )
+logger = logging.getLogger(__name__)
 
-    if event.include_screenshot:
-        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 📸 Starting clean screenshot task...')
-        screenshot_task = create_task_with_error_handling(
-            self._capture_clean_screenshot(),
-            name='capture_screenshot',
-            logger_instance=self.logger,
-            suppress_exceptions=True,
-        )
+# Pass 1 usually finishes in 2-3 steps; raise this for forms spread over
+# several pages or hidden behind navigation
+SCHEMA_MAX_STEPS = int(os.environ.get("PIPELINE_SCHEMA_MAX_STEPS", 4))
+_SCHEMA_START = "<schema>"
+_SCHEMA_END = "</schema>"
+
+def _schema_block(text: str | None) -> str | None:
+    """Return the text between the schema tags, or None if there is none."""
+    if not text:
+        return None
+    start = text.find(_SCHEMA_START)
+    end = text.find(_SCHEMA_END, start)
+    if start == -1 or end == -1:
+        return None
+    return text[start + len(_SCHEMA_START):end].strip()
+
+
+# Static part of the Pass 1.5 prompt; only the schema and data vary per call
+_MAPPING_SYSTEM_PROMPT = (
+    "You are a Form Mapping Expert. \n"
+    "Given a FORM SCHEMA (list of labels/fields) and SOURCE DATA (JSON), "
+    "create a deterministic MAPPING JSON. \n\n"
+    "### RULES:\n"
+    "1. Map each source data point to the MOST RELEVANT form label.\n"
+    "2. If a field has a character limit (e.g. 50), TRUNCATE the data to fit.\n"
+    "3. Ensure distinct fields for distinct data (e.g. Founder 1 vs Founder 2).\n"
+    "4. NEVER merge two data points into one field.\n"
+    "5. If a field type is 'email', ensure the mapped value is a valid email.\n"
+    "6. Output ONLY a JSON object where keys are FORM LABELS and values are the STRINGS to type.\n\n"
+    "### EXAMPLE:\n"
+    "FORM SCHEMA:\n"
+    "- Company Name (text)\n"
+    "- Founder 1 Email (email)\n"
+    "- One-line pitch (text, Max 50 characters)\n"
+    "SOURCE DATA:\n"
+    '{"company": "Acme Robotics", "founders": [{"email": "ada@acme.io"}], '
+    '"pitch": "Warehouse robots that restock shelves overnight without supervision"}\n'
+    "MAPPING JSON:\n"
+    '{"Company Name": "Acme Robotics", "Founder 1 Email": "ada@acme.io", '
+    '"One-line pitch": "Warehouse robots that restock shelves overnight"}'
+)
 
-    content = SerializedDOMState(_root=None, selector_map={})
-    screenshot_b64 = None
+# Pass 2 navigation step: after Pass 1 the form is normally still open;
+# with a cached schema nothing has been loaded yet
+_PASS2_NAVIGATION_OPEN = (
+    " - The form at {url} is already open in the current tab. "
+    "Only navigate to it if the tab shows a different page.\n\n"
+)
+_PASS2_NAVIGATION_GOTO = " - **ACTION**: Navigate to {url} immediately.\n\n"
+
+# Only the navigation step, url and the mapping vary between Pass 2 runs
+_PASS2_TASK_TEMPLATE = (
+    "# TASK: Fill Application Form (DETERMINISTIC MODE)\n"
+    " ## 1. NAVIGATION\n"
+    "{navigation}"
+    " ## 2. MAPPING TO EXECUTE\n"
+    " The following JSON provides the EXACT strings to type for each label:\n"
+    " ```json\n{mapping_str}\n```\n\n"
+    " ## 3. EXECUTION RULES\n"
+    " - **Strict Logic**: For each key in the JSON, find the element with that EXACT label and type the value.\n"
+    " - **ANTI-SLICING**: CLICK the field, WAIT 1 second, then TYPE to prevent first-letter cutoff.\n"
+    " - **ANTI-HANG**: After typing, immediately `Tab` out or click outside to force save.\n"
+    " - **No Guesswork**: DO NOT infer anything. ONLY type what is in the mapping JSON.\n"
+    " - **Verification**: Once all fields in the JSON are filled, you are DONE.\n\n"
+    " ## 4. COMPLETION\n"
+    " - Verify the form is filled according to the mapping and report success."
+)
 
-    if dom_task:
-        try:
-            content = await dom_task
-            self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ DOM tree build completed')
-        except Exception as e:
-            self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: DOM build failed: {e}, using minimal state')
-            # content is already initialized to empty
 
-    if screenshot_task:
+def _dumps_indented(obj: Any) -> str:
+    """Serialize ``obj`` as two-space-indented JSON for prompts and logs."""
+    if ORJSON_AVAILABLE:
         try:
-            screenshot_b64 = await screenshot_task
-            self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Clean screenshot captured')
-        except Exception as e:
-            self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Clean screenshot failed: {e}')
-            screenshot_b64 = None
-            
-    return content, screenshot_b64
-
-
-def _create_recovery_state(page_url: str, error_msg: str) -> BrowserStateSummary:
-    return BrowserStateSummary(
-        dom_state=SerializedDOMState(_root=None, selector_map={}),
-        url=page_url,
-        title='Error',
-        tabs=[],
-        screenshot=None,
-        page_info=PageInfo(
-            viewport_width=1280, viewport_height=720,
-            page_width=1280, page_height=720,
-            scroll_x=0, scroll_y=0,
-            pixels_above=0, pixels_below=0,
-            pixels_left=0, pixels_right=0,
-        ),
-        pixels_above=0, pixels_below=0,
-        browser_errors=[error_msg],
-        is_pdf_viewer=False,
-        recent_events=None,
-        pending_network_requests=[],
-        pagination_buttons=[],
-        closed_popup_messages=[],
-    )
-
-
-async def _add_highlights_if_needed(self, content: SerializedDOMState):
-    if not (content and content.selector_map and self.browser_session.browser_profile.dom_highlight_elements):
-        return
-    try:
-        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🎨 Adding browser-side highlights...')
-        await self.browser_session.add_highlights(content.selector_map)
-    except Exception as e:
-        self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Browser highlighting failed: {e}')
-
-
-async def _get_title_safe(self) -> str:
-    try:
-        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting page title...')
-        return await asyncio.wait_for(self.browser_session.get_current_page_title(), timeout=1.0)
-    except Exception as e:
-        self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Failed to get title: {e}')
-        return 'Page'
-
-
-async def _wait_for_page_stability(self, pending_requests: list):
-    self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ⏳ Waiting for page stability...')
-    try:
-        if pending_requests:
-            await asyncio.sleep(0.3)
-        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Page stability complete')
-    except Exception as e:
-        self.logger.warning(
-            f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Network waiting failed: {e}, continuing anyway...'
-        )
-
-
-async def on_patched_browser_state_request_event(self, event: BrowserStateRequestEvent) -> BrowserStateSummary:
-    """Coordinated browser state capture with enhanced stability and local file support.
-    
-    This is a patched replacement for `DOMWatchdog.on_BrowserStateRequestEvent`. 
-    It ensures that local `file://` URLs are treated as valid states and 
-    implements extra wait logic for network stability before capturing the DOM.
-    """
-    try:
-        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: STARTING browser state request (PATCHED)')
-        page_url = await self.browser_session.get_current_page_url()
-        self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got page URL: {page_url}')
-
-        if self.browser_session.agent_focus_target_id:
-            self.logger.debug(f'Current page URL: {page_url}, target_id: {self.browser_session.agent_focus_target_id}')
-
-        scheme = page_url.lower().split(':', 1)[0]
-        not_a_meaningful_website = scheme not in ('http', 'https', 'file')
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            # Types orjson rejects, e.g. integers wider than 64 bits
+            pass
+    return json.dumps(obj, indent=2)
 
-        pending_requests = []
-        if not not_a_meaningful_website:
-            try:
-                pending_requests = await self._get_pending_network_requests()
-                if pending_requests:
-                    self.logger.debug(f'🔍 Found {len(pending_requests)} pending requests before stability wait')
-            except Exception as e:
-                self.logger.debug(f'Failed to get pending requests before wait: {e}')
-            
-            await _wait_for_page_stability(self, pending_requests)
-
-        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting tabs info...')
-        tabs_info = await self.browser_session.get_tabs()
-        self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got {len(tabs_info)} tabs')
-
-        if not_a_meaningful_website:
-            return await _handle_empty_page_state(self, page_url, tabs_info, event)
 
-        content, screenshot_b64 = await _execute_dom_and_screenshot(self, event)
-        await _add_highlights_if_needed(self, content)
-
-        title = await _get_title_safe(self)
-        page_info = await _get_page_info_safe(self)
-        
-        is_pdf_viewer = page_url.endswith('.pdf') or '/pdf/' in page_url
-
-        pagination_buttons_data = []
-        if content and content.selector_map:
-            pagination_buttons_data = self._detect_pagination_buttons(content.selector_map)
-
-        browser_state = BrowserStateSummary(
-            dom_state=content,
-            url=page_url,
-            title=title,
-            tabs=tabs_info,
-            screenshot=screenshot_b64,
-            page_info=page_info,
-            pixels_above=0, pixels_below=0,
-            browser_errors=[],
-            is_pdf_viewer=is_pdf_viewer,
-            recent_events=self._get_recent_events_str() if event.include_recent_events else None,
-            pending_network_requests=pending_requests,
-            pagination_buttons=pagination_buttons_data,
-            closed_popup_messages=self.browser_session._closed_popup_messages.copy(),
-        )
-
-        self.browser_session._cached_browser_state_summary = browser_state
-        if page_info:
-            self.browser_session._original_viewport_size = (page_info.viewport_width, page_info.viewport_height)
-
-        self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ COMPLETED - Returning browser state')
-        return browser_state
-
-    except Exception as e:
-        self.logger.error(f'Failed to get browser state: {e}')
-        return _create_recovery_state(locals().get('page_url', ''), str(e))
-
-DOMWatchdog.on_BrowserStateRequestEvent = on_patched_browser_state_request_event
+def _loads_json(text: str) -> Any:
+    """Parse JSON text, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # Fall through so the stdlib reports the error, or accepts input
+            # orjson rejects such as NaN
+            pass
+    return json.loads(text)
 
-logger = logging.getLogger(__name__)
 
 class BrowserExecutor:
     """High-level browser automation engine for form filling.
@@ -313,62 +134,225 @@ class BrowserExecutor:
     """
     
     def __init__(self, config: PipelineConfig) -> None:
+        from browser_use.llm.google.chat import ChatGoogle
+
+        from pipeline.utils._browser_patches import install_patches
+
+        install_patches()
         self.config = config
         api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
         self.llm = ChatGoogle(
             model="gemini-2.0-flash",
             api_key=api_key
         )
+        # Form schemas (by URL) and mappings (by schema and data) rarely
+        # change, so repeats skip Pass 1 and the mapping call. Entries are
+        # kept in memory and under the shared pipeline cache directory
+        self._cache_dir = Path(
+            os.environ.get("PIPELINE_CACHE_DIR", "~/.cache/browser-use")
+        ).expanduser() / "forms"
+        self._cache_ttl_seconds = int(os.environ.get("PIPELINE_CACHE_TTL", 86400))  # 24 hours
+        self._form_cache: dict[tuple[str, str], tuple[Any, float]] = {}
+        try:
+            for kind in ("schema", "mapping"):
+                (self._cache_dir / kind).mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            # Entries then live in memory only; writes log their own failure
+            logger.warning(f"Could not create form cache directory {self._cache_dir}: {e}")
+        # Run results are appended to browser_output.log by one writer task
+        # that keeps the file open until aclose()
+        self._log_queue: asyncio.Queue[str | None] | None = None
+        self._log_writer: asyncio.Task[None] | None = None
+
+    @staticmethod
+    def _new_browser() -> Browser:
+        """Create the browser session for one fill_form call.
+
+        Both passes of a call share it, so Chromium is launched once and
+        Pass 2 starts on the page Pass 1 loaded. Concurrent calls each get
+        their own session.
+        """
+        from browser_use import Browser, BrowserProfile
+
+        # Get browser path and user data dir from env
+        config_chrome_path = os.environ.get("CHROME_PATH") or os.environ.get("BRAVE_PATH")
+        config_user_data_dir = os.environ.get("USER_DATA_DIR")
 
-    async def _extract_schema(self, browser_config: BrowserProfile, url: str) -> str:
-        """Pass 1: Extracts the form schema (labels and constraints) from the page."""
+        browser_config = BrowserProfile(
+            disable_security=True,
+            executable_path=config_chrome_path,
+            user_data_dir=config_user_data_dir,
+            # Agents must not kill the session when their run ends
+            keep_alive=True,
+            args=[
+                "--allow-file-access-from-files",
+                "--no-sandbox",
+                "--disable-setuid-sandbox"
+            ]
+        )
+        return Browser(browser_profile=browser_config)
+
+    async def aclose(self) -> None:
+        """Flush pending run results to the log."""
+        if self._log_writer is not None and self._log_queue is not None:
+            await self._log_queue.put(None)
+            await self._log_writer
+            self._log_writer = None
+
+    def _log_result(self, block: str) -> None:
+        """Queue ``block`` for browser_output.log without waiting for the write."""
+        if self._log_writer is None or self._log_writer.done():
+            self._log_queue = asyncio.Queue()
+            self._log_writer = asyncio.create_task(self._write_log(self._log_queue))
+        self._log_queue.put_nowait(block)
+
+    @staticmethod
+    async def _write_log(queue: asyncio.Queue[str | None]) -> None:
+        async with aiofiles.open('browser_output.log', 'a') as log_f:
+            stopping = False
+            while not stopping:
+                block = await queue.get()
+                if block is None:
+                    break
+                # Write everything queued meanwhile before flushing once
+                blocks = [block]
+                while not queue.empty():
+                    block = queue.get_nowait()
+                    if block is None:
+                        stopping = True
+                        break
+                    blocks.append(block)
+                await log_f.write("".join(blocks))
+                await log_f.flush()
+
+    @staticmethod
+    def _cache_key(*parts: str) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _cache_path(self, kind: str, key: str) -> Path:
+        return self._cache_dir / kind / f"{key}.json"
+
+    async def _cache_get(self, kind: str, key: str) -> Any | None:
+        """Return the unexpired ``kind`` entry for ``key`` from memory or disk."""
+        entry = self._form_cache.get((kind, key))
+        if entry is None:
+            try:
+                async with aiofiles.open(self._cache_path(kind, key)) as f:
+                    stored = json.loads(await f.read())
+                entry = (stored["value"], stored["created_at"])
+            except (OSError, ValueError, KeyError):
+                return None
+            self._form_cache[(kind, key)] = entry
+
+        value, created_at = entry
+        if time.time() - created_at >= self._cache_ttl_seconds:
+            self._form_cache.pop((kind, key), None)
+            return None
+        return value
+
+    async def _cache_put(self, kind: str, key: str, value: Any) -> None:
+        created_at = time.time()
+        self._form_cache[(kind, key)] = (value, created_at)
+        path = self._cache_path(kind, key)
+        try:
+            async with aiofiles.open(path, "w") as f:
+                await f.write(json.dumps({"created_at": created_at, "value": value}))
+        except OSError as e:
+            logger.warning(f"Could not write form cache {path}: {e}")
+
+    async def _cache_drop(self, kind: str, key: str) -> None:
+        self._form_cache.pop((kind, key), None)
+        path = self._cache_path(kind, key)
+        try:
+            await asyncio.to_thread(path.unlink, missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not remove form cache {path}: {e}")
+
+    async def _extract_schema(self, browser: Browser, url: str) -> tuple[str | None, asyncio.Task[Any]]:
+        """Pass 1: Extracts the form schema (labels and constraints) from the page.
+
+        Returns as soon as the agent reports a tagged schema, together with the
+        agent's run task, which may still be winding down. Await or cancel that
+        task before driving the browser again. The schema is None when the
+        agent finished without a tagged schema; its run task is then done.
+        """
         task = (
             f"Navigate to {url}. \n"
+            "If the form is already visible, report the schema in your FIRST response; "
+            "only wait for loading or scroll if fields are missing. \n"
             "Identify all visible input fields, textareas, and form elements. \n"
-            "Wait for the form to fully load. Scroll if necessary. \n"
             "For each field, extract: \n"
             "1. The exact label text.\n"
             "2. The field type (text, email, tel, etc.).\n"
             "3. Any constraints (e.g., 'Max 50 characters').\n"
-            "Output the results as a clean list of fields. "
+            f"Output the results as a clean list of fields wrapped in {_SCHEMA_START} and {_SCHEMA_END}. "
             "Do NOT fill anything yet. Just report the schema and stop."
         )
         
-        browser = Browser(browser_profile=browser_config)
+        from browser_use import Agent
+
+        schema_seen: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+
+        async def stop_on_schema(agent: Agent) -> None:
+            # A complete schema in any action output ends the pass, even if
+            # the model has not called done yet
+            if schema_seen.done() or not agent.history.history:
+                return
+            for r in agent.history.history[-1].result:
+                block = _schema_block(r.extracted_content)
+                if block is not None:
+                    schema_seen.set_result(block)
+                    agent.stop()
+                    return
+
         agent = Agent(task=task, llm=self.llm, browser=browser)
+        run = asyncio.create_task(agent.run(max_steps=SCHEMA_MAX_STEPS, on_step_end=stop_on_schema))
         try:
-            result = await agent.run(max_steps=10)
-            return str(result.final_result())
-        finally:
-            await browser.kill()
-
-    async def _map_data_to_schema(self, schema: str, source_data: dict[str, Any]) -> dict[str, Any]:
-        """Pass 1.5: Uses LLM to map source data to the extracted schema labels."""
-        prompt = (
-            "You are a Form Mapping Expert. \n"
-            "Given the following FORM SCHEMA (list of labels/fields) and SOURCE DATA (JSON), "
-            "create a deterministic MAPPING JSON. \n\n"
-            f"### FORM SCHEMA:\n{schema}\n\n"
-            f"### SOURCE DATA:\n{json.dumps(source_data, indent=2)}\n\n"
-            "### RULES:\n"
-            "1. Map each source data point to the MOST RELEVANT form label.\n"
-            "2. If a field has a character limit (e.g. 50), TRUNCATE the data to fit.\n"
-            "3. Ensure distinct fields for distinct data (e.g. Founder 1 vs Founder 2).\n"
-            "4. NEVER merge two data points into one field.\n"
-            "5. If a field type is 'email', ensure the mapped value is a valid email.\n"
-            "6. Output ONLY a JSON object where keys are FORM LABELS and values are the STRINGS to type."
+            await asyncio.wait((schema_seen, run), return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            run.cancel()
+            raise
+        if schema_seen.done():
+            return schema_seen.result(), run
+
+        history = run.result()
+        for content in reversed(history.extracted_content()):
+            block = _schema_block(content)
+            if block is not None:
+                return block, run
+        return None, run
+
+    async def _map_data_to_schema(
+        self, schema: str, source_data: dict[str, Any], source_json: str | None = None
+    ) -> dict[str, Any]:
+        """Pass 1.5: Uses LLM to map source data to the extracted schema labels.
+
+        ``source_json`` is ``source_data`` already serialized for the prompt,
+        when the caller prepared it ahead of time.
+        """
+        if source_json is None:
+            source_json = _dumps_indented(source_data)
+        prompt = f"### FORM SCHEMA:\n{schema}\n\n### SOURCE DATA:\n{source_json}"
+        from browser_use.llm.messages import SystemMessage, UserMessage
+
+        # The rules go out as the system instruction so every call shares the
+        # same prefix and Gemini's implicit prompt cache can serve it
+        response = await self.llm.ainvoke(
+            [SystemMessage(content=_MAPPING_SYSTEM_PROMPT), UserMessage(content=prompt)]
         )
-        # Use the underlying LLM with a HumanMessage to avoid Pydantic errors
-        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
         content = response.completion
-        # Basic cleanup of markdown if LLM returned it
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
+        # The object spans the first "{" to the last "}", which also drops any
+        # markdown fence or prose the LLM wrapped around it
+        start = content.find("{")
+        end = content.rfind("}")
+        payload = content[start:end + 1] if start != -1 and end > start else content
+
         try:
-            return json.loads(content)
+            return _loads_json(payload)
         except Exception as e:
             logger.error(f"Failed to parse mapping JSON: {e}. Content: {content}")
             return {}
@@ -377,76 +361,100 @@ class BrowserExecutor:
         """Fills a form at the given URL with the provided data using a Two-Pass strategy."""
         logger.info(f"Starting Two-Pass browser agent to fill form at {url}")
         
-        # Get browser path and user data dir from env
-        config_chrome_path = os.environ.get("CHROME_PATH") or os.environ.get("BRAVE_PATH")
-        config_user_data_dir = os.environ.get("USER_DATA_DIR")
-
-        browser_config = BrowserProfile(
-            disable_security=True,
-            executable_path=config_chrome_path,
-            user_data_dir=config_user_data_dir,
-            args=[
-                "--allow-file-access-from-files",
-                "--no-sandbox",
-                "--disable-setuid-sandbox"
-            ]
-        )
+        browser = self._new_browser()
+        schema_key = self._cache_key(url)
+        mapping_key: str | None = None
+        schema_run: asyncio.Task[Any] | None = None
 
         try:
-            # PASS 1: Extract Schema
-            logger.info("Pass 1: Extracting Form Schema...")
-            schema_text = await self._extract_schema(browser_config, url)
+            schema_text = await self._cache_get("schema", schema_key)
+            if schema_text is None:
+                # PASS 1: Extract Schema, serializing the source data for the
+                # mapping prompt in a thread meanwhile
+                logger.info("Pass 1: Extracting Form Schema...")
+                (schema_text, schema_run), source_json = await asyncio.gather(
+                    self._extract_schema(browser, url),
+                    asyncio.to_thread(_dumps_indented, data),
+                )
+                if schema_text is not None:
+                    await self._cache_put("schema", schema_key, schema_text)
+                else:
+                    # Untagged output may be "None" or prose; use it for this
+                    # call only rather than caching it as the form's schema
+                    schema_text = str(schema_run.result().final_result())
+            else:
+                logger.info("Pass 1: Reusing cached form schema")
+                source_json = _dumps_indented(data)
             logger.debug(f"Extracted Schema: {schema_text}")
 
             # PASS 1.5: Map Data to Schema
-            logger.info("Pass 1.5: Pre-mapping data to schema...")
-            mapping = await self._map_data_to_schema(schema_text, data)
-            mapping_str = json.dumps(mapping, indent=2)
+            mapping_key = self._cache_key(schema_text, source_json)
+            mapping = await self._cache_get("mapping", mapping_key)
+            if mapping is None:
+                logger.info("Pass 1.5: Pre-mapping data to schema...")
+                mapping = await self._map_data_to_schema(schema_text, data, source_json)
+                # An empty mapping means the reply could not be parsed
+                if mapping:
+                    await self._cache_put("mapping", mapping_key, mapping)
+            else:
+                logger.info("Pass 1.5: Reusing cached mapping")
+            mapping_str = _dumps_indented(mapping)
             logger.debug(f"Generated Mapping: {mapping_str}")
 
             # PASS 2: Deterministic Filling
+            if schema_run is not None:
+                # The mapping call overlapped the Pass 1 agent winding down;
+                # it must be finished before Pass 2 takes over the browser
+                try:
+                    await schema_run
+                except Exception as e:
+                    logger.warning(f"Pass 1 agent did not finish cleanly: {e}")
             logger.info("Pass 2: Executing deterministic filling...")
-            # We recreate browser_config to ensure a fresh session for Pass 2 if needed
-            result_text = await self._fill_form_deterministically_internal(browser_config, url, mapping)
+            # After Pass 1 the same session normally still shows the form
+            result_text = await self._fill_form_deterministically_internal(
+                browser, url, mapping, mapping_str, form_open=schema_run is not None
+            )
             
             return result_text
 
         except Exception as e:
             logger.error(f"Browser agent failed during Two-Pass execution: {e}")
+            # The cached schema or mapping may be what went wrong
+            await self._cache_drop("schema", schema_key)
+            if mapping_key is not None:
+                await self._cache_drop("mapping", mapping_key)
             raise
+        finally:
+            if schema_run is not None and not schema_run.done():
+                schema_run.cancel()
+            await browser.kill()
 
-    async def _fill_form_deterministically_internal(self, browser_config: BrowserProfile, url: str, mapping: dict[str, Any]) -> str:
-        """Pass 2: Fills the form using a strict, label-based deterministic mapping."""
-        mapping_str = json.dumps(mapping, indent=2)
-        task = (
-            f"# TASK: Fill Application Form (DETERMINISTIC MODE)\n"
-            f" ## 1. NAVIGATION\n"
-            f" - **ACTION**: Navigate to {url} immediately.\n\n"
-            f" ## 2. MAPPING TO EXECUTE\n"
-            f" The following JSON provides the EXACT strings to type for each label:\n"
-            f" ```json\n{mapping_str}\n```\n\n"
-            f" ## 3. EXECUTION RULES\n"
-            f" - **Strict Logic**: For each key in the JSON, find the element with that EXACT label and type the value.\n"
-            f" - **ANTI-SLICING**: CLICK the field, WAIT 1 second, then TYPE to prevent first-letter cutoff.\n"
-            f" - **ANTI-HANG**: After typing, immediately `Tab` out or click outside to force save.\n"
-            f" - **No Guesswork**: DO NOT infer anything. ONLY type what is in the mapping JSON.\n"
-            f" - **Verification**: Once all fields in the JSON are filled, you are DONE.\n\n"
-            f" ## 4. COMPLETION\n"
-            f" - Verify the form is filled according to the mapping and report success."
-        )
+    async def _fill_form_deterministically_internal(
+        self,
+        browser: Browser,
+        url: str,
+        mapping: dict[str, Any],
+        mapping_str: str | None = None,
+        form_open: bool = False,
+    ) -> str:
+        """Pass 2: Fills the form using a strict, label-based deterministic mapping.
+
+        ``mapping_str`` is ``mapping`` already serialized, when the caller has it.
+        ``form_open`` says the browser already shows the form from Pass 1, so
+        the agent is not told to navigate first.
+        """
+        if mapping_str is None:
+            mapping_str = _dumps_indented(mapping)
+        navigation = (_PASS2_NAVIGATION_OPEN if form_open else _PASS2_NAVIGATION_GOTO).format(url=url)
+        task = _PASS2_TASK_TEMPLATE.format(navigation=navigation, mapping_str=mapping_str)
+
+        from browser_use import Agent
 
-        browser = Browser(browser_profile=browser_config)
         agent = Agent(task=task, llm=self.llm, browser=browser)
-        try:
-            result = await agent.run(max_steps=30)
-            final_result_str = str(result.final_result())
-            
-            # Log results
-            async with aiofiles.open('browser_output.log', 'a') as log_f:
-                await log_f.write(f"\n--- Run Result ({url}) ---\n")
-                await log_f.write(final_result_str)
-                await log_f.write("\n")
-            
-            return final_result_str
-        finally:
-            await browser.kill()
+        result = await agent.run(max_steps=30)
+        final_result_str = str(result.final_result())
+        
+        # Log results
+        self._log_result(f"\n--- Run Result ({url}) ---\n{final_result_str}\n")
+        
+        return final_result_str
@@ -8,18 +8,27 @@ summaries of pipeline health.
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, TypedDict
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class MetricsSummary(TypedDict, total=False):
     """Summary of pipeline metrics."""
     files_processed: int
     files_succeeded: int
     files_failed: int
+    files_dropped: int
     success_rate_percent: float
     total_bytes_processed: int
     average_processing_time_seconds: float
@@ -54,6 +63,7 @@ class PipelineMetrics:
     files_processed: int = 0
     files_succeeded: int = 0
     files_failed: int = 0
+    files_dropped: int = 0  # Watcher events discarded because the queue was full
     total_bytes_processed: int = 0
     
     # Timing
@@ -83,16 +93,20 @@ class PipelineMetrics:
         self._current.success = success
         self._current.error = error
         
+        self.add_record(self._current)
+        self._current = None
+    
+    def add_record(self, record: ProcessingRecord) -> None:
+        """Count a finished record, e.g. one of several files processed together."""
         self.files_processed += 1
-        self.total_bytes_processed += self._current.file_size
+        self.total_bytes_processed += record.file_size
         
-        if success:
+        if record.success:
             self.files_succeeded += 1
         else:
             self.files_failed += 1
         
-        self.records.append(self._current)
-        self._current = None
+        self.records.append(record)
     
     @property
     def success_rate(self) -> float:
@@ -120,6 +134,7 @@ class PipelineMetrics:
             "files_processed": self.files_processed,
             "files_succeeded": self.files_succeeded,
             "files_failed": self.files_failed,
+            "files_dropped": self.files_dropped,
             "success_rate_percent": round(self.success_rate, 2),
             "total_bytes_processed": self.total_bytes_processed,
             "average_processing_time_seconds": round(self.average_processing_time, 3),
@@ -127,11 +142,8 @@ class PipelineMetrics:
             "started_at": self.started_at.isoformat(),
         }
     
-    def save(self, output_path: Path | str) -> None:
-        """Save metrics to a JSON file."""
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
+    def snapshot(self) -> MetricsSummary:
+        """Summary plus the last 100 records, as saved by :meth:`save`."""
         data = self.get_summary()
         data["records"] = [
             {
@@ -144,10 +156,32 @@ class PipelineMetrics:
             }
             for r in self.records[-100:]  # Keep last 100 records
         ]
+        return data
+    
+    @staticmethod
+    def write(data: MetricsSummary, output_path: Path | str) -> None:
+        """Write a :meth:`snapshot` to a JSON file.
         
-        with open(output_path, "w") as f:
-            json.dump(data, f, indent=2)
-
+        Only touches ``data``, so it can run in a worker thread while the
+        metrics keep changing. The file is replaced atomically, so readers
+        such as the dashboard never see a partial write.
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=output_path.parent, prefix=f".{output_path.name}.", delete=False
+        ) as f:
+            if ORJSON_AVAILABLE:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(data, indent=2).encode())
+        os.replace(f.name, output_path)
+    
+    def save(self, output_path: Path | str) -> None:
+        """Save metrics to a JSON file."""
+        self.write(self.snapshot(), output_path)
+    
     @classmethod
     def from_file(cls, input_path: Path | str) -> PipelineMetrics:
         """Load metrics from a JSON file."""
@@ -157,12 +191,13 @@ class PipelineMetrics:
             return metrics
             
         try:
-            with open(input_path) as f:
-                data = json.load(f)
+            with open(input_path, "rb") as f:
+                data = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
                 
             metrics.files_processed = data.get("files_processed", 0)
             metrics.files_succeeded = data.get("files_succeeded", 0)
             metrics.files_failed = data.get("files_failed", 0)
+            metrics.files_dropped = data.get("files_dropped", 0)
             metrics.total_bytes_processed = data.get("total_bytes_processed", 0)
             
             if "started_at" in data:
@@ -197,6 +232,7 @@ class PipelineMetrics:
             f"Files Processed:  {summary['files_processed']}",
             f"  ✓ Succeeded:    {summary['files_succeeded']}",
             f"  ✗ Failed:       {summary['files_failed']}",
+            f"  ⚠ Dropped:      {summary['files_dropped']}",
             f"Success Rate:     {summary['success_rate_percent']}%",
             f"Data Processed:   {self._format_bytes(summary['total_bytes_processed'])}",
             f"Avg Time:         {summary['average_processing_time_seconds']}s",
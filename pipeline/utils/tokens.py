@@ -0,0 +1,117 @@
+"""Token-budget helpers for prompt construction.
+
+Counts use tiktoken's ``cl100k_base`` encoding when tiktoken is installed.
+It is not Gemini's tokenizer, but its counts land within a few percent of it
+for prose and code. Without tiktoken a ~4 characters/token heuristic is used.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+from pipeline.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from tiktoken import Encoding
+
+# Average characters per token for English prose/code when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Share of the budget kept from the start of the text; the rest comes from the end
+HEAD_RATIO = 0.6
+
+# Characters encoded from each end of over-budget text per budgeted token.
+# Real text averages ~4 characters per token, so the head and tail budgets
+# fit in these windows and the middle of a huge document is never encoded
+WINDOW_CHARS_PER_TOKEN = 8
+
+logger = get_logger(__name__)
+
+_encoding: Encoding | None = None
+_encoding_failed = False
+
+
+def load_encoding() -> Encoding | None:
+    """Load the cl100k encoding once; None if tiktoken is missing or offline.
+
+    The first call may download the BPE ranks, so call this from a worker
+    thread (e.g. while building a generator) before prompts are built on
+    the event loop.
+    """
+    global _encoding, _encoding_failed
+
+    if _encoding is None and TIKTOKEN_AVAILABLE and not _encoding_failed:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # First use downloads the BPE ranks; fall back if that fails
+            logger.debug(f"tiktoken encoding unavailable, using heuristic: {e}")
+            _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count (or estimate) the number of tokens in ``text``."""
+    encoding = load_encoding()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_middle(text: str, max_tokens: int) -> str:
+    """Trim ``text`` to a token budget, keeping its beginning and end.
+
+    Models attend best to the start and end of a context, and documents put
+    titles/headers first and conclusions last, so the middle is dropped.
+
+    Args:
+        text: Text to trim.
+        max_tokens: Token budget for the kept text (excluding the marker).
+
+    Returns:
+        ``text`` unchanged if it fits, otherwise head + marker + tail.
+    """
+    # Every token spans at least one character
+    if len(text) <= max_tokens:
+        return text
+    
+    encoding = load_encoding()
+    if encoding is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        head = int(max_chars * HEAD_RATIO)
+        tail = max_chars - head
+        return "".join((
+            text[:head],
+            f"\n\n... [Truncated, {len(text) - max_chars:,} more characters] ...\n\n",
+            text[-tail:] if tail else "",
+        ))
+
+    head = int(max_tokens * HEAD_RATIO)
+    tail = max_tokens - head
+    window = max_tokens * WINDOW_CHARS_PER_TOKEN
+    if len(text) <= 2 * window:
+        ids: list[Any] = encoding.encode(text, disallowed_special=())
+        if len(ids) <= max_tokens:
+            return text
+        head_ids, tail_ids = ids[:head], ids[len(ids) - tail:]
+    else:
+        # Only the two ends are encoded; a token split at a window edge is
+        # far from the kept ids
+        head_ids = encoding.encode(text[:window], disallowed_special=())[:head]
+        tail_ids = encoding.encode(text[-window:], disallowed_special=())[-tail:] if tail else []
+    
+    head_text = encoding.decode(head_ids)
+    tail_text = encoding.decode(tail_ids)
+    return "".join((
+        head_text,
+        f"\n\n... [Truncated, {len(text) - len(head_text) - len(tail_text):,} more characters] ...\n\n",
+        tail_text,
+    ))
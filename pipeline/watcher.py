@@ -9,18 +9,54 @@ from __future__ import annotations
 
 import asyncio
 import fnmatch
+import os
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Iterator
 
-from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.events import (
+    FileCreatedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileSystemEvent,
+    FileSystemEventHandler,
+)
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 
 from pipeline.config import PipelineConfig
+from pipeline.utils.bridge import LoopBridge
 from pipeline.utils.logging import get_logger
 
 if TYPE_CHECKING:
     from logging import Logger
 
+    from watchdog.observers.api import BaseObserver
+
+# Filesystems whose changes by other hosts never reach local inotify
+NETWORK_FILESYSTEMS = frozenset({"nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p"})
+
+# The only events the handler acts on; with watchdog 4+ this also narrows
+# the inotify mask (no IN_ACCESS / IN_OPEN / IN_CLOSE_NOWRITE wakeups)
+_WATCHED_EVENTS = [FileCreatedEvent, FileModifiedEvent, FileMovedEvent]
+
+
+def _filesystem_type(path: Path) -> str | None:
+    """Filesystem type of the mount holding ``path`` (Linux only, else None)."""
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return None
+    
+    resolved = str(path.resolve())
+    best, fs_type = "", None
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        inside = resolved == mount_point or resolved.startswith(mount_point.rstrip("/") + "/")
+        if inside and len(mount_point) > len(best):
+            best, fs_type = mount_point, mount_type
+    return fs_type
+
 
 class DebouncedHandler(FileSystemEventHandler):
     """Event handler that delays and debounces file system events.
@@ -40,6 +76,10 @@ class DebouncedHandler(FileSystemEventHandler):
         self.loop = loop
         self.pending: dict[str, asyncio.TimerHandle] = {}
         self.logger: Logger = get_logger(__name__)
+        
+        # Events arrive on the observer thread; a burst of them costs one
+        # loop wakeup
+        self._bridge: LoopBridge[str] = LoopBridge(loop, self._schedule_callbacks)
     
     def _should_ignore(self, path: str) -> bool:
         """Check if path matches any ignore patterns."""
@@ -54,6 +94,11 @@ class DebouncedHandler(FileSystemEventHandler):
         suffix = Path(path).suffix.lower()
         return suffix in self.config.processing.supported_extensions
     
+    def _schedule_callbacks(self, paths: list[str]) -> None:
+        """Debounce a batch of paths from the bridge, once per distinct path."""
+        for path in dict.fromkeys(paths):
+            self._schedule_callback(path)
+    
     def _schedule_callback(self, path: str) -> None:
         """Schedule a debounced callback for the path."""
         if path in self.pending:
@@ -81,7 +126,7 @@ class DebouncedHandler(FileSystemEventHandler):
             return
         
         self.logger.info(f"File created: {path}")
-        self.loop.call_soon_threadsafe(self._schedule_callback, path)
+        self._bridge.submit(path)
     
     def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification events."""
@@ -93,7 +138,19 @@ class DebouncedHandler(FileSystemEventHandler):
             return
         
         self.logger.debug(f"File modified: {path}")
-        self.loop.call_soon_threadsafe(self._schedule_callback, path)
+        self._bridge.submit(path)
+    
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Handle files renamed into place (e.g. atomic writes)."""
+        if event.is_directory:
+            return
+        
+        path = str(event.dest_path)
+        if self._should_ignore(path) or not self._is_supported(path):
+            return
+        
+        self.logger.info(f"File moved in: {path}")
+        self._bridge.submit(path)
 
 
 class FileWatcher:
@@ -122,15 +179,32 @@ class FileWatcher:
         
         handler = DebouncedHandler(self.callback, self.config, self.loop)
         
-        self.observer = Observer()
-        self.observer.schedule(
-            handler,
-            str(watch_path),
-            recursive=self.config.watcher.recursive
-        )
+        self.observer = self._make_observer(watch_path)
+        try:
+            self.observer.schedule(
+                handler,
+                str(watch_path),
+                recursive=self.config.watcher.recursive,
+                event_filter=_WATCHED_EVENTS,
+            )
+        except TypeError:
+            # watchdog < 4 has no event_filter
+            self.observer.schedule(handler, str(watch_path), recursive=self.config.watcher.recursive)
         self.observer.start()
         
-        self.logger.info(f"Started watching: {watch_path}")
+        self.logger.info(f"Started watching: {watch_path} ({type(self.observer).__name__})")
+    
+    def _make_observer(self, watch_path: Path) -> BaseObserver:
+        """Pick the native or polling observer per ``watcher.observer``."""
+        mode = self.config.watcher.observer.lower()
+        if mode == "auto":
+            fs_type = _filesystem_type(watch_path)
+            mode = "polling" if fs_type in NETWORK_FILESYSTEMS else "native"
+            if mode == "polling":
+                self.logger.info(f"{watch_path} is on {fs_type}; polling for changes")
+        if mode == "polling":
+            return PollingObserver(timeout=self.config.watcher.poll_interval_seconds)
+        return Observer()
     
     def stop(self) -> None:
         """Stop watching the directory."""
@@ -140,13 +214,21 @@ class FileWatcher:
             self.observer = None
             self.logger.info("Stopped watching")
     
-    def process_existing(self) -> list[Path]:
-        """Find and return existing files in the data directory."""
-        files = []
+    def process_existing(self) -> Iterator[Path]:
+        """Yield existing files in the data directory as the walk finds them.
+
+        One directory walk covers every supported extension instead of one
+        glob per extension. Being lazy, the caller can start processing
+        before a large tree has been fully walked.
+        """
         data_dir = self.config.get_data_dir()
+        extensions = tuple(self.config.processing.supported_extensions)
         
-        for ext in self.config.processing.supported_extensions:
-            pattern = f"**/*{ext}" if self.config.watcher.recursive else f"*{ext}"
-            files.extend(data_dir.glob(pattern))
-        
-        return [f for f in files if f.is_file()]
+        for root, dirs, names in os.walk(data_dir):
+            if not self.config.watcher.recursive:
+                dirs.clear()
+            for name in names:
+                if name.endswith(extensions):
+                    path = Path(root, name)
+                    if path.is_file():
+                        yield path
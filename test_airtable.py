@@ -85,6 +85,8 @@ async def main():
         print("Browser Agent Result:", browser_result)
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        await executor.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from pipeline.memory.batcher import UpsertBatcher
+
+
+def make_memory(result=True) -> MagicMock:
+    memory = MagicMock()
+    memory.abatch_upsert = AsyncMock(return_value=result)
+    return memory
+
+
+def batch_sizes(memory: MagicMock) -> list[int]:
+    return [len(call.args[0]) for call in memory.abatch_upsert.await_args_list]
+
+
+class TestUpsertBatcher(unittest.TestCase):
+    def test_full_batch_flushes_without_waiting(self):
+        memory = make_memory()
+        batcher = UpsertBatcher(memory, batch_size=3, flush_interval=60)
+
+        async def run():
+            for i in range(3):
+                await batcher.submit(f"text {i}", "a.txt")
+            await asyncio.sleep(0.01)
+            flushed = batch_sizes(memory)
+            await batcher.close()
+            return flushed
+
+        self.assertEqual(asyncio.run(run()), [3])
+        self.assertEqual(batch_sizes(memory), [3])
+
+    def test_partial_batch_flushes_after_interval(self):
+        memory = make_memory()
+        batcher = UpsertBatcher(memory, batch_size=10, flush_interval=0.02)
+
+        async def run():
+            await batcher.submit("first", "a.txt", {"type": "note"})
+            await batcher.submit("second", "b.txt")
+            await asyncio.sleep(0.1)
+            flushed = batch_sizes(memory)
+            await batcher.close()
+            return flushed
+
+        self.assertEqual(asyncio.run(run()), [2])
+        items = memory.abatch_upsert.await_args.args[0]
+        self.assertEqual(items[0], {"content": "first", "source": "a.txt", "metadata": {"type": "note"}})
+        self.assertEqual(items[1], {"content": "second", "source": "b.txt"})
+
+    def test_close_flushes_pending_records(self):
+        memory = make_memory()
+        batcher = UpsertBatcher(memory, batch_size=10, flush_interval=60)
+
+        async def run():
+            for i in range(4):
+                await batcher.submit(f"text {i}", "a.txt")
+            await batcher.close()
+            # The batcher restarts its flusher on the next submission
+            await batcher.submit("later", "a.txt")
+            await batcher.close()
+
+        asyncio.run(run())
+        self.assertEqual(batch_sizes(memory), [4, 1])
+
+    def test_close_without_submissions_is_a_no_op(self):
+        memory = make_memory()
+        asyncio.run(UpsertBatcher(memory).close())
+        memory.abatch_upsert.assert_not_called()
+
+    def test_failed_flush_does_not_stop_the_flusher(self):
+        memory = make_memory()
+        memory.abatch_upsert.side_effect = [RuntimeError("down"), True]
+        batcher = UpsertBatcher(memory, batch_size=1, flush_interval=60)
+
+        async def run():
+            await batcher.submit("first", "a.txt")
+            await batcher.submit("second", "a.txt")
+            await batcher.close()
+
+        asyncio.run(run())
+        self.assertEqual(batch_sizes(memory), [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from pipeline.utils.bridge import LoopBridge
+
+
+class TestLoopBridge(unittest.TestCase):
+    def test_burst_is_delivered_in_one_call(self):
+        async def run():
+            loop = asyncio.get_running_loop()
+            batches = []
+            bridge = LoopBridge(loop, batches.append)
+            with patch.object(loop, "call_soon_threadsafe", wraps=loop.call_soon_threadsafe) as wake:
+                for i in range(5):
+                    bridge.submit(i)
+                await asyncio.sleep(0)
+            return batches, wake.call_count
+
+        batches, wakeups = asyncio.run(run())
+        self.assertEqual(batches, [[0, 1, 2, 3, 4]])
+        self.assertEqual(wakeups, 1)
+
+    def test_items_from_many_threads_arrive_on_the_loop(self):
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop_thread = threading.get_ident()
+            received = []
+            done = asyncio.Event()
+
+            def handler(items):
+                self.assertEqual(threading.get_ident(), loop_thread)
+                received.extend(items)
+                if len(received) == 400:
+                    done.set()
+
+            bridge = LoopBridge(loop, handler)
+
+            def produce(start):
+                for i in range(start, start + 100):
+                    bridge.submit(i)
+
+            threads = [threading.Thread(target=produce, args=(n * 100,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            await asyncio.wait_for(done.wait(), timeout=5)
+            for thread in threads:
+                thread.join()
+            return received
+
+        received = asyncio.run(run())
+        self.assertEqual(sorted(received), list(range(400)))
+        # Each producer's items keep their submission order
+        for n in range(4):
+            own = [i for i in received if n * 100 <= i < (n + 1) * 100]
+            self.assertEqual(own, sorted(own))
+
+    def test_submit_after_drain_schedules_again(self):
+        async def run():
+            batches = []
+            bridge = LoopBridge(asyncio.get_running_loop(), batches.append)
+            bridge.submit("a")
+            await asyncio.sleep(0)
+            bridge.submit("b")
+            await asyncio.sleep(0)
+            return batches
+
+        self.assertEqual(asyncio.run(run()), [["a"], ["b"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import ModuleType
+from unittest.mock import patch
+
+import numpy as np
+
+from pipeline.generators.base import GeneratedInstructions
+from pipeline.generators.cache import ResponseCache, SemanticCache
+
+
+def make_result(text: str) -> GeneratedInstructions:
+    return GeneratedInstructions(
+        instructions=text,
+        title="Title",
+        source_file=Path("a.txt"),
+        source_type="Text",
+    )
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = ResponseCache()
+        cache.put("prompt", make_result("steps"))
+
+        self.assertEqual(cache.get("prompt").instructions, "steps")
+        self.assertIsNone(cache.get("other"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1})
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", make_result("a"))
+        cache.put("b", make_result("b"))
+        cache.get("a")
+        cache.put("c", make_result("c"))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_expired_entries_are_dropped(self):
+        cache = ResponseCache(ttl_seconds=10)
+        with patch("pipeline.generators.cache.time.monotonic", return_value=100.0):
+            cache.put("prompt", make_result("steps"))
+        with patch("pipeline.generators.cache.time.monotonic", return_value=109.0):
+            self.assertIsNotNone(cache.get("prompt"))
+        with patch("pipeline.generators.cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("prompt"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+class FakeSentenceTransformer:
+    """Letter-count embeddings; construction is slow so racing loads overlap."""
+
+    instances = 0
+
+    def __init__(self, name):
+        type(self).instances += 1
+        time.sleep(0.05)
+
+    def get_sentence_embedding_dimension(self):
+        return 26
+
+    def encode(self, text, convert_to_numpy=True, normalize_embeddings=True):
+        vector = np.zeros(26, dtype=np.float32)
+        for ch in text.lower():
+            if "a" <= ch <= "z":
+                vector[ord(ch) - ord("a")] += 1
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+
+def fake_sentence_transformers() -> ModuleType:
+    module = ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeSentenceTransformer
+    return module
+
+
+class TestSemanticCache(unittest.TestCase):
+    def setUp(self):
+        FakeSentenceTransformer.instances = 0
+        patcher = patch.dict("sys.modules", {"sentence_transformers": fake_sentence_transformers()})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_exact_and_semantic_hits(self):
+        cache = SemanticCache(threshold=0.99)
+        cache.put("describe the quarterly report", make_result("steps"))
+
+        self.assertEqual(cache.get("describe the quarterly report")[1], "exact")
+        result, kind = cache.get("Describe the quarterly report!")
+        self.assertEqual((result.instructions, kind), ("steps", "semantic"))
+        self.assertIsNone(cache.get("zzz"))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_fifo_eviction(self):
+        cache = SemanticCache(max_entries=2)
+        for prompt in ("one", "two", "three"):
+            cache.put(prompt, make_result(prompt))
+
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertEqual(cache.get("three")[1], "exact")
+        self.assertIsNone(cache.get("one"))
+
+    def test_model_loads_once_under_concurrent_puts(self):
+        cache = SemanticCache()
+        threads = [
+            threading.Thread(target=cache.put, args=(f"prompt {i}", make_result(str(i))))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(FakeSentenceTransformer.instances, 1)
+        self.assertEqual(cache.stats()["entries"], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pipeline.config import PipelineConfig
+from pipeline.extractors.base import ExtractedContent
+from pipeline.generators.gemini import GeminiGenerator
+
+
+def make_content(name: str, file_type: str, summary: str = "A summary") -> ExtractedContent:
+    return ExtractedContent(
+        content="some text",
+        summary=summary,
+        file_type=file_type,
+        file_path=Path(name),
+        file_size_bytes=100,
+        modified_time=datetime(2024, 1, 1),
+        structure={},
+    )
+
+
+@patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+@patch("pipeline.generators.gemini.ChatGoogleGenerativeAI")
+class TestGeminiPromptPrefix(unittest.TestCase):
+    def setUp(self):
+        self.config = PipelineConfig()
+        self.config.generator.model = "gemini-test"
+        self.config.generator.context_cache_ttl_seconds = 600
+
+    def test_prefix_shared_across_file_types(self, _mock_llm):
+        generator = GeminiGenerator(self.config)
+        pdf = make_content("a.pdf", "PDF", "First summary")
+        csv = make_content("b.csv", "CSV", "Second summary")
+
+        self.assertEqual(generator._build_static_prefix(pdf), generator._build_static_prefix(csv))
+        self.assertNotIn("{file_type}", generator._build_static_prefix(pdf))
+        # The per-file template lines move to the suffix instead
+        self.assertIn("## Data Type: PDF", generator._build_dynamic_suffix(pdf))
+        self.assertIn("## Content Summary: Second summary", generator._build_dynamic_suffix(csv))
+
+        client = MagicMock()
+        client.aio.caches.create = AsyncMock(return_value=MagicMock())
+        client.aio.caches.create.return_value.name = "cachedContents/one"
+        generator._genai_client = client
+
+        async def run():
+            return [await generator._get_context_cache(generator._build_static_prefix(c)) for c in (pdf, csv)]
+
+        self.assertEqual(asyncio.run(run()), ["cachedContents/one", "cachedContents/one"])
+        client.aio.caches.create.assert_awaited_once()
+        self.assertEqual(len(generator._context_caches), 1)
+
+    def test_context_caches_are_bounded(self, _mock_llm):
+        generator = GeminiGenerator(self.config)
+        client = MagicMock()
+        client.aio.caches.create = AsyncMock(side_effect=RuntimeError("too small"))
+        generator._genai_client = client
+
+        async def run():
+            for i in range(100):
+                await generator._get_context_cache(f"prefix {i}")
+
+        asyncio.run(run())
+        self.assertEqual(len(generator._uncacheable_prefixes), 64)
+
+
+async def _chunks(*texts):
+    for text in texts:
+        chunk = MagicMock(text=text)
+        chunk.usage_metadata.total_token_count = 7
+        yield chunk
+
+
+class RateLimited(Exception):
+    code = 429
+
+
+@patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+@patch("pipeline.generators.gemini.ChatGoogleGenerativeAI")
+class TestGeminiServiceTier(unittest.TestCase):
+    def setUp(self):
+        self.config = PipelineConfig()
+        self.config.generator.model = "gemini-test"
+
+    def test_standard_by_default(self, _mock_llm):
+        generator = GeminiGenerator(self.config)
+        self.assertEqual(generator._service_tier(make_content("a.pdf", "PDF")), "standard")
+
+    def test_flex_through_genai_client(self, mock_llm):
+        self.config.generator.service_tier = "flex"
+        generator = GeminiGenerator(self.config)
+        client = MagicMock()
+        client.aio.models.generate_content_stream = AsyncMock(return_value=_chunks("Hello ", "world"))
+        generator._genai_client = client
+
+        usage = {}
+        content = make_content("a.pdf", "PDF")
+
+        async def run():
+            stream = generator._stream_prompt("prompt", usage, None, generator._service_tier(content))
+            return [part async for part in stream]
+
+        self.assertEqual(asyncio.run(run()), ["Hello ", "world"])
+        config = client.aio.models.generate_content_stream.call_args.kwargs["config"]
+        self.assertEqual(config.service_tier, "flex")
+        self.assertEqual(usage["total_tokens"], 7)
+        mock_llm.return_value.astream.assert_not_called()
+
+    def test_rejected_flex_request_falls_back_to_standard(self, mock_llm):
+        self.config.generator.service_tier = "flex"
+        generator = GeminiGenerator(self.config)
+        client = MagicMock()
+        client.aio.models.generate_content_stream = AsyncMock(side_effect=RateLimited())
+        generator._genai_client = client
+
+        async def astream(prompt, **kwargs):
+            yield MagicMock(content="standard answer", usage_metadata=None)
+
+        mock_llm.return_value.astream = astream
+        content = make_content("a.pdf", "PDF")
+
+        async def run():
+            stream = generator._stream_prompt("prompt", {}, None, generator._service_tier(content))
+            return [part async for part in stream]
+
+        self.assertEqual(asyncio.run(run()), ["standard answer"])
+
+    def test_interactive_content_uses_priority(self, _mock_llm):
+        generator = GeminiGenerator(self.config)
+        content = make_content("a.pdf", "PDF")
+        content.metadata["interactive"] = True
+        self.assertEqual(generator._service_tier(content), "priority")
+        content.metadata["urgency"] = "normal"
+        self.assertEqual(generator._service_tier(content), "standard")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,8 @@
 import asyncio
-import shutil
+import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # sys.modules mocks removed to allow real imports in verified environment
 from pipeline.config import PipelineConfig
@@ -16,14 +16,17 @@ from pipeline.watcher import DebouncedHandler
 class TestIntegration(unittest.TestCase):
     
     def setUp(self):
-        self.test_dir = Path("data/test_integration")
-        self.test_dir.mkdir(parents=True, exist_ok=True)
+        # Everything the processor writes (output, metrics, logs) stays in here
+        self._tmp = tempfile.TemporaryDirectory()
+        self.test_dir = Path(self._tmp.name)
         self.config = PipelineConfig()
         self.config.watcher.debounce_seconds = 0.1
+        self.config.directories.data = str(self.test_dir / "data")
+        self.config.directories.output = str(self.test_dir / "output")
+        self.config.directories.logs = str(self.test_dir / "logs")
 
     def tearDown(self):
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
 
     def test_watcher_race_condition(self):
         """Test that rapid creation and deletion doesn't crash the watcher."""
@@ -56,8 +59,8 @@ class TestIntegration(unittest.TestCase):
         
         loop.close()
 
-    @patch("pipeline.extractors.ocr_extractor.convert_from_path")
-    @patch("pipeline.extractors.ocr_extractor.easyocr.Reader")
+    @patch("pdf2image.convert_from_path")
+    @patch("easyocr.Reader")
     def test_ocr_extractor(self, mock_reader_class, mock_convert):
         """Test OCR extraction logic."""
         # Mock dependencies
@@ -78,11 +81,12 @@ class TestIntegration(unittest.TestCase):
         self.assertIn("OCR", result.file_type)
 
     @patch("pipeline.memory.pinecone_service.Pinecone")
-    @patch("pipeline.memory.pinecone_service.SentenceTransformer")
+    @patch("sentence_transformers.SentenceTransformer")
     def test_pinecone_memory(self, mock_transformer, mock_pinecone):
         """Test Pinecone memory service."""
         # Mock Pinecone
         mock_index = MagicMock()
+        mock_index.describe_index_stats.return_value = MagicMock(dimension=384)
         mock_client = MagicMock()
         mock_client.Index.return_value = mock_index
         mock_client.list_indexes.return_value = [MagicMock(name="browser-use-memory")]
@@ -115,15 +119,33 @@ class TestIntegration(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]["content"], "Result content")
 
+    def test_processor_coalesces_repeated_changes(self):
+        """Test that a file already queued or being processed is not queued again."""
+        processor = PipelineProcessor(self.config)
+        queued = self.test_dir / "queued.txt"
+        busy = self.test_dir / "busy.txt"
+
+        processor._try_enqueue(queued)
+        processor._try_enqueue(queued)
+        self.assertEqual(processor._processing_queue.qsize(), 1)
+
+        # A change during processing is remembered rather than queued
+        processor._inflight.add(busy)
+        processor._try_enqueue(busy)
+        processor._try_enqueue(busy)
+        self.assertEqual(processor._processing_queue.qsize(), 1)
+        self.assertIn(busy, processor._changed_inflight)
+
     @patch("pipeline.processor.get_extractor_for_file")
-    @patch("pipeline.processor.get_generator")
-    @patch("pipeline.processor.PineconeMemory")
+    @patch("pipeline.generators.get_generator")
+    @patch("pipeline.memory.pinecone_service.PineconeMemory")
     def test_processor_memory_integration(self, mock_memory_class, mock_get_generator, mock_get_extractor):
         """Test that PipelineProcessor uses memory when enabled."""
         # 1. Setup Logic
         # Mock Memory
         mock_memory_instance = MagicMock()
         mock_memory_instance.enabled = True
+        mock_memory_instance.abatch_upsert = AsyncMock(return_value=True)
         mock_memory_class.return_value = mock_memory_instance
         
         # 2. Execution
@@ -152,23 +174,55 @@ class TestIntegration(unittest.TestCase):
         # Manually set memory instance if __init__ mocking is tricky, 
         # but mock_memory_class should handle the instantiation in __init__
         
-        test_file = Path("test.txt")
-        # Touch file so .stat() works
-        with open("test.txt", "w") as f:
-            f.write("content")
+        test_file = self.test_dir / "test.txt"
+        # Write file so .stat() works
+        test_file.write_text("content")
             
         try:
             loop.run_until_complete(processor.process_file(test_file))
+            # Memory writes are batched in the background; flush them
+            loop.run_until_complete(processor._memory_batcher.close())
         finally:
-            Path("test.txt").unlink(missing_ok=True)
             loop.close()
 
         # 3. Verification
-        # Check that upsert was called
-        mock_memory_instance.upsert.assert_called_once()
-        call_args = mock_memory_instance.upsert.call_args
-        self.assertEqual(call_args.kwargs["content"], "Output markdown")
-        self.assertEqual(call_args.kwargs["source_file"], "test.txt")
+        # Check that the record was upserted in a batch
+        mock_memory_instance.abatch_upsert.assert_awaited_once()
+        items = mock_memory_instance.abatch_upsert.call_args.args[0]
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0]["content"], "Output markdown")
+        self.assertEqual(items[0]["source"], "test.txt")
+
+    def test_process_files_generates_in_one_batch(self):
+        """Test that process_files makes one generate_batch call for all files."""
+        files = [self.test_dir / "a.txt", self.test_dir / "b.txt", self.test_dir / "missing.txt"]
+        for path in files[:2]:
+            path.write_text(f"content of {path.name}")
+
+        generator = MagicMock()
+        generator.generate_batch = AsyncMock(side_effect=lambda contents: [
+            GeneratedInstructions(
+                instructions=f"Steps for {c.file_path.name}",
+                title="Title",
+                source_file=c.file_path,
+                source_type=c.file_type,
+                model_used="test-model",
+            )
+            for c in contents
+        ])
+        processor = PipelineProcessor(self.config)
+        processor.generator = generator
+        self.config.ensure_directories()
+
+        results = asyncio.run(processor.process_files(files))
+
+        self.assertEqual(results, [True, True, False])
+        generator.generate_batch.assert_awaited_once()
+        self.assertEqual(len(generator.generate_batch.call_args.args[0]), 2)
+        generator.generate.assert_not_called()
+        output = (self.test_dir / "output" / "a_instructions.md").read_text()
+        self.assertIn("Steps for a.txt", output)
+        self.assertEqual((processor.metrics.files_succeeded, processor.metrics.files_failed), (2, 1))
 
 
 if __name__ == "__main__":
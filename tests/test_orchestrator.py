@@ -2,51 +2,102 @@ import asyncio
 import unittest
 from unittest.mock import AsyncMock, MagicMock
 
+from pipeline.config import PipelineConfig
 from pipeline.orchestrator import AgentOrchestrator, WorkflowConfig, WorkflowStep
 
 
 class TestOrchestrator(unittest.TestCase):
     def setUp(self):
-        self.config = MagicMock()
+        self.config = PipelineConfig()
         self.orchestrator = AgentOrchestrator(self.config)
+        self.orchestrator.memory = MagicMock(enabled=False)
+        self.orchestrator.warmup = AsyncMock()
 
     async def _run_execution_plan_test(self):
-        # Setup workflow with parallel steps
-        # Steps: step1 -> [step2, step3] -> step4
+        # Steps: step1 -> [step2, step3] -> step4 (step4 needs step2 only)
         workflow_config = WorkflowConfig(
             steps=[
-                WorkflowStep(name="step1", role="role1", action="action1"),
-                WorkflowStep(name="step2", role="role2", action="action2", input_from="step1"),
-                WorkflowStep(name="step3", role="role3", action="action3", input_from="step1"),
-                WorkflowStep(name="step4", role="role4", action="action4", input_from="step2")
+                WorkflowStep(name="step1", role="planner", action="action1"),
+                WorkflowStep(name="step2", role="engineer", action="action2", input_from="step1"),
+                WorkflowStep(name="step3", role="tester", action="action3", input_from="step1"),
+                WorkflowStep(name="step4", role="reviewer", action="action4", input_from=["step2"]),
             ],
-            parallel_steps=[["step2", "step3"]]
         )
         
         content = MagicMock()
         content.summary = "Test content"
         
+        events = []
+        
+        async def fake_execute_step(step, role, context, on_chunk=None):
+            name = step["name"]
+            events.append(("start", name))
+            # step3 is slow; step4 must not wait for it
+            await asyncio.sleep(0.05 if name == "step3" else 0)
+            events.append(("end", name))
+            return f"{name} output"
+        
         # Mock methods to avoid real execution
-        self.orchestrator._execute_step = AsyncMock(return_value=None) # No error
-        self.orchestrator.execute_parallel_steps = AsyncMock(return_value=[]) # No errors
+        self.orchestrator._execute_step = fake_execute_step
         
         # Run workflow
         result = await self.orchestrator.execute_workflow(workflow_config, content)
         
-        # Verify calls
-        # Should call _execute_step for step1
-        # Should call execute_parallel_steps for [step2, step3]
-        # Should call _execute_step for step4
+        self.assertTrue(result.success, result.errors)
+        self.assertEqual(sorted(result.steps_completed), ["step1", "step2", "step3", "step4"])
+        
+        # step2 and step3 both start once step1 has finished, before either ends
+        self.assertEqual(events[:2], [("start", "step1"), ("end", "step1")])
+        self.assertEqual(sorted(events[2:4]), [("start", "step2"), ("start", "step3")])
+        
+        # step4 only depends on step2, so it finishes while step3 is running
+        self.assertLess(events.index(("end", "step4")), events.index(("end", "step3")))
         
-        # Check that execute_parallel_steps was called
-        self.orchestrator.execute_parallel_steps.assert_called_once()
-        args, _ = self.orchestrator.execute_parallel_steps.call_args
-        parallel_steps_arg = args[0]
-        step_ids = sorted([s['name'] for s in parallel_steps_arg])
-        self.assertEqual(step_ids, ["step2", "step3"])
+        # Final output follows definition order, not completion order
+        self.assertEqual(result.final_output, "step4 output")
 
     def test_parallel_execution_plan(self):
         asyncio.run(self._run_execution_plan_test())
 
+    async def _run_streaming_start_test(self):
+        # draft streams; outline may start on its first 10 characters
+        workflow_config = WorkflowConfig(
+            steps=[
+                WorkflowStep(name="draft", role="planner", action="draft"),
+                WorkflowStep(name="outline", role="engineer", action="outline", input_from="draft",
+                             stream_start_chars=10),
+            ],
+        )
+        
+        events = []
+        seen_input = {}
+        
+        async def fake_execute_step(step, role, context, on_chunk=None):
+            name = step["name"]
+            events.append(("start", name))
+            if name == "draft":
+                self.assertIsNotNone(on_chunk)
+                for part in ("0123456789", "abcdef"):
+                    on_chunk(part)
+                    await asyncio.sleep(0.02)
+                events.append(("end", name))
+                return "0123456789abcdef"
+            seen_input[name] = context.get_result("draft")
+            events.append(("end", name))
+            return f"{name} output"
+        
+        self.orchestrator._execute_step = fake_execute_step
+        
+        result = await self.orchestrator.execute_workflow(workflow_config, MagicMock())
+        
+        self.assertTrue(result.success, result.errors)
+        # outline ran on the streamed prefix while draft was still generating
+        self.assertEqual(seen_input["outline"], "0123456789")
+        self.assertLess(events.index(("end", "outline")), events.index(("end", "draft")))
+        self.assertEqual(result.agent_outputs["draft"], "0123456789abcdef")
+
+    def test_streaming_start(self):
+        asyncio.run(self._run_streaming_start_test())
+
 if __name__ == '__main__':
     unittest.main()
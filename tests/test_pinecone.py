@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from pipeline.config import PipelineConfig
+from pipeline.memory.pinecone_service import PineconeMemory, quantize_int8, source_id_prefix
+
+
+def make_memory() -> tuple[PineconeMemory, MagicMock]:
+    """A memory service wired to a mock index, as if already initialized."""
+    memory = PineconeMemory(PipelineConfig())
+    index = MagicMock()
+    memory.enabled = True
+    memory._client = MagicMock()
+    memory._index = index
+    return memory, index
+
+
+def make_match(mem_id: str, created_at: str) -> MagicMock:
+    match = MagicMock()
+    match.id = mem_id
+    match.metadata = {"text": mem_id, "created_at": created_at}
+    return match
+
+
+class TestQuantizeInt8(unittest.TestCase):
+    def test_levels_and_cosine(self):
+        rng = np.random.default_rng(0)
+        vector = rng.standard_normal(384).astype(np.float32)
+        quantized = quantize_int8(vector)
+
+        self.assertEqual(quantized.dtype, np.float32)
+        self.assertEqual(float(np.abs(quantized).max()), 127.0)
+        np.testing.assert_array_equal(quantized, np.rint(quantized))
+        cosine = float(vector @ quantized / (np.linalg.norm(vector) * np.linalg.norm(quantized)))
+        self.assertGreater(cosine, 0.999)
+
+    def test_zero_vector_unchanged(self):
+        np.testing.assert_array_equal(quantize_int8([0.0, 0.0]), [0.0, 0.0])
+
+    def test_enabled_from_config(self):
+        config = PipelineConfig()
+        config.memory.quantize_int8 = True
+        memory = PineconeMemory(config)
+        np.testing.assert_array_equal(memory._to_values([0.5, -1.0]), [64.0, -127.0])
+
+
+class TestMetadataLookups(unittest.TestCase):
+    def test_get_recent_is_one_query(self):
+        memory, index = make_memory()
+        index.query.return_value = MagicMock(matches=[
+            make_match("old", "2024-01-01T00:00:00"),
+            make_match("new", "2024-02-01T00:00:00"),
+        ])
+
+        recent = memory.get_recent(limit=2, since="2023-12-01T00:00:00")
+
+        self.assertEqual([m["id"] for m in recent], ["new", "old"])
+        index.query.assert_called_once()
+        self.assertEqual(index.query.call_args.kwargs["top_k"], 2)
+        self.assertEqual(index.query.call_args.kwargs["filter"], {"created_at": {"$gte": "2023-12-01T00:00:00"}})
+        index.list_paginated.assert_not_called()
+
+    def test_list_by_source_merges_prefixed_and_legacy_records(self):
+        memory, index = make_memory()
+        prefix = source_id_prefix("a.txt")
+        page = MagicMock(vectors=[MagicMock(id=f"{prefix}1"), MagicMock(id=f"{prefix}2")], pagination=None)
+        index.list_paginated.return_value = page
+        index.fetch.return_value = MagicMock(vectors={
+            f"{prefix}1": MagicMock(metadata={"source": "a.txt", "text": "new"}),
+            # Another source whose ID prefix collides
+            f"{prefix}2": MagicMock(metadata={"source": "b.txt", "text": "other"}),
+        })
+        # Old-format IDs only carry the source in metadata; the query also
+        # returns the prefixed record again
+        duplicate = MagicMock(id=f"{prefix}1", metadata={"source": "a.txt", "text": "new"})
+        legacy = MagicMock(id="legacy-1", metadata={"source": "a.txt", "text": "old"})
+        index.query.return_value = MagicMock(matches=[duplicate, legacy])
+
+        memories = memory.list_by_source("a.txt")
+
+        self.assertEqual([m["content"] for m in memories], ["new", "old"])
+        self.assertEqual(index.list_paginated.call_args.kwargs["prefix"], prefix)
+        self.assertEqual(index.query.call_args.kwargs["filter"], {"source": {"$eq": "a.txt"}})
+
+    def test_list_by_source_skips_the_query_when_the_prefix_fills_top_k(self):
+        memory, index = make_memory()
+        prefix = source_id_prefix("a.txt")
+        ids = [f"{prefix}{i}" for i in range(3)]
+        index.list_paginated.return_value = MagicMock(vectors=[MagicMock(id=i) for i in ids], pagination=None)
+        index.fetch.return_value = MagicMock(vectors={
+            i: MagicMock(metadata={"source": "a.txt", "text": i}) for i in ids
+        })
+
+        self.assertEqual(len(memory.list_by_source("a.txt", top_k=2)), 2)
+        index.query.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
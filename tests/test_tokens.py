@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import patch
+
+from pipeline.utils import tokens
+from pipeline.utils.tokens import truncate_middle
+
+
+class CharEncoding:
+    """One token per character, recording how much text was encoded."""
+
+    def __init__(self):
+        self.encoded_chars = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.encoded_chars += len(text)
+        return list(text)
+
+    def decode(self, ids):
+        return "".join(ids)
+
+
+class TestTruncateMiddle(unittest.TestCase):
+    def test_short_text_skips_the_tokenizer(self):
+        with patch.object(tokens, "load_encoding") as load:
+            self.assertEqual(truncate_middle("short", 100), "short")
+        load.assert_not_called()
+
+    def test_keeps_head_and_tail(self):
+        encoding = CharEncoding()
+        text = "a" * 100 + "b" * 100
+        with patch.object(tokens, "load_encoding", return_value=encoding):
+            result = truncate_middle(text, 10)
+
+        self.assertTrue(result.startswith("aaaaaa\n"))
+        self.assertTrue(result.endswith("\nbbbb"))
+        self.assertIn("Truncated, 190 more characters", result)
+
+    def test_only_the_ends_of_long_text_are_encoded(self):
+        encoding = CharEncoding()
+        text = "x" * 1_000_000
+        with patch.object(tokens, "load_encoding", return_value=encoding):
+            result = truncate_middle(text, 100)
+
+        self.assertEqual(encoding.encoded_chars, 2 * 100 * tokens.WINDOW_CHARS_PER_TOKEN)
+        self.assertIn("Truncated, 999,900 more characters", result)
+
+    def test_heuristic_without_tokenizer(self):
+        text = "a" * 50 + "b" * 50
+        with patch.object(tokens, "load_encoding", return_value=None):
+            result = truncate_middle(text, 5)
+
+        self.assertTrue(result.startswith("a" * 12))
+        self.assertTrue(result.endswith("b" * 8))
+        self.assertIn("80 more characters", result)
+
+
+if __name__ == "__main__":
+    unittest.main()